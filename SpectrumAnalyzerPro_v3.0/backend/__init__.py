@@ -1,18 +1,30 @@
 """
 Инициализация модуля бэкендов.
 Позволяет импортировать все классы бэкендов через 'from backend import *'
+
+Модули бэкендов загружаются при первом обращении к имени (PEP 562), чтобы
+запуск GUI не импортировал все четыре бэкенда до выбора устройства.
 """
 
-from .rtl_power import RtlPowerInfo, RtlPowerThread
-from .hackrf_sweep import HackRFSweepInfo, HackRFSweepThread
-from .airspy_rx import AirspyRxInfo, AirspyRxThread
-from .soapy_power import SoapyPowerInfo, SoapyPowerThread
-from .utils import parse_binary_header, parse_binary_rssi_data
+import importlib
+
+_EXPORTS = {
+    'RtlPowerInfo': '.rtl_power', 'RtlPowerThread': '.rtl_power',
+    'HackRFSweepInfo': '.hackrf_sweep', 'HackRFSweepThread': '.hackrf_sweep',
+    'AirspyRxInfo': '.airspy_rx', 'AirspyRxThread': '.airspy_rx',
+    'SoapyPowerInfo': '.soapy_power', 'SoapyPowerThread': '.soapy_power',
+    'PlaybackInfo': '.playback', 'PlaybackThread': '.playback',
+    'ScanCoordinator': '.scan_coordinator',
+    'parse_binary_header': '.utils', 'parse_binary_rssi_data': '.utils',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'RtlPowerInfo', 'RtlPowerThread',
-    'HackRFSweepInfo', 'HackRFSweepThread',
-    'AirspyRxInfo', 'AirspyRxThread',
-    'SoapyPowerInfo', 'SoapyPowerThread',
-    'parse_binary_header', 'parse_binary_rssi_data'
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
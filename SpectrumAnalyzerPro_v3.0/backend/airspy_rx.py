@@ -1,21 +1,28 @@
 """
 Бэкенд для Airspy через airspy_rx (бинарный вывод).
 Вывод: бинарные данные IQ, но мы преобразуем их в PSD (по аналогии с qspectrumanalyzer).
-Примечание: airspy_rx не имеет встроенного sweep, поэтому сканируем по одной частоте.
-Для сканирования диапазона потребуется несколько вызовов (реализовано в основном потоке).
-Это ограничение — такова особенность утилиты.
+Примечание: airspy_rx не имеет встроенного sweep. Если диапазон помещается в одну
+полосу, приёмник стоит на одной частоте и поток идёт непрерывно. Иначе диапазон
+делится на перекрывающиеся тайлы по 2.5 МГц, и airspy_rx перезапускается на каждом
+тайле с ограниченным числом отсчётов (-n); тайлы сшиваются в один широкополосный кадр.
 """
 
-import struct
+import time
 import numpy as np
+from datetime import datetime
 from PyQt5.QtCore import QProcess
 from .base import BackendInfo, BackendPowerThread
+from core.welch_psd import WelchPSD
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AirspyRxInfo(BackendInfo):
     cmd = "airspy_rx"
     args_template = [
-        "-f", "{start}e6",
+        "-f", "{center}",  # МГц
         "-s", "2500000",
+        "-t", "2",  # INT16_IQ — вдвое меньше данных в пайпе, чем float32
         "-r", "/dev/stdout",
         "-g", "{gain}"
     ]
@@ -32,68 +39,198 @@ class AirspyRxInfo(BackendInfo):
             "Командная строка использует фиксированную ширину полосы 2.5 МГц."
         )
 
+
+class HopPlan:
+    """
+    Разбиение диапазона на тайлы и сшивка их PSD.
+    Тайл занимает всю полосу sample_rate, но от него берётся только центральная
+    часть шириной usable_fraction * sample_rate: края срезаются фильтром приёмника.
+    Соседние тайлы перекрываются, перекрытие отрезается при сшивке.
+    """
+    def __init__(self, start_freq: float, end_freq: float, sample_rate: float,
+                 bin_offsets: np.ndarray, usable_fraction: float = 0.8):
+        usable = sample_rate * usable_fraction / 1e6  # МГц
+        count = max(1, int(np.ceil((end_freq - start_freq) / usable - 1e-9)))
+        self.centers = [start_freq + usable * (i + 0.5) for i in range(count)]
+        offsets = bin_offsets / 1e6
+        keep = np.flatnonzero((offsets >= -usable / 2) & (offsets < usable / 2))
+        keep_lo, keep_hi = int(keep[0]), int(keep[-1]) + 1
+
+        # Для каждого тайла: срез бинов PSD и место в общем кадре
+        self.slices = []
+        x_parts = []
+        offset = 0
+        for center in self.centers:
+            lo, hi = keep_lo, keep_hi
+            x = center + offsets[lo:hi]
+            hi -= int(np.count_nonzero(x >= end_freq))  # последний тайл обрезается по концу диапазона
+            self.slices.append((slice(lo, hi), slice(offset, offset + hi - lo)))
+            x_parts.append(center + offsets[lo:hi])
+            offset += hi - lo
+        self.x = np.concatenate(x_parts)
+
+    def __len__(self) -> int:
+        return len(self.centers)
+
+    def new_frame(self) -> np.ndarray:
+        return np.full(len(self.x), -120.0, dtype=np.float32)
+
+    def stitch(self, frame: np.ndarray, tile: int, power: np.ndarray):
+        src, dst = self.slices[tile]
+        frame[dst] = power[src]
+
+
 class AirspyRxThread(BackendPowerThread):
-    def __init__(self, *args, **kwargs):
+    FFT_SIZE = 1024
+    FFT_OVERLAP = 0.5
+    UPDATE_RATE = 20  # кадров PSD в секунду
+    USABLE_FRACTION = 0.8
+
+    def __init__(self, *args, dwell: float = 0.05, settle: float = 0.02, **kwargs):
         super().__init__(AirspyRxInfo(), *args, **kwargs)
-        self.buffer_bin = b""
         self.sample_rate = 2.5e6  # Фиксировано airspy_rx
+        self.dwell = dwell    # секунд сигнала на PSD тайла
+        self.settle = settle  # секунд в начале тайла, отбрасываемых до установления
+        self.psd = None
+        self.freqs = None
+        self.plan = None
+
+    def is_hopping(self) -> bool:
+        """Не помещается ли диапазон в полезную полосу одного тайла."""
+        return self.end_freq - self.start_freq > self.sample_rate * self.USABLE_FRACTION / 1e6
 
     def setup(self):
+        hopping = self.is_hopping()
         self.params = {
             "start": self.start_freq,
             "end": self.end_freq,
+            "center": (self.start_freq + self.end_freq) / 2,
             "step": self.step,
             "gain": self.gain,
         }
+        update_rate = 1 / self.dwell if hopping else self.UPDATE_RATE
+        self.psd = WelchPSD(self.sample_rate, self.FFT_SIZE, self.FFT_OVERLAP,
+                            update_rate, sample_format='int16')
+        if hopping:
+            self.plan = HopPlan(self.start_freq, self.end_freq, self.sample_rate,
+                                self.psd.freqs, self.USABLE_FRACTION)
+            self.freqs = self.plan.x + self.lnb_lo
+        else:
+            self.plan = None
+            # Сетка частот постоянна — считаем один раз
+            self.freqs = (self.params["center"] * 1e6 + self.psd.freqs) / 1e6 + self.lnb_lo  # в МГц
 
-    def process_start(self):
-        """Запускаем airspy_rx."""
-        args = [arg.format(**self.params) for arg in self.info.args_template]
+    def process_start(self, center: float = None, samples: int = 0):
+        """Запускаем airspy_rx (на тайле hop-режима — с заданной частотой и числом отсчётов)."""
+        params = dict(self.params)
+        if center is not None:
+            params["center"] = center
+        args = [arg.format(**params) for arg in self.info.args_template]
+        if samples:
+            args += ["-n", str(samples)]
         self.process = QProcess()
         self.process.setProgram(self.info.cmd)
         self.process.setArguments(args)
-        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        # stderr не смешиваем с потоком IQ
+        self.process.setProcessChannelMode(QProcess.ForwardedErrorChannel)
         self.process.start()
         if not self.process.waitForStarted(5000):
             raise RuntimeError(f"Не удалось запустить {self.info.cmd}")
 
+    def pending_bytes(self) -> int:
+        return self.psd.pending if self.psd else 0
+
     def parse_output(self, chunk: bytes):
-        """Обрабатываем бинарный поток IQ данных и вычисляем спектр."""
-        self.buffer_bin += chunk
-
-        # Мы получаем IQ в формате float32 (4 байта на I, 4 байта на Q)
-        # Полный блок должен быть кратен 8 байтам (I+Q)
-        if len(self.buffer_bin) < 8:
-            return
-
-        # Обрабатываем как можно больше полных блоков
-        n_samples = len(self.buffer_bin) // 8
-        if n_samples == 0:
-            return
-
-        # Извлекаем IQ данные
-        iq_data = np.frombuffer(self.buffer_bin[:n_samples*8], dtype=np.float32)
-        # Разделяем на I и Q
-        i_data = iq_data[::2]
-        q_data = iq_data[1::2]
-        # Собираем комплексные значения
-        complex_data = i_data + 1j * q_data
-
-        # Вычисляем FFT
-        window = np.hanning(len(complex_data))
-        fft_data = np.fft.fft(complex_data * window)
-        power = 10 * np.log10(np.abs(fft_data)**2 + 1e-10)  # в dB
-
-        # Вычисляем частоты
-        center_freq = self.start_freq * 1e6
-        freqs = np.linspace(center_freq - self.sample_rate/2, center_freq + self.sample_rate/2, len(power)) / 1e6  # в МГц
-
-        # Эмитируем один снимок
-        self.data_updated.emit({
-            'x': freqs,
-            'y': power,
-            'timestamp': datetime.now().strftime("%H:%M:%S")
-        })
-
-        # Очищаем буфер
-        self.buffer_bin = self.buffer_bin[n_samples*8:]
+        """Копим IQ и выдаём кадр PSD на каждые frame_samples отсчётов."""
+        for power in self.psd.feed(chunk):
+            self.emit_sweep({
+                'x': self.freqs,
+                'y': power,
+                'timestamp': datetime.now().strftime("%H:%M:%S"),
+                'sweep_end': True  # кадр покрывает весь диапазон — сборщику не ждать перехода
+            })
+
+    def run(self):
+        if self.is_hopping():
+            self.run_hopping()
+        else:
+            super().run()
+
+    def capture_tile(self, center: float) -> np.ndarray:
+        """Снять один тайл: запустить airspy_rx, отбросить отсчёты установления, вернуть PSD."""
+        psd = self.psd
+        settle_bytes = int(self.settle * self.sample_rate) * psd.sample_bytes
+        self.process_start(center, settle_bytes // psd.sample_bytes + psd.span)
+        psd.reset()
+        skipped = 0
+        frame = None
+        while frame is None and self.running:
+            if not (self.process.bytesAvailable() or self.process.waitForReadyRead(self.READ_TIMEOUT_MS)):
+                if self.process.state() != QProcess.Running:
+                    break
+                continue
+            chunk = self.process.readAll().data()
+            self.stats['bytes_read'] += len(chunk)
+            if skipped < settle_bytes:
+                drop = min(settle_bytes - skipped, len(chunk))
+                skipped += drop
+                chunk = memoryview(chunk)[drop:]
+            frames = psd.feed(chunk)
+            if frames:
+                frame = frames[0]
+        self.process_stop()
+        return frame
+
+    def run_hopping(self):
+        """Цикл сканирования по тайлам: один широкополосный кадр на проход."""
+        try:
+            self.setup()
+            self.running = True
+            self.stats = dict.fromkeys(self.stats, 0)
+            plan = self.plan
+            self.log_message.emit(
+                f"[INFO] Запущен бэкенд: {self.info.cmd}, {len(plan)} тайлов "
+                f"{plan.centers[0]:.3f}–{plan.centers[-1]:.3f} МГц, dwell {self.dwell * 1e3:.0f} мс"
+            )
+            sweeps = 0
+            while self.running:
+                frame = plan.new_frame()
+                tile_times = []
+                sweep_start = time.monotonic()
+                for tile, center in enumerate(plan.centers):
+                    if not self.running:
+                        break
+                    tile_start = time.monotonic()
+                    power = self.capture_tile(center)
+                    tile_times.append(time.monotonic() - tile_start)
+                    if power is None:
+                        self.drop_frames()
+                        logger.warning(f"airspy_rx: нет данных на {center:.3f} МГц")
+                        continue
+                    plan.stitch(frame, tile, power)
+                    logger.debug(f"airspy_rx: тайл {tile} ({center:.3f} МГц) за {tile_times[-1] * 1e3:.0f} мс")
+                    self.report_stats()
+                if not self.running:
+                    break
+
+                sweeps += 1
+                sweep_time = time.monotonic() - sweep_start
+                logger.info(
+                    f"airspy_rx: свип {sweeps} — {len(plan)} тайлов за {sweep_time:.2f} с, "
+                    f"тайл мин/сред/макс {min(tile_times) * 1e3:.0f}/"
+                    f"{np.mean(tile_times) * 1e3:.0f}/{max(tile_times) * 1e3:.0f} мс"
+                )
+                self.emit_sweep({
+                    'x': self.freqs,
+                    'y': frame,
+                    'timestamp': datetime.now().strftime("%H:%M:%S"),
+                    'sweep_end': True  # проход закончен — кадр уходит сразу, а не со следующим
+                })
+            self.log_message.emit("[INFO] Сканирование остановлено пользователем.")
+
+        except Exception as e:
+            error_msg = f"[CRITICAL] Ошибка в {self.info.cmd}: {str(e)}"
+            self.log_message.emit(error_msg)
+            logger.exception(error_msg)
+        finally:
+            self.process_stop()
@@ -34,6 +34,11 @@ class BackendPowerThread(QThread):
     data_updated = pyqtSignal(dict)  # {'x': freqs, 'y': powers, 'timestamp': str}
     log_message = pyqtSignal(str)
     scan_finished = pyqtSignal()
+    stats_updated = pyqtSignal(dict)  # {'bytes_read', 'bytes_buffered', 'frames_emitted', 'frames_dropped'}
+
+    READ_TIMEOUT_MS = 100
+    STATS_INTERVAL = 1.0
+    BATCH_TEXT = False  # текстовый вывод разбирается бэкендом пакетно: parse_output получает сырые байты
 
     def __init__(self, info: BackendInfo, start_freq: float, end_freq: float, step: float,
                  gain: float, interval: float, device: str = "", sample_rate: float = 2e6,
@@ -54,6 +59,14 @@ class BackendPowerThread(QThread):
         self.running = False
         self.process = None
         self.params = {}
+        self._line_buffer = b""
+        self._last_stats_time = 0.0
+        self.stats = {
+            'bytes_read': 0,
+            'bytes_buffered': 0,
+            'frames_emitted': 0,
+            'frames_dropped': 0,
+        }
 
     def setup(self):
         """Подготовить параметры команды."""
@@ -75,28 +88,75 @@ class BackendPowerThread(QThread):
                 self.process.kill()
                 self.process.waitForFinished(1000)
 
+    def handle_lines(self, lines: List[str]):
+        """Обработать пачку полных строк текстового вывода."""
+        for line in lines:
+            if line:
+                self.parse_output(line)
+
+    def flush_output(self):
+        """Процесс завершился: отдать то, что бэкенд держит до конца свипа."""
+        pass
+
+    def pending_bytes(self) -> int:
+        """Сколько байт бэкенд держит в своём буфере неразобранными."""
+        return 0
+
+    def emit_sweep(self, sweep: dict):
+        """Отправить снимок спектра и учесть его в счётчиках."""
+        self.stats['frames_emitted'] += 1
+        self.data_updated.emit(sweep)
+
+    def drop_frames(self, count: int = 1):
+        """Учесть отброшенные записи (ошибки разбора, рассинхронизация потока)."""
+        self.stats['frames_dropped'] += count
+
+    def wait_for_output(self) -> bool:
+        """Дождаться данных процесса (не дольше READ_TIMEOUT_MS). :return: есть ли что читать"""
+        return bool(self.process.bytesAvailable() or self.process.waitForReadyRead(self.READ_TIMEOUT_MS))
+
+    def read_available(self):
+        """Вычитать из процесса всё, что накопилось, и разобрать за один проход."""
+        chunk = self.process.readAll().data()
+        if not chunk:
+            return
+        self.stats['bytes_read'] += len(chunk)
+        if self.info.output_type == "text" and not self.BATCH_TEXT:
+            lines = (self._line_buffer + chunk).split(b'\n')
+            self._line_buffer = lines.pop()  # неполная строка ждёт продолжения
+            self.handle_lines([line.decode('utf-8', errors='ignore').strip() for line in lines])
+        else:
+            self.parse_output(chunk)
+        self.stats['bytes_buffered'] = len(self._line_buffer) + self.pending_bytes()
+
+    def report_stats(self, force: bool = False):
+        """Эмитировать счётчики не чаще STATS_INTERVAL секунд."""
+        now = time.monotonic()
+        if force or now - self._last_stats_time >= self.STATS_INTERVAL:
+            self._last_stats_time = now
+            self.stats_updated.emit(dict(self.stats))
+
     def run(self):
-        """Основной цикл потока."""
+        """Основной цикл потока: блокирующее ожидание данных вместо опроса."""
         try:
             self.setup()
             self.process_start()
             self.running = True
+            self._line_buffer = b""
+            self.stats = dict.fromkeys(self.stats, 0)
             self.log_message.emit(f"[INFO] Запущен бэкенд: {self.info.cmd}")
 
             while self.running and self.process.state() == QProcess.Running:
-                if self.info.output_type == "text":
-                    if self.process.canReadLine():
-                        line = self.process.readLine().data().decode('utf-8', errors='ignore').strip()
-                        if line:
-                            self.parse_output(line)
-                else:  # binary
-                    if self.process.bytesAvailable():
-                        chunk = self.process.readAll().data()
-                        if len(chunk) > 0:
-                            self.parse_output(chunk)
-                time.sleep(0.01)
+                # Просыпаемся сразу по приходу данных; таймаут нужен только для проверки running
+                if self.wait_for_output():
+                    self.read_available()
+                self.report_stats()
 
             if self.running:
+                # Процесс завершился — дочитываем то, что осталось в буфере
+                self.read_available()
+                self.flush_output()
+                self.report_stats(force=True)
                 self.scan_finished.emit()
             else:
                 self.log_message.emit("[INFO] Сканирование остановлено пользователем.")
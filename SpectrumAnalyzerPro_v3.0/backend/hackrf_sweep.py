@@ -3,10 +3,10 @@
 Аналогично qspectrumanalyzer, но адаптировано под нашу структуру.
 """
 
-import struct
 import numpy as np
 from PyQt5.QtCore import QProcess
 from .base import BackendInfo, BackendPowerThread
+from core.stream_parsers import HackRFSweepParser
 
 class HackRFSweepInfo(BackendInfo):
     cmd = "hackrf_sweep"
@@ -33,7 +33,7 @@ class HackRFSweepInfo(BackendInfo):
 class HackRFSweepThread(BackendPowerThread):
     def __init__(self, *args, **kwargs):
         super().__init__(HackRFSweepInfo(), *args, **kwargs)
-        self.buffer_bin = b""
+        self.parser = HackRFSweepParser()
         self.last_sweep_time = 0
 
     def setup(self):
@@ -50,50 +50,41 @@ class HackRFSweepThread(BackendPowerThread):
         args = [arg.format(**self.params) for arg in self.info.args_template]
         # Добавляем флаг -B для бинарного режима
         args.insert(1, "-B")
+        if self.device:
+            args = ["-d", str(self.device)] + args  # серийный номер HackRF
         self.process = QProcess()
         self.process.setProgram(self.info.cmd)
         self.process.setArguments(args)
-        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        # stderr не смешиваем с бинарным stdout, иначе поток записей повреждается
+        self.process.setProcessChannelMode(QProcess.ForwardedErrorChannel)
         self.process.start()
         if not self.process.waitForStarted(5000):
             raise RuntimeError(f"Не удалось запустить {self.info.cmd}")
 
-    def parse_output(self, chunk: bytes):
-        """Парсим бинарный вывод hackrf_sweep."""
-        self.buffer_bin += chunk
-
-        while len(self.buffer_bin) >= 24:  # Минимальный заголовок: 8+8+8 = 24 байта
-            header = self.buffer_bin[:24]
-            try:
-                low_edge, high_edge, record_length = struct.unpack('<QQI', header)
-            except struct.error:
-                break  # Недостаточно данных для заголовка
-
-            if len(self.buffer_bin) < 24 + record_length:
-                break  # Не хватает данных для всего пакета
-
-            # Извлекаем данные RSSI
-            data_bytes = self.buffer_bin[24:24 + record_length]
-            count = record_length // 4  # Каждое значение — float32 (4 байта)
-            rssi_data = struct.unpack(f'<{count}f', data_bytes)
+    def pending_bytes(self) -> int:
+        return self.parser.pending
 
-            # Вычисляем частоты
-            step = (high_edge - low_edge) / count
-            frequencies = np.linspace(low_edge / 1e6, high_edge / 1e6, count)  # в МГц
-
-            # Применяем LNB LO
-            if self.lnb_lo != 0:
-                frequencies += self.lnb_lo
-
-            # Формируем массив мощностей
-            db_values = np.array(rssi_data)
+    def parse_output(self, chunk: bytes):
+        """Парсим бинарный вывод hackrf_sweep пакетами записей."""
+        resyncs = self.parser.resyncs
+        for low_edges, high_edges, rssi in self.parser.feed(chunk):
+            # Одна копия на пакет: данные должны пережить следующий feed()
+            rssi = rssi.copy()
+            count = rssi.shape[1]
+            for low_edge, high_edge, db_values in zip(low_edges.tolist(), high_edges.tolist(), rssi):
+                # Вычисляем частоты
+                frequencies = np.linspace(low_edge / 1e6, high_edge / 1e6, count)  # в МГц
 
-            # Эмитируем сигнал
-            self.data_updated.emit({
-                'x': frequencies,
-                'y': db_values,
-                'timestamp': f"{low_edge}-{high_edge}"
-            })
+                # Применяем LNB LO
+                if self.lnb_lo != 0:
+                    frequencies += self.lnb_lo
 
-            # Удаляем обработанные данные из буфера
-            self.buffer_bin = self.buffer_bin[24 + record_length:]
+                # Эмитируем сигнал
+                self.emit_sweep({
+                    'x': frequencies,
+                    'y': db_values,
+                    'timestamp': f"{low_edge}-{high_edge}"
+                })
+        if self.parser.resyncs != resyncs:
+            self.drop_frames(self.parser.resyncs - resyncs)
+            self.log_message.emit("[WARNING] hackrf_sweep: повреждённая запись, буфер сброшен")
@@ -0,0 +1,136 @@
+"""
+Бэкенд воспроизведения записи спектра (core.spectrum_recorder).
+Работает через тот же интерфейс BackendPowerThread, но вместо внешней утилиты
+читает строки из memory-mapped файлов: в реальном времени, с ускорением N×
+или максимально быстро, с мгновенным переходом к любой метке времени.
+"""
+
+import time
+import threading
+import logging
+import numpy as np
+from datetime import datetime
+from .base import BackendInfo, BackendPowerThread
+from core.spectrum_recorder import SpectrumRecording
+
+
+class PlaybackInfo(BackendInfo):
+    cmd = "playback"
+    args_template = []
+    hint_range = (0, 7250)
+    hint_step = "Из файла записи"
+    default_gain = 0
+    output_type = "file"
+
+    @classmethod
+    def help_device(cls, executable: str, device: str) -> str:
+        return (
+            "Воспроизведение записи спектра (*.sarec).\n"
+            "Скорость 1 — реальное время, N — ускорение в N раз, 0 — максимально быстро."
+        )
+
+
+class PlaybackThread(BackendPowerThread):
+    """Путь к записи передаётся в device, скорость — в speed."""
+    SLEEP_SLICE = 0.05  # максимальный шаг ожидания, чтобы быстро реагировать на stop/seek
+
+    def __init__(self, *args, speed: float = 1.0, **kwargs):
+        super().__init__(PlaybackInfo(), *args, **kwargs)
+        self.speed = speed
+        self.recording = None
+        self.position = 0
+        self._freqs_src = None
+        self._x = None
+        self._seek_lock = threading.Lock()
+        self._seek_to = None
+
+    def setup(self):
+        self.recording = SpectrumRecording(self.device)
+        self.log_message.emit(
+            f"[INFO] Запись: {len(self.recording)} свипов, "
+            f"{datetime.fromtimestamp(self.recording.start_time):%Y-%m-%d %H:%M:%S} — "
+            f"{datetime.fromtimestamp(self.recording.end_time):%Y-%m-%d %H:%M:%S}"
+        )
+
+    def process_start(self):
+        """Внешнего процесса нет."""
+
+    def parse_output(self, line_or_bytes):
+        """Данные читаются из файла напрямую."""
+
+    def seek(self, timestamp: float):
+        """Перейти к метке времени (можно вызывать из GUI-потока)."""
+        with self._seek_lock:
+            self._seek_to = timestamp
+
+    def set_speed(self, speed: float):
+        self.speed = speed
+        self.seek_index(self.position)  # пересчитать опорное время под новую скорость
+
+    def seek_index(self, index: int):
+        with self._seek_lock:
+            self._seek_to = ('index', index)
+
+    def _take_seek(self):
+        with self._seek_lock:
+            target, self._seek_to = self._seek_to, None
+        if target is None:
+            return None
+        if isinstance(target, tuple):
+            return min(max(target[1], 0), len(self.recording) - 1)
+        return self.recording.seek(target)
+
+    def run(self):
+        try:
+            self.setup()
+            self.running = True
+            self.log_message.emit(f"[INFO] Запущен бэкенд: {self.info.cmd}")
+            recording = self.recording
+            self.position = 0
+            wall_start = time.monotonic()
+            ts_start = recording.row(0)[0]
+
+            while self.running and self.position < len(recording):
+                index = self._take_seek()
+                if index is not None:
+                    self.position = index
+                    wall_start = time.monotonic()
+                    ts_start = recording.row(index)[0]
+
+                timestamp, freqs, power = recording.row(self.position)
+                if self.speed > 0:
+                    # Ждём момента, когда строка должна появиться при данной скорости
+                    delay = (timestamp - ts_start) / self.speed - (time.monotonic() - wall_start)
+                    if delay > 0:
+                        time.sleep(min(delay, self.SLEEP_SLICE))
+                        continue
+
+                if freqs is not self._freqs_src:
+                    # Сетка частот копируется один раз на сегмент
+                    self._freqs_src = freqs
+                    self._x = np.array(freqs) + self.lnb_lo
+                y = np.array(power)  # копия: строка уходит в другой поток
+                self.stats['bytes_read'] += y.nbytes
+                self.emit_sweep({
+                    'x': self._x,
+                    'y': y,
+                    'timestamp': datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+                })
+                self.position += 1
+                self.report_stats()
+
+            if self.running:
+                self.report_stats(force=True)
+                self.scan_finished.emit()
+            else:
+                self.log_message.emit("[INFO] Воспроизведение остановлено пользователем.")
+
+        except Exception as e:
+            error_msg = f"[CRITICAL] Ошибка в {self.info.cmd}: {str(e)}"
+            self.log_message.emit(error_msg)
+            logging.exception(error_msg)
+        finally:
+            if self.recording is not None:
+                # Закрытая запись больше не читается: ползунок GUI проверяет recording на None
+                recording, self.recording = self.recording, None
+                recording.close()
@@ -3,11 +3,9 @@
 Совместим с вашей текущей реализацией, но интегрирован в новую архитектуру.
 """
 
-import os
-import numpy as np
-from datetime import datetime
 from PyQt5.QtCore import QProcess
 from .base import BackendInfo, BackendPowerThread
+from core.stream_parsers import RtlPowerCsvDecoder
 
 class RtlPowerInfo(BackendInfo):
     cmd = "rtl_power"
@@ -31,8 +29,12 @@ class RtlPowerInfo(BackendInfo):
         )
 
 class RtlPowerThread(BackendPowerThread):
+    BATCH_TEXT = True  # строки CSV разбираются пакетом, хопы сшиваются в свип
+
     def __init__(self, *args, **kwargs):
         super().__init__(RtlPowerInfo(), *args, **kwargs)
+        self.decoder = None
+        self._errors = 0
 
     def setup(self):
         self.params = {
@@ -42,10 +44,14 @@ class RtlPowerThread(BackendPowerThread):
             "gain": self.gain,
             "interval": self.interval,
         }
+        self.decoder = RtlPowerCsvDecoder()
+        self._errors = 0
 
     def process_start(self):
         """Запускаем rtl_power напрямую без bash -c."""
         args = [arg.format(**self.params) for arg in self.info.args_template]
+        if self.device:
+            args = ["-d", str(self.device)] + args  # индекс или серийный номер донгла
         self.process = QProcess()
         self.process.setProgram(self.info.cmd)
         self.process.setArguments(args)
@@ -54,22 +60,28 @@ class RtlPowerThread(BackendPowerThread):
         if not self.process.waitForStarted(5000):
             raise RuntimeError(f"Не удалось запустить {self.info.cmd}")
 
-    def parse_output(self, line: str):
-        """Парсим текстовый вывод rtl_power."""
-        parts = line.split(',')
-        # Проверяем, что это строка с данными (первый элемент — число)
-        if len(parts) >= 8 and parts[0].strip().replace('-', '').isdigit():
-            try:
-                start_freq = float(parts[2])
-                step_hz = float(parts[4])
-                num_steps = int(parts[5])
-                db_values = list(map(float, parts[6:6 + num_steps]))
-                frequencies = [start_freq + i * step_hz for i in range(num_steps)]
-                self.data_updated.emit({
-                    'x': np.array(frequencies),
-                    'y': np.array(db_values),
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-            except Exception as e:
-                self.log_message.emit(f"Ошибка парсинга rtl_power: {e}")
-                return
+    def pending_bytes(self) -> int:
+        return self.decoder.pending if self.decoder else 0
+
+    def parse_output(self, chunk: bytes):
+        """Все полные строки куска — одним пакетом; наружу только сшитые свипы."""
+        for sweep in self.decoder.feed(chunk):
+            self.emit_merged(sweep)
+        if self.decoder.errors != self._errors:
+            self.drop_frames(self.decoder.errors - self._errors)
+            self.log_message.emit(f"Ошибка парсинга rtl_power: пропущено строк {self.decoder.errors - self._errors}")
+            self._errors = self.decoder.errors
+
+    def flush_output(self):
+        sweep = self.decoder.flush() if self.decoder else None
+        if sweep is not None:
+            self.emit_merged(sweep)
+
+    def emit_merged(self, sweep):
+        timestamp, x, y = sweep
+        self.emit_sweep({
+            'x': x + self.lnb_lo,
+            'y': y,
+            'timestamp': timestamp,
+            'sweep_end': True  # свип целиком — SweepAssembler отдаёт кадр сразу
+        })
@@ -0,0 +1,258 @@
+"""
+Параллельное сканирование несколькими устройствами.
+Диапазон делится на поддиапазоны по числу устройств (с учётом весов), каждый
+бэкенд сканирует свою часть в своём потоке, а координатор собирает последние
+свипы всех устройств в один кадр на общей сетке частот. Кадр выдаётся, когда
+каждое устройство прислало свежий свип, поэтому суммарная скорость растёт
+примерно линейно с числом устройств.
+
+Устройство, не приславшее свип к построению сетки, получает в ней заглушку с
+запрошенным шагом, заполненную fill_value; когда его первый свип приходит,
+срез пересобирается на месте заглушки (число бинов кадра не меняется).
+"""
+
+import time
+from datetime import datetime
+from functools import partial
+from typing import List, Optional, Tuple
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+from data.sweep_assembler import SweepAssembler
+from utils.logger import get_logger
+from .rtl_power import RtlPowerThread
+from .hackrf_sweep import HackRFSweepThread
+from .airspy_rx import AirspyRxThread
+from .soapy_power import SoapyPowerThread
+
+logger = get_logger(__name__)
+
+# Бэкенд -> (класс потока, частота дискретизации по умолчанию)
+BACKEND_THREADS = {
+    "rtl_power": (RtlPowerThread, 2e6),
+    "hackrf_sweep": (HackRFSweepThread, 20e6),
+    "airspy_rx": (AirspyRxThread, 2.5e6),
+    "soapy_power": (SoapyPowerThread, 2560000),
+}
+
+
+def parse_device_list(text: str) -> List[Tuple[str, str, float]]:
+    """
+    Разобрать список устройств вида "rtl_power:0, rtl_power:1, hackrf_sweep:SERIAL*4".
+    :return: [(бэкенд, устройство, вес)]
+    """
+    devices = []
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        weight = 1.0
+        if '*' in item:
+            item, weight_text = item.rsplit('*', 1)
+            weight = float(weight_text)
+        backend, _, device = item.partition(':')
+        if backend not in BACKEND_THREADS:
+            raise ValueError(f"Неизвестный бэкенд для мультискана: {backend}")
+        devices.append((backend, device, weight))
+    return devices
+
+
+def partition_band(start: float, end: float, weights: List[float], step_mhz: float = 0.0) -> List[Tuple[float, float]]:
+    """Разбить [start, end] на смежные части пропорционально весам; границы кратны шагу."""
+    total = sum(weights)
+    edges = [start]
+    acc = 0.0
+    for weight in weights[:-1]:
+        acc += weight
+        edge = start + (end - start) * acc / total
+        if step_mhz > 0:
+            edge = start + round((edge - start) / step_mhz) * step_mhz
+        edges.append(edge)
+    edges.append(end)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+class ScanCoordinator(QObject):
+    """
+    Запускает несколько бэкендов и сводит их свипы в один кадр.
+    Повторяет интерфейс BackendPowerThread, который использует MainWindow:
+    сигналы data_updated/log_message/scan_finished/stats_updated, start(), wait(), running.
+    """
+    data_updated = pyqtSignal(dict)
+    log_message = pyqtSignal(str)
+    scan_finished = pyqtSignal()
+    stats_updated = pyqtSignal(dict)
+
+    STALE_TIMEOUT = 5.0  # с — после этого кадр выдаётся без отставшего устройства
+
+    def __init__(self, devices: List[Tuple[str, str, float]], start_freq: float, end_freq: float,
+                 step: float, gain: float, interval: float, lnb_lo: float = 0, fill_value: float = -100.0):
+        super().__init__()
+        if not devices:
+            raise ValueError("Не задано ни одного устройства для мультискана")
+        self.fill_value = fill_value
+        self.step_mhz = step / 1000
+        self.lnb_lo = lnb_lo
+        self.bands = partition_band(start_freq, end_freq, [w for _, _, w in devices], step / 1000)
+        self.threads = []
+        self.assemblers = []
+        for index, ((backend, device, _), (lo, hi)) in enumerate(zip(devices, self.bands)):
+            thread_cls, sample_rate = BACKEND_THREADS[backend]
+            thread = thread_cls(start_freq=lo, end_freq=hi, step=step, gain=gain, interval=interval,
+                                device=device, sample_rate=sample_rate, ppm=0, lnb_lo=lnb_lo)
+            assembler = SweepAssembler(lo + lnb_lo, hi + lnb_lo, fill_value)
+            thread.data_updated.connect(assembler.update)
+            thread.scan_finished.connect(assembler.flush)
+            assembler.data_updated.connect(partial(self.on_subframe, index))
+            thread.log_message.connect(partial(self.on_log, f"{backend}:{device or index}"))
+            thread.stats_updated.connect(partial(self.on_stats, index))
+            thread.finished.connect(self.on_thread_finished)
+            self.threads.append(thread)
+            self.assemblers.append(assembler)
+
+        n = len(self.threads)
+        self._frames: List[Optional[np.ndarray]] = [None] * n
+        self._frame_times = np.zeros(n)
+        self._fresh = np.zeros(n, dtype=bool)
+        self._stats = [{} for _ in range(n)]
+        self._finished = 0
+        self._stopped = False
+        self._started_at = 0.0
+        self._grids: List[Optional[np.ndarray]] = [None] * n
+        self._resample: List[Optional[np.ndarray]] = [None] * n  # x свипа, если он интерполируется на сетку
+        self._placeholders = set()  # устройства, чьи поддиапазоны пока заполнены fill_value
+        self.x = None
+        self._slices = None
+        self.sweeps = 0
+
+    # --- интерфейс потока бэкенда ---
+
+    @property
+    def running(self) -> bool:
+        return any(thread.running for thread in self.threads)
+
+    @running.setter
+    def running(self, value: bool):
+        self._stopped = not value
+        for thread in self.threads:
+            thread.running = value
+
+    def start(self):
+        self._started_at = time.monotonic()
+        for (lo, hi), thread in zip(self.bands, self.threads):
+            self.log_message.emit(f"[INFO] {thread.info.cmd}: {lo:.3f}–{hi:.3f} МГц")
+            thread.start()
+
+    def wait(self, msecs: int = 2000) -> bool:
+        deadline = time.monotonic() + msecs / 1000
+        done = True
+        for thread in self.threads:
+            remaining = max(0, int((deadline - time.monotonic()) * 1000))
+            done = thread.wait(remaining) and done
+        return done
+
+    def isRunning(self) -> bool:
+        return any(thread.isRunning() for thread in self.threads)
+
+    # --- сведение кадров ---
+
+    def _placeholder_grid(self, index: int) -> np.ndarray:
+        """Сетка поддиапазона с запрошенным шагом — как её выделит SweepGrid при том же разрешении."""
+        lo, hi = self.bands[index]
+        size = int(round((hi - lo) / self.step_mhz)) + 1 if self.step_mhz > 0 else 2
+        return np.linspace(lo + self.lnb_lo, hi + self.lnb_lo, max(size, 2))
+
+    def _build_grid(self):
+        """Общая сетка: поддиапазоны по порядку, стык без повторных бинов."""
+        parts, self._slices = [], []
+        offset, last = 0, -np.inf
+        for index, frame_x in enumerate(self._grids):
+            if frame_x is None:
+                frame_x = self._placeholder_grid(index)
+                self._placeholders.add(index)
+            first = int(np.searchsorted(frame_x, last, side='right'))
+            part = frame_x[first:]
+            self._slices.append((slice(first, None), slice(offset, offset + len(part))))
+            parts.append(part)
+            offset += len(part)
+            last = part[-1] if len(part) else last
+        self.x = np.concatenate(parts)
+        if self._placeholders:
+            self.log_message.emit(f"[WARNING] Мультискан: нет данных от устройств {sorted(self._placeholders)}, "
+                                  f"их поддиапазоны заполнены {self.fill_value:g} дБ до первого свипа")
+
+    def _attach(self, index: int, frame_x: np.ndarray):
+        """Первый свип устройства с заглушкой: срез на место заглушки, сетка той же длины."""
+        dst = self._slices[index][1]
+        last = self.x[dst.start - 1] if dst.start > 0 else -np.inf
+        first = int(np.searchsorted(frame_x, last, side='right'))
+        part = frame_x[first:]
+        if len(part) == dst.stop - dst.start:
+            self.x = self.x.copy()  # прежний массив мог уйти с кадрами — не меняем его на месте
+            self.x[dst] = part
+            self._slices[index] = (slice(first, None), dst)
+        else:
+            # Разрешение отличается от запрошенного — свип интерполируется на заглушку
+            self._resample[index] = frame_x
+        self._placeholders.discard(index)
+        self.log_message.emit(f"[INFO] Мультискан: устройство {index} прислало первый свип, поддиапазон добавлен")
+
+    def on_subframe(self, index: int, sweep: dict):
+        self._frames[index] = sweep['y']
+        self._frame_times[index] = time.time()
+        self._fresh[index] = True
+        if self.x is None:
+            self._grids[index] = sweep['x']
+            waited = time.monotonic() - self._started_at
+            if any(g is None for g in self._grids) and waited < self.STALE_TIMEOUT:
+                return
+            self._build_grid()
+        elif index in self._placeholders:
+            self._attach(index, np.asarray(sweep['x']))
+        self._maybe_emit()
+
+    def _maybe_emit(self):
+        # Устройства без единого свипа не ждём — их поддиапазоны остаются заглушками
+        active = [i for i in range(len(self.threads)) if i not in self._placeholders]
+        fresh = self._fresh[active]
+        if not fresh.all():
+            # Ждём отставших, но не дольше STALE_TIMEOUT от самого старого свежего свипа
+            oldest_fresh = self._frame_times[active][fresh].min() if fresh.any() else time.time()
+            if time.time() - oldest_fresh < self.STALE_TIMEOUT:
+                return
+        y = np.full(len(self.x), self.fill_value, dtype=np.float32)
+        for i in active:
+            src, dst = self._slices[i]
+            if self._resample[i] is not None:
+                y[dst] = np.interp(self.x[dst], self._resample[i], self._frames[i])
+            else:
+                y[dst] = self._frames[i][src]
+        times = self._frame_times[active]
+        self._fresh[:] = False
+        self.sweeps += 1
+        self.data_updated.emit({
+            'x': self.x,
+            'y': y,
+            # Метка кадра — время самого старого из сведённых свипов; разброс — в статистике
+            'timestamp': datetime.fromtimestamp(times.min()).strftime("%H:%M:%S"),
+            'skew': float(times.max() - times.min()),
+        })
+
+    # --- служебные сигналы ---
+
+    def on_log(self, name: str, message: str):
+        self.log_message.emit(f"[{name}] {message}")
+
+    def on_stats(self, index: int, stats: dict):
+        self._stats[index] = stats
+        total = {}
+        for child in self._stats:
+            for key, value in child.items():
+                total[key] = total.get(key, 0) + value
+        total['devices'] = len(self.threads)
+        total['sweeps'] = self.sweeps
+        self.stats_updated.emit(total)
+
+    def on_thread_finished(self):
+        self._finished += 1
+        if self._finished == len(self.threads) and not self._stopped:
+            self.scan_finished.emit()
@@ -4,10 +4,12 @@ Backend для SoapySDR через soapy_power (бинарный формат).
 """
 
 import os
-import struct
+import select
+from datetime import datetime
 import numpy as np
 from PyQt5.QtCore import QProcess
 from .base import BackendInfo, BackendPowerThread
+from core.stream_parsers import SoapyPowerBinParser
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,13 +43,19 @@ class SoapyPowerInfo(BackendInfo):
             "Настройте параметры: частота, усиление, PPM-коррекция."
         )
 
+
 class SoapyPowerThread(BackendPowerThread):
+    READ_BLOCK = 1 << 20  # читаем пайп крупными блоками, чтобы soapy_power не ждал нас
+
     def __init__(self, *args, **kwargs):
         super().__init__(SoapyPowerInfo(), *args, **kwargs)
+        self.parser = SoapyPowerBinParser()
         self.pipe_read_fd = None
         self.pipe_write_fd = None
         self.pipe_read = None
-        self.pipe_write_handle = None
+        self._read_buf = bytearray(self.READ_BLOCK)
+        self._read_view = memoryview(self._read_buf)
+        self._pipe_eof = False
 
     def setup(self):
         """Подготовить параметры для soapy_power."""
@@ -64,11 +72,9 @@ class SoapyPowerThread(BackendPowerThread):
 
     def process_start(self):
         """Запустить soapy_power с пайпом."""
-        import tempfile
-        import subprocess
-
-        # Создаем pipe
+        # Создаем pipe; сторона записи должна наследоваться дочерним процессом
         rpipe, wpipe = os.pipe()
+        os.set_inheritable(wpipe, True)
         self.pipe_read_fd = rpipe
         self.pipe_write_fd = wpipe
 
@@ -86,57 +92,94 @@ class SoapyPowerThread(BackendPowerThread):
 
         logger.info(f"Запуск: {' '.join(cmdline)}")
 
-        # Запускаем процесс
+        # Запускаем процесс; stdout/stderr — только текстовый лог
         self.process = QProcess()
         self.process.setProgram(cmdline[0])
         self.process.setArguments(cmdline[1:])
         self.process.setProcessChannelMode(QProcess.MergedChannels)
         self.process.start()
+        started = self.process.waitForStarted(5000)
 
-        # Закрываем сторону записи
+        # Закрываем сторону записи: EOF на пайпе придёт, когда её закроет soapy_power
         os.close(wpipe)
-
-        # Настраиваем чтение из pipe
-        self.pipe_read = os.fdopen(rpipe, 'rb')
-
-    def parse_output(self, buf: bytes):
-        """Разбор бинарного формата soapy_power_bin."""
-        try:
-            # Структура заголовка: 8+8+8+8+4+4+4+4+4+4 = 60 байт
-            # time_start, time_stop, start, stop, step, samples, flags, reserved, width, height
-            header_size = 60
-            if len(buf) < header_size:
-                return
-
-            header = struct.unpack('>QQQQIIIIII', buf[:header_size])
-            time_start, time_stop, start_freq, stop_freq, step, samples, flags, _, width, height = header
-
-            if len(buf) < header_size + samples * 4:
-                return  # Не хватает данных
-
-            y_data = np.frombuffer(buf[header_size:header_size + samples*4], dtype=np.float32)
-            x_data = np.linspace(start_freq / 1e6, stop_freq / 1e6, len(y_data))  # в МГц
-
-            # Применяем LNB LO
-            if self.lnb_lo != 0:
-                x_data += self.lnb_lo
-
-            self.data_updated.emit({
-                'x': x_data,
-                'y': y_data,
-                'timestamp': f"{time_start}.{time_stop}"
-            })
-
-        except Exception as e:
-            logger.error(f"Ошибка парсинга soapy_power: {e}")
+        self.pipe_write_fd = None
+        if not started:
+            os.close(rpipe)
+            self.pipe_read_fd = None
+            raise RuntimeError(f"Не удалось запустить {self.info.cmd}")
+
+        # Неблокирующее чтение без буферизации Python — блоки читаем сами в свой буфер
+        os.set_blocking(rpipe, False)
+        self.pipe_read = os.fdopen(rpipe, 'rb', buffering=0)
+        self.parser = SoapyPowerBinParser()
+        self._pipe_eof = False
+
+    def forward_log(self):
+        """Переслать в лог текстовый вывод soapy_power (и обновить состояние процесса)."""
+        if self.process.bytesAvailable() or self.process.waitForReadyRead(0):
+            for line in self.process.readAll().data().decode('utf-8', errors='ignore').splitlines():
+                if line.strip():
+                    logger.info(f"soapy_power: {line.strip()}")
+
+    def wait_for_output(self) -> bool:
+        self.forward_log()
+        if self._pipe_eof:
+            self.process.waitForFinished(self.READ_TIMEOUT_MS)
+            return False
+        ready, _, _ = select.select([self.pipe_read], [], [], self.READ_TIMEOUT_MS / 1000)
+        return bool(ready)
+
+    def read_available(self):
+        """Вычитать пайп блоками по READ_BLOCK, пока в нём есть данные."""
+        if self.pipe_read is None or self._pipe_eof:
             return
+        for _ in range(16):  # не дольше 16 блоков за раз, чтобы успевать обновлять статистику
+            size = self.pipe_read.readinto(self._read_view)
+            if size is None:
+                break  # данных пока нет
+            if size == 0:
+                self._pipe_eof = True
+                break
+            self.stats['bytes_read'] += size
+            self.parse_output(self._read_view[:size])
+            if size < self.READ_BLOCK:
+                break
+        self.stats['bytes_buffered'] = self.parser.pending
+
+    def pending_bytes(self) -> int:
+        return self.parser.pending
+
+    def parse_output(self, chunk):
+        """Разбор бинарного формата soapy_power_bin пакетами записей."""
+        resyncs = self.parser.resyncs
+        for time_starts, starts, stops, power in self.parser.feed(chunk):
+            # Одна копия на пакет: данные должны пережить следующий feed()
+            power = power.copy()
+            count = power.shape[1]
+            for time_start, start_freq, stop_freq, y_data in zip(
+                    time_starts.tolist(), starts.tolist(), stops.tolist(), power):
+                x_data = np.linspace(start_freq / 1e6, stop_freq / 1e6, count)  # в МГц
+
+                # Применяем LNB LO
+                if self.lnb_lo != 0:
+                    x_data += self.lnb_lo
+
+                self.emit_sweep({
+                    'x': x_data,
+                    'y': y_data,
+                    'timestamp': datetime.fromtimestamp(time_start).strftime("%H:%M:%S")
+                })
+        if self.parser.resyncs != resyncs:
+            self.drop_frames(self.parser.resyncs - resyncs)
+            self.log_message.emit("[WARNING] soapy_power: повреждённые данные в потоке, поиск следующей записи")
 
     def process_stop(self):
         """Остановить процесс и закрыть pipe."""
         super().process_stop()
         if self.pipe_read:
             self.pipe_read.close()
+        elif self.pipe_read_fd is not None:
+            os.close(self.pipe_read_fd)
         self.pipe_read_fd = None
         self.pipe_write_fd = None
         self.pipe_read = None
-        self.pipe_write_handle = None
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк движка правил оповещений: тысячи правил на широком свипе.
+Сначала сверяет векторные значения и события с построчной проверкой правил
+в Python, затем меряет время одного свипа.
+
+Запуск из корня проекта:
+    python benchmarks/bench_alerts.py [--rules 5000] [--bins 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.alerts import AlertEngine
+
+
+def make_rules(count: int, f_start: float, f_end: float, rng) -> list:
+    kinds = rng.choice(['level', 'occupancy', 'new'], size=count, p=[0.6, 0.3, 0.1])
+    lo = rng.uniform(f_start, f_end, size=count)
+    width = rng.uniform(0.01, 2.0, size=count)
+    return [{
+        'kind': str(kind), 'f_lo': float(l), 'f_hi': float(min(l + w, f_end)),
+        'threshold': float(rng.uniform(-70, -40)), 'debounce': int(rng.integers(1, 4)),
+        'window': int(rng.integers(5, 50)), 'occupancy': float(rng.uniform(0.2, 0.8)),
+        'margin': float(rng.uniform(5, 15)),
+    } for kind, l, w in zip(kinds, lo, width)]
+
+
+class NaiveEngine:
+    """Построчная проверка правил — эталон для сверки."""
+    def __init__(self, rules, learn_sweeps=20):
+        self.engine = AlertEngine(rules, learn_sweeps)  # только нормализованные правила
+        self.rules = self.engine.rules
+        self.learn_sweeps = learn_sweeps
+        self.state = [{'active': False, 'on': 0, 'off': 0, 'flags': []} for _ in self.rules]
+        self.baseline = None
+        self.learned = 0
+
+    def process(self, x, y):
+        events = []
+        learning = self.learned < self.learn_sweeps
+        if learning:
+            self.baseline = y.copy() if self.baseline is None else np.maximum(self.baseline, y)
+            self.learned += 1
+        for rule, st in zip(self.rules, self.state):
+            band = (x >= rule['f_lo']) & (x <= rule['f_hi'])
+            if not band.any():
+                value, on, off = -np.inf, False, True
+            elif rule['kind'] == 'new':
+                value = -np.inf if learning else float(np.max((y - self.baseline)[band]))
+                on, off = value >= rule['margin'], value < rule['margin'] - rule['hysteresis']
+            else:
+                value = float(np.max(y[band]))
+                if rule['kind'] == 'occupancy':
+                    st['flags'] = (st['flags'] + [value >= rule['threshold']])[-rule['window']:]
+                    value = sum(st['flags']) / len(st['flags'])
+                    level = rule['occupancy']
+                else:
+                    level = rule['threshold']
+                on, off = value >= level, value < level - rule['hysteresis']
+            st['on'] = st['on'] + 1 if on else 0
+            st['off'] = st['off'] + 1 if off else 0
+            if not st['active'] and st['on'] >= rule['debounce']:
+                st['active'] = True
+                events.append((rule['name'], 'raised'))
+            elif st['active'] and st['off'] >= rule['debounce']:
+                st['active'] = False
+                events.append((rule['name'], 'cleared'))
+        return events
+
+
+def sweeps(x, count, rng):
+    """Шум с несколькими перемежающимися несущими — правила то срабатывают, то сбрасываются."""
+    carriers = rng.choice(len(x), size=40, replace=False)
+    for i in range(count):
+        y = rng.normal(-80, 3, size=len(x)).astype(np.float32)
+        on = carriers[rng.random(len(carriers)) < 0.5 + 0.4 * np.sin(i / 7)]
+        y[on] = rng.uniform(-60, -30, size=len(on))
+        yield y
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--rules', type=int, default=5000)
+    ap.add_argument('--bins', type=int, default=100000)
+    ap.add_argument('--sweeps', type=int, default=200)
+    args = ap.parse_args()
+    rng = np.random.default_rng(3)
+
+    # Сверка на небольшой задаче
+    x = np.linspace(100, 200, 4000)
+    rules = make_rules(300, 100, 200, rng)
+    fast, naive = AlertEngine(rules), NaiveEngine(rules)
+    mismatches = total = 0
+    for y in sweeps(x, 150, rng):
+        got = [(e['rule'], e['state']) for e in fast.process(x, y)]
+        want = naive.process(x, y)
+        total += len(want)
+        mismatches += sorted(got) != sorted(want)
+    print(f"Сверка с построчной проверкой: событий {total}, свипов с расхождениями {mismatches}")
+
+    # Производительность
+    x = np.linspace(0, 6000, args.bins)
+    engine = AlertEngine(make_rules(args.rules, 0, 6000, rng))
+    data = list(sweeps(x, 20, rng))
+    for y in data:
+        engine.process(x, y)  # обучение базовой линии и прогрев
+    start = time.perf_counter()
+    events = 0
+    for i in range(args.sweeps):
+        events += len(engine.process(x, data[i % len(data)]))
+    elapsed = (time.perf_counter() - start) / args.sweeps
+    print(f"{args.rules} правил, {args.bins} бинов: {elapsed * 1e3:.2f} мс на свип, событий {events}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
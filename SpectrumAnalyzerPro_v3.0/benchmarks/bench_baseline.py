@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк живой базовой линии: точность P² против np.percentile по всей
+истории, реакция на скачок уровня и время обновления на широком свипе.
+
+Запуск из корня проекта:
+    python benchmarks/bench_baseline.py [--bins 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.baseline import P2Quantile, StreamingBaseline
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--bins', type=int, default=100000)
+    ap.add_argument('--sweeps', type=int, default=200)
+    args = ap.parse_args()
+    rng = np.random.default_rng(11)
+
+    # Шум приёмника плюс редкие импульсные помехи
+    data = rng.normal(-90, 4, size=(2000, 1000)) + rng.exponential(3, size=(2000, 1000))
+    for percentile in (10, 20, 50, 90):
+        estimator = P2Quantile(data.shape[1], percentile / 100)
+        for y in data:
+            estimator.update(y)
+        error = np.abs(estimator.value - np.percentile(data, percentile, axis=0))
+        print(f"P{percentile}: ошибка против np.percentile — средняя {error.mean():.3f} дБ, макс. {error.max():.3f} дБ")
+
+    baseline = StreamingBaseline(data.shape[1], 20, window=200)
+    for i, y in enumerate(data[:600]):
+        baseline.update(y + (10 if i >= 300 else 0))
+    shift = np.median(baseline.value - np.percentile(data, 20, axis=0))
+    print(f"Скачок +10 дБ на 300-м свипе, окно 200: через 300 свипов линия сдвинулась на {shift:.2f} дБ")
+
+    baseline = StreamingBaseline(args.bins)
+    sweeps = rng.normal(-90, 4, size=(8, args.bins)).astype(np.float32)
+    start = time.perf_counter()
+    for i in range(args.sweeps):
+        baseline.update(sweeps[i % len(sweeps)])
+    elapsed = (time.perf_counter() - start) / args.sweeps
+    print(f"{args.bins} бинов: {elapsed * 1e3:.2f} мс на свип")
+
+
+if __name__ == '__main__':
+    main()
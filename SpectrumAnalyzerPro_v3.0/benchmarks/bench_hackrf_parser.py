@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Replay-бенчмарк парсера hackrf_sweep: прогоняет записанный вывод `hackrf_sweep -B`
+через HackRFSweepParser кусками фиксированного размера и печатает записей/с и МБ/с.
+
+Запуск из корня проекта:
+    hackrf_sweep -f 100:6000 -B -N 50 > capture.bin
+    python benchmarks/bench_hackrf_parser.py capture.bin
+    python benchmarks/bench_hackrf_parser.py --synthetic capture.bin   # сгенерировать файл
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.stream_parsers import HackRFSweepParser
+
+
+def write_synthetic_capture(path: str, start_mhz: int = 1, end_mhz: int = 6001,
+                            sweeps: int = 20, bins: int = 256):
+    """Сгенерировать файл в формате hackrf_sweep -B (записи по 5 МГц)."""
+    record_length = 16 + bins * 4
+    with open(path, 'wb') as f:
+        for _ in range(sweeps):
+            for low in range(start_mhz, end_mhz, 5):
+                rssi = np.random.uniform(-100, -20, bins).astype('<f4')
+                f.write(struct.pack('<IQQ', record_length, low * 1000000, (low + 5) * 1000000))
+                f.write(rssi.tobytes())
+
+
+def replay(data: bytes, chunk_size: int):
+    parser = HackRFSweepParser()
+    view = memoryview(data)
+    t0 = time.perf_counter()
+    for offset in range(0, len(data), chunk_size):
+        parser.feed(view[offset:offset + chunk_size])
+    elapsed = time.perf_counter() - t0
+    return parser.records, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('capture', help='файл с выводом hackrf_sweep -B')
+    ap.add_argument('--synthetic', action='store_true', help='сначала сгенерировать синтетический файл')
+    ap.add_argument('--chunk', type=int, default=65536, help='размер куска чтения, байт')
+    args = ap.parse_args()
+
+    if args.synthetic:
+        write_synthetic_capture(args.capture)
+    with open(args.capture, 'rb') as f:
+        data = f.read()
+
+    records, elapsed = replay(data, args.chunk)
+    mb = len(data) / 1e6
+    print(f"Файл: {args.capture} ({mb:.1f} МБ), кусок {args.chunk} байт")
+    print(f"Записей: {records}, время: {elapsed:.3f} с")
+    print(f"{records / elapsed:.0f} записей/с, {mb / elapsed:.1f} МБ/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк HistoryBuffer: кольцевой буфер с индексом записи против
+старой реализации на np.roll (копирование всей истории на каждый ряд).
+
+Запуск из корня проекта:
+    python benchmarks/bench_history_buffer.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.history_buffer import HistoryBuffer
+
+
+class RollHistoryBuffer:
+    """Прежняя реализация буфера — для сравнения."""
+    def __init__(self, max_size: int, data_size: int):
+        self.max_size = max_size
+        self.data_size = data_size
+        self.history_size = 0
+        self.buffer = np.full((max_size, data_size), -100.0, dtype=np.float32)
+
+    def append(self, data: np.ndarray):
+        if self.history_size < self.max_size:
+            self.history_size += 1
+        self.buffer = np.roll(self.buffer, -1, axis=0)
+        self.buffer[-1] = data.copy()
+
+    def get_buffer(self) -> np.ndarray:
+        return self.buffer[-self.history_size:]
+
+
+def measure(buffer_cls, max_size: int, data_size: int, appends: int) -> float:
+    """Вернуть число добавлений в секунду."""
+    buf = buffer_cls(max_size, data_size)
+    row = np.random.uniform(-100, 0, data_size).astype(np.float32)
+    t0 = time.perf_counter()
+    for _ in range(appends):
+        buf.append(row)
+        buf.get_buffer()
+    return appends / (time.perf_counter() - t0)
+
+
+def main():
+    data_size = 4096
+    print(f"Бинов в ряду: {data_size}")
+    print(f"{'Рядов':>8} {'np.roll, ряд/с':>16} {'кольцо, ряд/с':>16} {'ускорение':>10}")
+    for max_size in (100, 1000, 10000):
+        # np.roll на 10000 рядах очень медленный — ограничиваем число итераций
+        appends = max(20, 200000 // max_size)
+        old = measure(RollHistoryBuffer, max_size, data_size, appends)
+        new = measure(HistoryBuffer, max_size, data_size, appends * 10)
+        print(f"{max_size:>8} {old:>16.0f} {new:>16.0f} {new / old:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
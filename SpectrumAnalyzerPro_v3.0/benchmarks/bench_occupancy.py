@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк статистики занятости: сверка с расчётом по полной матрице свипов,
+проверка отсутствия выделений памяти в update() и время одного свипа.
+
+Запуск из корня проекта:
+    python benchmarks/bench_occupancy.py [--bins 100000] [--sweeps 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.occupancy import OccupancyStats
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--bins', type=int, default=100000)
+    ap.add_argument('--sweeps', type=int, default=500)
+    args = ap.parse_args()
+    rng = np.random.default_rng(5)
+
+    # Сверка на небольшой матрице
+    x = np.linspace(400, 450, 500)
+    data = rng.normal(-85, 8, size=(300, len(x))).astype(np.float32)
+    times = 1000.0 + np.cumsum(rng.uniform(0.5, 1.5, size=len(data)))
+    stats = OccupancyStats(x, threshold_db=-80, period=60)
+    for t, y in zip(times, data):
+        stats.update(y, t)
+    above = data >= -80
+    duty = above.mean(axis=0)
+    time_above = (above[1:] * np.diff(times)[:, None]).sum(axis=0)
+    index = np.clip(((data + 120) / 1.0), 0, stats.hist_bins - 1).astype(np.intp)
+    hist = np.stack([np.bincount(index[:, i], minlength=stats.hist_bins) for i in range(len(x))])
+    rows = ((times - times[0]) // 60).astype(int)
+    heat = np.stack([above[rows == r].mean(axis=0) for r in range(rows.max() + 1)])
+    ok = (np.allclose(stats.duty_cycle, duty) and np.allclose(stats.time_above, time_above)
+          and np.array_equal(stats.hist, hist) and np.allclose(stats.heatmap(), heat)
+          and np.allclose(stats.mean_power, data.mean(axis=0, dtype=np.float64), atol=1e-4))
+    print(f"Сверка с полной матрицей: {'совпадает' if ok else 'РАСХОЖДЕНИЕ'}")
+
+    # Выделения памяти и время на свип
+    x = np.linspace(0, 6000, args.bins)
+    stats = OccupancyStats(x, period=1e9)
+    sweeps = rng.normal(-85, 8, size=(8, args.bins)).astype(np.float32)
+    stats.update(sweeps[0])
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    for i in range(20):
+        stats.update(sweeps[i % len(sweeps)])
+    grown = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+                if stat.size_diff > 0)
+    tracemalloc.stop()
+    print(f"Рост памяти за 20 свипов: {grown} Б")
+
+    start = time.perf_counter()
+    for i in range(args.sweeps):
+        stats.update(sweeps[i % len(sweeps)])
+    elapsed = (time.perf_counter() - start) / args.sweeps
+    print(f"{args.bins} бинов, {stats.hist_bins} корзин: {elapsed * 1e3:.2f} мс на свип")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
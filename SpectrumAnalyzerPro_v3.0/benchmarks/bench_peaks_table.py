@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк таблицы пиков: модель/прокси с обновлением по разнице против прежнего
+QTableWidget, пересоздающего все ячейки. 1000 пиков, обновление 10 раз в секунду:
+время на обновление включает синхронную перерисовку таблицы. Проверяется, что
+после серии свипов таблица показывает ровно отфильтрованные пики последнего свипа,
+что прокси проходит QAbstractItemModelTester (в том числе на пустом свипе) и что
+выделение остаётся на пике, сдвинувшемся по частоте в пределах своей полосы.
+
+Запуск из корня проекта (можно без дисплея):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_peaks_table.py [--peaks 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from PyQt5.QtCore import Qt, QItemSelectionModel
+from PyQt5.QtTest import QAbstractItemModelTester
+from core.peaks import PEAK_DTYPE, PEAK_COLUMNS, peaks_to_list
+from gui.peaks_table import PeaksTableWidget
+
+
+def make_sweeps(count: int, peaks: int, churn: float = 0.02):
+    """Серия свипов: амплитуды дрожат, доля пиков исчезает и появляется на новых частотах."""
+    rng = np.random.default_rng(4)
+    freqs = np.sort(rng.choice(np.arange(100, 6000, 0.05), peaks, replace=False))
+    sweeps = []
+    for _ in range(count):
+        replace = rng.random(peaks) < churn
+        freqs[replace] = rng.choice(np.arange(100, 6000, 0.05), int(replace.sum()))
+        freqs = np.unique(freqs)
+        while len(freqs) < peaks:
+            freqs = np.unique(np.concatenate((freqs, rng.choice(np.arange(100, 6000, 0.05), peaks - len(freqs)))))
+        sweep = np.empty(peaks, dtype=PEAK_DTYPE)
+        widths = rng.uniform(0.005, 0.02, peaks)
+        sweep['freq'] = freqs
+        sweep['amplitude'] = rng.uniform(-70, -20, peaks)
+        sweep['left'] = freqs - widths / 2
+        sweep['right'] = freqs + widths / 2
+        sweep['width'] = widths
+        sweep['modulation'] = rng.choice(["FM", "AM", "Digital"], peaks).astype(object)
+        sweep['type'] = rng.choice(["NBFM (Radio Amateur)", "FM Broadcast", "LoRa / Sigfox"], peaks).astype(object)
+        sweeps.append(sweep)
+    return sweeps
+
+
+def legacy_update(table: QTableWidget, peak_list: list, min_amp: float, min_width: float):
+    """Прежний update_display: фильтр по списку словарей и новые QTableWidgetItem на каждую ячейку."""
+    filtered = [p for p in peak_list if p["Амплитуда (дБ)"] >= min_amp and p["Ширина (МГц)"] >= min_width]
+    table.setRowCount(len(filtered))
+    for row, peak in enumerate(filtered):
+        for col, key in enumerate(PEAK_COLUMNS):
+            value = peak[key]
+            text = f"{value:.3f}" if isinstance(value, float) else str(value)
+            item = QTableWidgetItem(text)
+            item.setTextAlignment(Qt.AlignCenter)
+            table.setItem(row, col, item)
+
+
+def bench_legacy(sweeps) -> float:
+    table = QTableWidget()
+    table.setColumnCount(len(PEAK_COLUMNS))
+    table.setHorizontalHeaderLabels(PEAK_COLUMNS)
+    table.resize(900, 600)
+    table.show()
+    lists = [peaks_to_list(sweep) for sweep in sweeps]  # прежний воркер отдавал список словарей
+    start = time.perf_counter()
+    for peak_list in lists:
+        legacy_update(table, peak_list, -50, 0.01)
+        table.viewport().repaint()
+    return (time.perf_counter() - start) / len(sweeps)
+
+
+def bench_model(sweeps):
+    widget = PeaksTableWidget(classifier=None)
+    widget.resize(900, 600)
+    widget.show()
+    widget.table_view.sortByColumn(1, Qt.DescendingOrder)  # сортировка по амплитуде
+    start = time.perf_counter()
+    for sweep in sweeps:
+        widget.update_table(sweep)
+        widget.table_view.viewport().repaint()
+    elapsed = (time.perf_counter() - start) / len(sweeps)
+
+    last = sweeps[-1]
+    expected = np.sort(last['freq'][(last['amplitude'] >= -50) & (last['width'] >= 0.01)])
+    proxy = widget.proxy
+    shown = np.array([float(proxy.index(row, 0).data(Qt.UserRole)) for row in range(proxy.rowCount())])
+    amplitudes = [proxy.index(row, 1).data(Qt.UserRole) for row in range(proxy.rowCount())]
+    ok = np.array_equal(np.sort(shown), expected) and amplitudes == sorted(amplitudes, reverse=True)
+
+    start = time.perf_counter()
+    widget.min_amp_spin.setValue(-40)
+    widget.table_view.viewport().repaint()
+    filter_time = time.perf_counter() - start
+    return elapsed, filter_time, ok
+
+
+def check_model() -> bool:
+    """Согласованность прокси на каждом сигнале и перенос выделения сопоставленным пикам."""
+    sweeps = make_sweeps(11, 100)  # тестер обходит всю модель на каждом сигнале
+    widget = PeaksTableWidget(classifier=None)
+    widget.show()
+    testers = [QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+               for model in (widget.model, widget.proxy)]
+    layouts = []
+    widget.proxy.layoutChanged.connect(lambda *_: layouts.append(1))
+    ok = True
+    for sweep in sweeps[:5] + [np.empty(0, dtype=PEAK_DTYPE)] + sweeps[5:10]:
+        widget.update_table(sweep)
+        ok &= np.array_equal(widget.proxy._rows, widget.proxy._mapping())
+        ok &= widget.proxy.hasChildren() == (widget.proxy.rowCount() > 0)
+
+    # Амплитуды дрожат, порядок по частоте тот же — без смены раскладки
+    sweep = sweeps[10].copy()
+    widget.update_table(sweep)
+    layouts.clear()
+    sweep = sweep.copy()
+    sweep['amplitude'] += 0.5
+    widget.update_table(sweep)
+    ok &= not layouts
+
+    # Выделенный пик сдвигается на бин — выделение остаётся на нём
+    index = widget.proxy.index(3, 0)
+    row = widget.proxy.mapToSource(index).row()
+    widget.table_view.selectionModel().select(index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+    sweep = sweep.copy()
+    sweep['freq'][row] += (sweep['right'][row] - sweep['freq'][row]) / 2
+    widget.update_table(sweep)
+    selected = widget.table_view.selectionModel().selectedRows()
+    ok &= [widget.proxy.mapToSource(i).row() for i in selected] == [row]
+    widget.close()
+    del testers
+    return bool(ok)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--peaks', type=int, default=1000)
+    ap.add_argument('--sweeps', type=int, default=50)
+    ap.add_argument('--rate', type=float, default=10.0, help='частота обновлений, Гц')
+    args = ap.parse_args()
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    sweeps = make_sweeps(args.sweeps, args.peaks)
+    budget = 1.0 / args.rate
+    legacy = bench_legacy(sweeps)
+    model, filter_time, ok = bench_model(sweeps)
+    consistent = check_model()
+    print(f"{args.peaks} пиков, обновление {args.rate:g} Гц (бюджет {budget * 1e3:.0f} мс):")
+    print(f"  QTableWidget, все ячейки заново: {legacy * 1e3:.1f} мс ({legacy / budget:.0%} бюджета)")
+    print(f"  модель + прокси, по разнице:     {model * 1e3:.1f} мс ({model / budget:.0%} бюджета, x{legacy / model:.1f})")
+    print(f"  смена фильтра: {filter_time * 1e3:.1f} мс")
+    print(f"Таблица совпадает с последним свипом (фильтр, сортировка): {'да' if ok else 'НЕТ'}")
+    print(f"Прокси согласован на каждом сигнале, выделение идёт за пиком: {'да' if consistent else 'НЕТ'}")
+    return 0 if ok and consistent else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пакетного SignalClassifier против поштучного пути на 10/100/1000 пиках.
+Перед замером проверяет, что метки модуляции и типы сигналов совпадают
+со скалярными detect_modulation_around_peak/classify_signal (иначе выход с ошибкой).
+
+Запуск из корня проекта:
+    python benchmarks/bench_signal_classifier.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.signal_classifier import SignalClassifier
+
+
+def make_spectrum(rng, bins: int) -> np.ndarray:
+    """Шум + пики разной ширины, как в реальном скане."""
+    y = rng.normal(-80, 6, bins)
+    for _ in range(200):
+        center = rng.integers(0, bins)
+        width = rng.integers(1, 60)
+        y += rng.uniform(5, 50) * np.exp(-0.5 * ((np.arange(bins) - center) / width) ** 2)
+    return y
+
+
+def scalar_path(classifier, y, peaks, widths):
+    mods = [classifier.detect_modulation_around_peak(y, int(p)) for p in peaks]
+    types = [classifier.classify_signal(m, w) for m, w in zip(mods, widths)]
+    return mods, types
+
+
+def batch_path(classifier, y, peaks, widths):
+    mods = classifier.detect_modulation_batch(y, peaks)
+    types = classifier.classify_signals(mods, widths)
+    return mods, types
+
+
+def check_equivalence(classifier, rng) -> int:
+    mismatches = 0
+    for _ in range(50):
+        y = make_spectrum(rng, int(rng.integers(100, 20000)))
+        if rng.random() < 0.3:
+            y = np.round(y)  # целые дБ — много нулевых разностей и равенств порогам
+        peaks = rng.integers(0, len(y), 300)
+        peaks[:2] = (0, len(y) - 1)  # усечённые окна у краёв
+        widths = rng.uniform(0, 2, len(peaks))
+        widths[:20] = [0.01, 0.1, 0.05, 0.25, 0.03, 0.02, 0.2, 1.0, 0.0, 0.5] * 2
+        mods_s, types_s = scalar_path(classifier, y, peaks, widths)
+        mods_b, types_b = batch_path(classifier, y, peaks, widths)
+        mismatches += sum(a != b for a, b in zip(mods_s, mods_b))
+        mismatches += sum(a != b for a, b in zip(types_s, types_b))
+    return mismatches
+
+
+def main():
+    rng = np.random.default_rng(0)
+    classifier = SignalClassifier()
+
+    mismatches = check_equivalence(classifier, rng)
+    print(f"Расхождений с поштучным путём: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+    y = make_spectrum(rng, 100000)
+    print(f"{'Пиков':>6} {'поштучно, мс':>14} {'пакетом, мс':>13} {'ускорение':>10}")
+    for n_peaks in (10, 100, 1000):
+        peaks = np.sort(rng.integers(25, len(y) - 25, n_peaks))
+        widths = rng.uniform(0, 2, n_peaks)
+        repeats = max(3, 3000 // n_peaks)
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            scalar_path(classifier, y, peaks, widths)
+        scalar = (time.perf_counter() - t0) / repeats
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            batch_path(classifier, y, peaks, widths)
+        batch = (time.perf_counter() - t0) / repeats
+        print(f"{n_peaks:>6} {scalar * 1e3:>14.2f} {batch * 1e3:>13.2f} {scalar / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
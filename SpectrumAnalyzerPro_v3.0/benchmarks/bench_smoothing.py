@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сглаживания: сверка кэшированных ядер Савицкого–Голея с
+scipy.signal.savgol_filter (окно rectangular), время на свип и на пересчёт
+всей истории одним вызовом против построчного savgol_filter.
+
+Запуск из корня проекта:
+    python benchmarks/bench_smoothing.py [--bins 100000] [--history 100] [--length 11]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.smoothing import SMOOTH_WINDOWS, savgol_matrix, savgol_smooth
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--bins', type=int, default=100000)
+    ap.add_argument('--history', type=int, default=100)
+    ap.add_argument('--length', type=int, default=11)
+    ap.add_argument('--order', type=int, default=3)
+    args = ap.parse_args()
+    rng = np.random.default_rng(7)
+
+    try:
+        from scipy.signal import savgol_filter
+    except ImportError:
+        savgol_filter = None
+        print("scipy не установлен — сверка и сравнение пропущены")
+
+    ok = True
+    if savgol_filter is not None:
+        y = rng.normal(-90, 5, 5000).astype(np.float32)
+        for length in (3, 5, 11, 31, 101):
+            order = min(args.order, length - 1)
+            error = np.abs(savgol_smooth(y, length, order, "rectangular") - savgol_filter(y, length, order)).max()
+            ok &= bool(error < 1e-3)
+            print(f"Длина {length}, порядок {order}: расхождение с savgol_filter {error:.2e} дБ")
+
+    history = rng.normal(-90, 5, size=(args.history, args.bins)).astype(np.float32)
+    rows = np.stack([savgol_smooth(row, args.length, args.order, "hanning") for row in history[:5]])
+    ok &= bool(np.allclose(savgol_smooth(history[:5], args.length, args.order, "hanning"), rows, atol=1e-4))
+    print(f"История одним вызовом против построчного: {'совпадает' if ok else 'РАСХОЖДЕНИЕ'}")
+
+    savgol_matrix.cache_clear()
+    for window in SMOOTH_WINDOWS:
+        savgol_smooth(history[0], args.length, args.order, window)
+        savgol_smooth(history[1], args.length, args.order, window)
+    info = savgol_matrix.cache_info()
+    print(f"Кэш ядер: {info.misses} расчётов, {info.hits} попаданий на {2 * len(SMOOTH_WINDOWS)} вызовов")
+
+    sweep = history[-1]
+    elapsed = timed(lambda: savgol_smooth(sweep, args.length, args.order, "hanning"), 50)
+    line = f"Свип {args.bins} бинов, длина {args.length}: {elapsed * 1e3:.2f} мс"
+    if savgol_filter is not None:
+        reference = timed(lambda: savgol_filter(sweep, args.length, args.order), 50)
+        line += f" (savgol_filter {reference * 1e3:.2f} мс, x{reference / elapsed:.1f})"
+    print(line)
+
+    elapsed = timed(lambda: savgol_smooth(history, args.length, args.order, "hanning"), 3)
+    line = f"История {args.history}x{args.bins}: {elapsed * 1e3:.1f} мс"
+    if savgol_filter is not None:
+        reference = timed(lambda: [savgol_filter(row, args.length, args.order) for row in history], 3)
+        line += f" (построчно savgol_filter {reference * 1e3:.1f} мс, x{reference / elapsed:.1f})"
+    print(line)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
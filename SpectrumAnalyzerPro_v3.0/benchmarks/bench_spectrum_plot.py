@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк отрисовки спектра: пять кривых с огибающими мин/макс (SpectrumPlotWidget)
+против прежней передачи полных массивов в PlotDataItem. Время включает
+отрисовку виджета (grab), проверяется, что пик в один бин не теряется,
+в том числе после масштабирования.
+
+Запуск из корня проекта (можно без дисплея):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_spectrum_plot.py [--bins 500000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+from gui.spectrum_plot import SpectrumPlotWidget
+
+
+def make_frames(bins: int, count: int):
+    rng = np.random.default_rng(9)
+    x = np.linspace(1, 6000, bins)
+    frames = []
+    for _ in range(count):
+        y = rng.normal(-90, 3, bins).astype(np.float32)
+        y[bins // 3] = -10.0  # узкий пик в один бин
+        frames.append(y)
+    return x, frames
+
+
+def traces_of(x, y):
+    return {'x': x, 'average': y - 3, 'peak_hold_max': y + 5, 'peak_hold_min': y - 8}
+
+
+def bench_lod(x, frames, width: int) -> float:
+    widget = SpectrumPlotWidget()
+    widget.resize(width, 500)
+    widget.show()
+    widget.update_baseline({'baseline_x': x, 'baseline': frames[0] - 10})
+    start = time.perf_counter()
+    for y in frames:
+        widget.update_main({'x': x, 'y': y})
+        widget.update_traces(traces_of(x, y))
+        widget.grab()
+    elapsed = (time.perf_counter() - start) / len(frames)
+    widget.close()
+    return elapsed
+
+
+def bench_full(x, frames, width: int) -> float:
+    widget = pg.PlotWidget()
+    widget.resize(width, 500)
+    widget.show()
+    curves = [widget.plot(pen=pg.mkPen(color)) for color in ('cyan', 'blue', 'red', 'green', 'magenta')]
+    curves[4].setData(x, frames[0] - 10)
+    start = time.perf_counter()
+    for y in frames:
+        traces = traces_of(x, y)
+        curves[0].setData(x, y)
+        curves[1].setData(x, traces['average'])
+        curves[2].setData(x, traces['peak_hold_max'])
+        curves[3].setData(x, traces['peak_hold_min'])
+        widget.grab()
+    elapsed = (time.perf_counter() - start) / len(frames)
+    widget.close()
+    return elapsed
+
+
+def check_peaks(x, y, width: int) -> bool:
+    widget = SpectrumPlotWidget()
+    widget.resize(width, 500)
+    widget.show()
+    widget.update_main({'x': x, 'y': y})
+    _, drawn = widget.curve_main.getData()
+    ok = len(drawn) <= 2 * width * widget.devicePixelRatioF() + 4 and drawn.max() == y.max()
+    # Масштабирование вокруг пика: огибающая пересчитывается по новому виду
+    peak = x[len(x) // 3]
+    widget.plot_widget.setXRange(peak - 50, peak + 50, padding=0)
+    QApplication.processEvents()
+    drawn_x, drawn = widget.curve_main.getData()
+    ok &= drawn.max() == y.max() and drawn_x[0] <= peak - 50 and drawn_x[-1] >= peak + 50
+    widget.close()
+    return bool(ok)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--bins', type=int, default=500000)
+    ap.add_argument('--frames', type=int, default=20)
+    ap.add_argument('--width', type=int, default=1200)
+    args = ap.parse_args()
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    x, frames = make_frames(args.bins, args.frames)
+    ok = check_peaks(x, frames[0], args.width)
+    print(f"Пик в один бин на экране (весь диапазон и после масштабирования): {'да' if ok else 'НЕТ'}")
+
+    lod = bench_lod(x, frames, args.width)
+    full = bench_full(x, frames, args.width)
+    print(f"{args.bins} бинов, 5 кривых, ширина {args.width} px:")
+    print(f"  полные массивы:    {full * 1e3:.1f} мс на кадр")
+    print(f"  огибающие мин/макс: {lod * 1e3:.1f} мс на кадр (x{full / lod:.1f})")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Проверка времени холодного старта: `python -X importtime -c "import gui.main_window"`.
+Импорт повторяется в отдельных процессах, берётся минимум (меньше шума от кэша ФС).
+Скрипт завершается с кодом 1, если время превышает бюджет или при старте
+загружены модули, которые должны импортироваться лениво (scipy, бэкенды, диалоги).
+
+Запуск из корня проекта:
+    python benchmarks/bench_startup.py [--budget 600] [--runs 5] [--module gui.main_window]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которых не должно быть в sys.modules сразу после импорта главного окна
+LAZY_MODULES = [
+    'scipy',
+    'pyqtgraph.exporters',
+    'backend.rtl_power', 'backend.hackrf_sweep', 'backend.airspy_rx',
+    'backend.soapy_power', 'backend.playback', 'backend.scan_coordinator',
+    'gui.settings_dialog', 'gui.iq_record_dialog', 'gui.history_waterfall',
+    'data.waterfall_pyramid',
+]
+
+
+def import_time(module: str):
+    """Один холодный импорт: (общее время, мкс; [(мкс, имя)] прямых зависимостей модуля)."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=project_root, capture_output=True, text=True, check=True
+    )
+    total, children = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2  # отступ importtime: 1 пробел + 2 на уровень
+        if depth == 0:
+            total += int(cumulative)
+        elif depth == 1:
+            children.append((int(cumulative), name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def loaded_lazy_modules(module: str):
+    code = (f"import sys, {module}; "
+            f"print('\\n'.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--module', default='gui.main_window')
+    ap.add_argument('--budget', type=float, default=600, help='бюджет холодного старта, мс')
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--top', type=int, default=8, help='сколько самых долгих зависимостей показать')
+    args = ap.parse_args()
+
+    runs = [import_time(args.module) for _ in range(args.runs)]
+    total, top = min(runs, key=lambda run: run[0])
+    print(f"import {args.module}: {total / 1e3:.0f} мс (минимум из {args.runs}), бюджет {args.budget:.0f} мс")
+    for cumulative, name in top[:args.top]:
+        print(f"  {cumulative / 1e3:8.1f} мс  {name}")
+
+    failed = False
+    eager = loaded_lazy_modules(args.module)
+    if eager:
+        print(f"ОШИБКА: при старте загружены модули, которые должны грузиться лениво: {', '.join(eager)}")
+        failed = True
+    if total / 1e3 > args.budget:
+        print(f"ОШИБКА: холодный старт {total / 1e3:.0f} мс превышает бюджет {args.budget:.0f} мс")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк слежения за источниками: имитация долгого обзора — тысячи
+передатчиков включаются и выключаются, частота и мощность пиков дрожат.
+Проверяется, что трек не смешивает источники и что число треков совпадает
+с числом сеансов (перерыв дольше timeout — новый трек); время обновления
+не должно расти с числом треков в хранилище.
+
+Запуск из корня проекта:
+    python benchmarks/bench_tracker.py [--emitters 20000] [--sweeps 600]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.peaks import PEAK_DTYPE
+from core.tracker import EmitterTracker, nearest_join
+
+
+def brute_force_join(track_freqs: np.ndarray, freqs: np.ndarray, tolerance: float):
+    """Наивное соединение: для каждого пика — поиск ближайшего трека перебором."""
+    pairs = {}
+    for j, freq in enumerate(freqs):
+        dist = np.abs(track_freqs - freq)
+        i = int(dist.argmin())
+        if dist[i] <= tolerance and (i not in pairs or dist[i] < abs(track_freqs[i] - freqs[pairs[i]])):
+            pairs[i] = j
+    return pairs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--emitters', type=int, default=20000)
+    ap.add_argument('--sweeps', type=int, default=600)
+    ap.add_argument('--duty', type=float, default=0.05, help='доля времени в эфире')
+    ap.add_argument('--timeout', type=float, default=60.0)
+    args = ap.parse_args()
+    rng = np.random.default_rng(13)
+
+    # Передатчики на сетке 0.1 МГц — соседи дальше допуска связывания
+    freqs = np.sort(rng.choice(np.arange(24.0, 6000.0, 0.1), args.emitters, replace=False))
+    power = rng.uniform(-80, -20, args.emitters)
+    width = rng.uniform(0.005, 0.05, args.emitters)
+    p_off = 0.05                                   # средний сеанс — 20 свипов
+    p_on = p_off * args.duty / (1 - args.duty)
+    on = rng.random(args.emitters) < args.duty
+    last_on = np.full(args.emitters, -np.inf)
+
+    tracker = EmitterTracker(tolerance_mhz=0.025, timeout=args.timeout)
+    owner = {}            # трек -> источник
+    mixed = 0
+    expected = 0
+    times = []
+    peaks_total = 0
+    for sweep in range(args.sweeps):
+        now = 1000.0 + sweep
+        flip = rng.random(args.emitters) < np.where(on, p_off, p_on)
+        on ^= flip
+        emitters = np.flatnonzero(on)
+        expected += int(np.count_nonzero(now - last_on[emitters] > args.timeout))
+        last_on[emitters] = now
+
+        peaks = np.zeros(len(emitters), dtype=PEAK_DTYPE)
+        peaks['freq'] = freqs[emitters] + rng.normal(0, 0.003, len(emitters))
+        peaks['amplitude'] = power[emitters] + rng.normal(0, 2, len(emitters))
+        peaks['width'] = width[emitters] * rng.uniform(0.8, 1.2, len(emitters))
+        peaks_total += len(peaks)
+
+        start = time.perf_counter()
+        tracks = tracker.update(peaks, now)
+        times.append(time.perf_counter() - start)
+
+        for track, emitter in zip(tracks.tolist(), emitters.tolist()):
+            if owner.setdefault(track, emitter) != emitter:
+                mixed += 1
+
+    # Соединение последнего свипа: searchsorted против перебора по всем трекам
+    track_freqs = tracker.columns['last_freq'][:len(tracker)].copy()
+    order = np.argsort(track_freqs)
+    start = time.perf_counter()
+    i, j = nearest_join(track_freqs[order], peaks['freq'], 0.025)
+    join_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pairs = brute_force_join(track_freqs, peaks['freq'], 0.025)
+    brute_time = time.perf_counter() - start
+    same = dict(zip(order[i].tolist(), j.tolist())) == pairs
+
+    times = np.array(times) * 1e3
+    tail = max(1, len(times) // 10)
+    store = sum(column[:len(tracker)].nbytes for column in tracker.columns.values())
+    ok = mixed == 0 and len(tracker) == expected and same
+    print(f"Свипов: {args.sweeps}, пиков: {peaks_total} (~{peaks_total // args.sweeps} на свип)")
+    print(f"Треков: {len(tracker)} (ожидалось по сеансам {expected}), активных: {len(tracker.active)}")
+    print(f"Пиков, отнесённых к чужому источнику: {mixed}")
+    print(f"Обновление: первые {tail} свипов {times[:tail].mean():.2f} мс, последние {tail} — "
+          f"{times[-tail:].mean():.2f} мс, макс. {times.max():.2f} мс")
+    print(f"Соединение {len(peaks)} пиков со всеми {len(tracker)} треками: searchsorted "
+          f"{join_time * 1e3:.2f} мс, перебор {brute_time * 1e3:.1f} мс (x{brute_time / join_time:.0f}), "
+          f"пары совпадают: {'да' if same else 'НЕТ'}")
+    print(f"Хранилище треков: {store / 1e6:.1f} МБ ({store / max(len(tracker), 1):.0f} Б на трек)")
+    print(f"Проверка: {'пройдена' if ok else 'НЕ ПРОЙДЕНА'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
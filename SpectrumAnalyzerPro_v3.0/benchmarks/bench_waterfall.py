@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк обновления водопада: плиточный WaterfallPlotWidget против прежнего
+подхода (срез последних N рядов + транспонирование + setImage на каждый свип).
+Время включает рендер изображения (ImageItem.render), а не только setImage.
+
+Запуск из корня проекта (можно без дисплея):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_waterfall.py
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+from core.history_buffer import HistoryBuffer
+from gui.waterfall_plot import WaterfallPlotWidget
+
+
+def render_dirty(items):
+    """Принудительно отрендерить изображения, которые Qt перерисовал бы при paint()."""
+    for img in items:
+        if img.image is not None and img._renderRequired:
+            img.render()
+
+
+def bench_tiled(bins: int, depth: int, updates: int) -> float:
+    widget = WaterfallPlotWidget(depth=depth)
+    storage = SimpleNamespace(x=np.linspace(100, 200, bins), history=HistoryBuffer(100, bins))
+    row = np.random.uniform(-100, -20, bins).astype(np.float32)
+    # Прогрев: заполняем водопад на всю глубину
+    for _ in range(depth):
+        storage.history.append(row)
+    widget.update_waterfall(storage)
+    render_dirty(widget.tiles)
+    t0 = time.perf_counter()
+    for _ in range(updates):
+        storage.history.append(row)
+        widget.update_waterfall(storage)
+        render_dirty(widget.tiles)
+    return (time.perf_counter() - t0) / updates
+
+
+def bench_full(bins: int, depth: int, updates: int) -> float:
+    img = pg.ImageItem()
+    img.setLevels((-100, -20))
+    history = np.random.uniform(-100, -20, (depth, bins)).astype(np.float32)
+    t0 = time.perf_counter()
+    for _ in range(updates):
+        frame = history[-depth:].T
+        img.setImage(frame, autoLevels=False)
+        img.render()
+    return (time.perf_counter() - t0) / updates
+
+
+def main():
+    app = QApplication(sys.argv)
+    updates = 50
+    print(f"{'Бинов':>8} {'глубина':>8} {'setImage, мс':>14} {'плитки, мс':>12}")
+    for bins in (1000, 10000, 50000):
+        for depth in (50, 2000):
+            full = bench_full(bins, depth, max(3, updates * 1000 // (bins * depth // 1000 + 1)))
+            tiled = bench_tiled(bins, depth, updates)
+            print(f"{bins:>8} {depth:>8} {full * 1e3:>14.2f} {tiled * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
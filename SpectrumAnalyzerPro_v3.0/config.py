@@ -36,8 +36,9 @@ DEVICE_BACKENDS = {
     "airspy_rx": {
         "cmd": "airspy_rx",
         "args_template": [
-            "-f", "{start}e6",
+            "-f", "{center}",
             "-s", "2500000",
+            "-t", "2",
             "-r", "/dev/stdout",
             "-g", "{gain}"
         ],
@@ -66,6 +67,24 @@ DEVICE_BACKENDS = {
         "default_ppm": 0,
         "output_type": "binary",
         "module": "backend.soapy_power"
+    },
+    "multi": {
+        "cmd": "",
+        "args_template": [],
+        "hint_range": (0, 7250),
+        "hint_step": "Как у устройств списка",
+        "default_gain": 20,
+        "output_type": "multi",
+        "module": "backend.scan_coordinator"
+    },
+    "playback": {
+        "cmd": "",
+        "args_template": [],
+        "hint_range": (0, 7250),
+        "hint_step": "Из файла записи",
+        "default_gain": 0,
+        "output_type": "file",
+        "module": "backend.playback"
     }
 }
 
@@ -0,0 +1,52 @@
+"""
+Ядро обработки спектра без зависимостей от Qt: разбор вывода утилит, сборка
+свипов, история, производные кривые, пики, запись и асинхронный драйвер.
+Используется GUI и демоном мониторинга (python -m core.daemon).
+
+Имена импортируются при первом обращении (PEP 562), чтобы `import core.daemon`
+не тянул scipy и прочие тяжёлые модули раньше, чем они понадобятся.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'HistoryBuffer': '.history_buffer',
+    'SweepGrid': '.sweep_grid',
+    'TraceAccumulator': '.traces',
+    'fuse_traces': '.traces',
+    'history_traces': '.traces',
+    'BinaryStreamBuffer': '.stream_parsers',
+    'HackRFSweepParser': '.stream_parsers',
+    'SoapyPowerBinParser': '.stream_parsers',
+    'parse_rtl_power_line': '.stream_parsers',
+    'RtlPowerCsvDecoder': '.stream_parsers',
+    'WelchPSD': '.welch_psd',
+    'SpectrumRecorder': '.spectrum_recorder',
+    'SpectrumRecording': '.spectrum_recorder',
+    'measure_peaks': '.peaks',
+    'analyze_peaks': '.peaks',
+    'analyze_peaks_array': '.peaks',
+    'match_peaks': '.peaks',
+    'PEAK_DTYPE': '.peaks',
+    'AlertEngine': '.alerts',
+    'load_rules': '.alerts',
+    'open_event_store': '.alerts',
+    'OccupancyStats': '.occupancy',
+    'P2Quantile': '.baseline',
+    'StreamingBaseline': '.baseline',
+    'savgol_smooth': '.smoothing',
+    'SMOOTH_WINDOWS': '.smoothing',
+    'MinMaxLOD': '.lod',
+    'EmitterTracker': '.tracker',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
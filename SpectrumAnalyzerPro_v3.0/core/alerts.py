@@ -0,0 +1,267 @@
+"""
+Движок правил оповещений по спектру (без Qt).
+Правила компилируются в массивы под текущую сетку частот, и каждый свип
+проверяется одним векторным проходом по всем правилам: максимум в полосе
+каждого правила считается одним вызовом np.maximum.reduceat, состояние
+(дебаунс, гистерезис) обновляется для всех правил сразу.
+
+Виды правил:
+  level     — уровень в полосе не ниже threshold (маска порогов по частоте);
+  occupancy — доля свипов в окне window, когда полоса выше threshold, не ниже occupancy;
+  new       — превышение базовой линии на margin дБ (сигнал, которого не было в базовой линии).
+
+Правило срабатывает после debounce подряд свипов с выполненным условием и
+сбрасывается после debounce свипов ниже порога минус hysteresis (для occupancy
+гистерезис — доля, для остальных — дБ).
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import List, Optional
+import numpy as np
+
+RULE_KINDS = ('level', 'occupancy', 'new')
+
+RULE_DEFAULTS = {
+    'name': '',
+    'kind': 'level',
+    'threshold': -50.0,  # дБ
+    'debounce': 2,       # свипов
+    'window': 100,       # свипов, для occupancy
+    'occupancy': 0.5,    # доля, для occupancy
+    'margin': 10.0,      # дБ над базовой линией, для new
+}
+HYSTERESIS_DEFAULTS = {'level': 3.0, 'occupancy': 0.1, 'new': 3.0}
+
+
+def normalize_rule(rule: dict, index: int = 0) -> dict:
+    """Дополнить правило значениями по умолчанию и проверить поля."""
+    rule = {**RULE_DEFAULTS, **rule}
+    if rule['kind'] not in RULE_KINDS:
+        raise ValueError(f"Неизвестный вид правила: {rule['kind']}")
+    if 'f_lo' not in rule or 'f_hi' not in rule:
+        raise ValueError(f"Правило {rule['name'] or index}: нужны f_lo и f_hi (МГц)")
+    if rule['f_hi'] < rule['f_lo']:
+        raise ValueError(f"Правило {rule['name'] or index}: f_hi < f_lo")
+    rule.setdefault('hysteresis', HYSTERESIS_DEFAULTS[rule['kind']])
+    rule['name'] = rule['name'] or f"{rule['kind']}:{rule['f_lo']:g}-{rule['f_hi']:g}"
+    rule['debounce'] = max(1, int(rule['debounce']))
+    rule['window'] = max(1, int(rule['window']))
+    return rule
+
+
+def load_rules(path: str) -> List[dict]:
+    """Правила из JSON: список объектов или {"rules": [...]}."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('rules', [])
+    return [normalize_rule(rule, i) for i, rule in enumerate(data)]
+
+
+class AlertEngine:
+    """
+    Проверка набора правил на каждом свипе.
+    process() возвращает события смены состояния:
+    {'time', 'rule', 'kind', 'state': 'raised' | 'cleared', 'freq_mhz', 'value', 'f_lo', 'f_hi'}.
+    """
+    def __init__(self, rules: List[dict], learn_sweeps: int = 20):
+        self.rules = [normalize_rule(rule, i) for i, rule in enumerate(rules)]
+        self.learn_sweeps = learn_sweeps  # свипов для базовой линии правил new, если она не задана
+        n = len(self.rules)
+        kinds = np.array([RULE_KINDS.index(rule['kind']) for rule in self.rules], dtype=np.int8)
+        self._level = np.flatnonzero(kinds != RULE_KINDS.index('new'))
+        self._new = np.flatnonzero(kinds == RULE_KINDS.index('new'))
+        self._occ = np.flatnonzero(kinds == RULE_KINDS.index('occupancy'))
+        self.f_lo = np.array([rule['f_lo'] for rule in self.rules], dtype=np.float64)
+        self.f_hi = np.array([rule['f_hi'] for rule in self.rules], dtype=np.float64)
+        self.threshold = np.array([rule['threshold'] for rule in self.rules], dtype=np.float32)
+        self.debounce = np.array([rule['debounce'] for rule in self.rules], dtype=np.int32)
+        # Пороги включения/выключения по той величине, которую проверяет правило
+        on = np.array([rule['occupancy'] if rule['kind'] == 'occupancy'
+                       else rule['margin'] if rule['kind'] == 'new'
+                       else rule['threshold'] for rule in self.rules], dtype=np.float32)
+        self.on_level = on
+        self.off_level = on - np.array([rule['hysteresis'] for rule in self.rules], dtype=np.float32)
+        self.window = np.array([rule['window'] for rule in self.rules], dtype=np.int32)[self._occ]
+
+        self.values = np.zeros(n, dtype=np.float32)
+        self.active = np.zeros(n, dtype=bool)
+        self._on_streak = np.zeros(n, dtype=np.int32)
+        self._off_streak = np.zeros(n, dtype=np.int32)
+        self._occ_history = np.zeros((int(self.window.max()) if len(self._occ) else 1, len(self._occ)), dtype=bool)
+        self._occ_count = np.zeros(len(self._occ), dtype=np.int32)
+        self._x = None
+        self.baseline = None
+        self._baseline_source = None
+        self.reset()
+
+    def reset(self):
+        """Сбросить состояние правил и выученную базовую линию (например, при новом скане)."""
+        self.values[:] = 0
+        self.active[:] = False
+        self._on_streak[:] = 0
+        self._off_streak[:] = 0
+        self._occ_history[:] = False
+        self._occ_count[:] = 0
+        self.sweeps = 0
+        self._x = None
+        if self._baseline_source is None:
+            self.baseline = None
+            self._learned = 0
+
+    def set_baseline(self, x: Optional[np.ndarray], db: Optional[np.ndarray]):
+        """Задать базовую линию для правил new (None — учиться на первых learn_sweeps свипах)."""
+        self._baseline_source = None if x is None else (np.asarray(x, dtype=np.float64), np.asarray(db, dtype=np.float32))
+        self.baseline = None
+        self._learned = 0
+        if self._x is not None:
+            self._compile(self._x)
+
+    @property
+    def learning(self) -> bool:
+        return len(self._new) > 0 and self._baseline_source is None and self._learned < self.learn_sweeps
+
+    def _compile(self, x: np.ndarray):
+        """Диапазоны бинов правил для сетки x: пары (b0, b1) подряд для reduceat."""
+        self._x = x
+        b0 = np.searchsorted(x, self.f_lo, side='left')
+        b1 = np.searchsorted(x, self.f_hi, side='right')
+        self.valid = b1 > b0  # правило вне сетки или без бинов не проверяется
+        b0 = np.where(self.valid, b0, 0)
+        b1 = np.where(self.valid, b1, 1)
+        self._b0, self._b1 = b0, b1
+        # Дополнительный элемент в конце — reduceat требует индексы < len
+        self._idx_level = np.column_stack((b0[self._level], b1[self._level])).ravel()
+        self._idx_new = np.column_stack((b0[self._new], b1[self._new])).ravel()
+        self._padded = np.full(len(x) + 1, -np.inf, dtype=np.float32)
+        if self._baseline_source is not None:
+            bx, bdb = self._baseline_source
+            self.baseline = np.interp(x, bx, bdb).astype(np.float32)
+        elif self.baseline is not None and len(self.baseline) != len(x):
+            self.baseline = None
+            self._learned = 0
+
+    def _band_max(self, y: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        self._padded[:-1] = y
+        return np.maximum.reduceat(self._padded, idx)[::2]
+
+    def process(self, x: np.ndarray, y: np.ndarray, timestamp: Optional[float] = None) -> List[dict]:
+        if not self.rules:
+            return []
+        if self._x is None or len(x) != len(self._x) or x[0] != self._x[0] or x[-1] != self._x[-1]:
+            self._compile(x)
+        self.sweeps += 1
+
+        if len(self._level):
+            self.values[self._level] = self._band_max(y, self._idx_level)
+        if len(self._new):
+            if self.baseline is None or self.learning:
+                # Базовая линия — максимум первых свипов; пока учимся, правила new молчат
+                self.baseline = y.astype(np.float32) if self.baseline is None else np.maximum(self.baseline, y)
+                self._learned += 1
+                self.values[self._new] = -np.inf
+            else:
+                self.values[self._new] = self._band_max(y - self.baseline, self._idx_new)
+
+        if len(self._occ):
+            # Кольцо флагов «выше порога»; у каждого правила своё окно
+            above = self.values[self._occ] >= self.threshold[self._occ]
+            depth = len(self._occ_history)
+            pos = (self.sweeps - 1) % depth
+            cols = np.arange(len(self._occ))
+            leaving = self._occ_history[(pos - self.window) % depth, cols] & (self.sweeps > self.window)
+            self._occ_count += above.astype(np.int32) - leaving
+            self._occ_history[pos] = above
+            self.values[self._occ] = self._occ_count / np.minimum(self.sweeps, self.window)
+
+        cond_on = (self.values >= self.on_level) & self.valid
+        cond_off = (self.values < self.off_level) | ~self.valid
+        self._on_streak = np.where(cond_on, self._on_streak + 1, 0)
+        self._off_streak = np.where(cond_off, self._off_streak + 1, 0)
+        raised = ~self.active & (self._on_streak >= self.debounce)
+        cleared = self.active & (self._off_streak >= self.debounce)
+        changed = np.flatnonzero(raised | cleared)
+        if len(changed) == 0:
+            return []
+        self.active[changed] = ~self.active[changed]
+
+        now = time.time() if timestamp is None else timestamp
+        events = []
+        for i in changed.tolist():
+            b0, b1 = int(self._b0[i]), int(self._b1[i])
+            rule = self.rules[i]
+            band = y[b0:b1] - self.baseline[b0:b1] if rule['kind'] == 'new' else y[b0:b1]
+            events.append({
+                'time': now,
+                'rule': rule['name'],
+                'kind': rule['kind'],
+                'state': 'raised' if raised[i] else 'cleared',
+                'freq_mhz': float(x[b0 + int(np.argmax(band))]) if self.valid[i] else float('nan'),
+                'value': float(self.values[i]),
+                'f_lo': rule['f_lo'],
+                'f_hi': rule['f_hi'],
+            })
+        return events
+
+    def active_rules(self) -> List[str]:
+        return [self.rules[i]['name'] for i in np.flatnonzero(self.active).tolist()]
+
+
+def format_event(event: dict) -> str:
+    """Строка события для журнала."""
+    state = "СРАБОТАЛО" if event['state'] == 'raised' else "сброшено"
+    unit = "" if event['kind'] == 'occupancy' else " дБ"
+    return (f"Правило «{event['rule']}» {state}: {event['freq_mhz']:.3f} МГц, "
+            f"{event['kind']} = {event['value']:.2f}{unit}")
+
+
+EVENT_COLUMNS = ('time', 'rule', 'kind', 'state', 'freq_mhz', 'value', 'f_lo', 'f_hi')
+
+
+class JsonlEventStore:
+    """События построчно в JSONL (дописываются)."""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, events: List[dict]):
+        for event in events:
+            self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteEventStore:
+    """События в таблице events локальной базы SQLite."""
+    def __init__(self, path: str):
+        self.path = path
+        # Запись может идти из потока, отличного от создавшего (воркер GUI)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events (time REAL, rule TEXT, kind TEXT, state TEXT,"
+            " freq_mhz REAL, value REAL, f_lo REAL, f_hi REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_time ON events (time)")
+        self._db.commit()
+
+    def write(self, events: List[dict]):
+        self._db.executemany(
+            f"INSERT INTO events VALUES ({', '.join('?' * len(EVENT_COLUMNS))})",
+            [tuple(event[c] for c in EVENT_COLUMNS) for event in events]
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def open_event_store(path: str):
+    """Хранилище событий по расширению: .db/.sqlite/.sqlite3 — SQLite, иначе JSONL."""
+    if os.path.splitext(path)[1].lower() in ('.db', '.sqlite', '.sqlite3'):
+        return SqliteEventStore(path)
+    return JsonlEventStore(path)
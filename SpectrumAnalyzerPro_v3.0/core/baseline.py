@@ -0,0 +1,112 @@
+"""
+Живая базовая линия: потоковая оценка процентиля мощности по каждому бину (без Qt).
+Используется алгоритм P² (Jain, Chlamtac, 1985): пять маркеров на бин, без
+хранения истории. Маркеры всех бинов лежат в массивах (5, бины), и одно
+обновление — несколько векторных операций на весь свип.
+
+P² оценивает процентиль по всем наблюдениям, поэтому StreamingBaseline держит
+две оценки, перезапускаемые со сдвигом на половину окна, и отдаёт ту, что
+набрала больше свипов: базовая линия отражает последние window/2…window свипов.
+"""
+
+from typing import Optional
+import numpy as np
+
+
+class P2Quantile:
+    """Векторная оценка P² одного процентиля p (0..1) по каждому бину."""
+    def __init__(self, size: int, p: float):
+        self.p = p
+        self.q = np.zeros((5, size), dtype=np.float64)    # высоты маркеров
+        self.n = np.zeros((5, size), dtype=np.float64)    # позиции маркеров
+        self.dn = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])[:, None]
+        self._rows = np.arange(5)[:, None]
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= 5
+
+    @property
+    def value(self) -> np.ndarray:
+        """Текущая оценка процентиля (до пяти наблюдений — ближайшая к p порядковая статистика)."""
+        if self.count >= 5:
+            return self.q[2]
+        first = np.sort(self.q[:self.count], axis=0)
+        return first[min(self.count - 1, int(round(self.p * (self.count - 1))))]
+
+    def update(self, y: np.ndarray):
+        q, n = self.q, self.n
+        if self.count < 5:
+            q[self.count] = y
+            self.count += 1
+            if self.count == 5:
+                q.sort(axis=0)
+                n[:] = self._rows + 1
+            return
+        self.count += 1
+
+        # Ячейка k: q[k] <= y < q[k+1]; крайние маркеры расширяются до нового минимума/максимума
+        np.minimum(q[0], y, out=q[0])
+        np.maximum(q[4], y, out=q[4])
+        k = (y >= q[1]).astype(np.int8) + (y >= q[2]) + (y >= q[3])
+        n += self._rows > k
+        desired = 1 + (self.count - 1) * self.dn
+
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            up = (d >= 1) & (n[i + 1] - n[i] > 1)
+            down = (d <= -1) & (n[i - 1] - n[i] < -1)
+            move = up | down
+            if not move.any():
+                continue
+            # Маркеры двигаются у малой доли бинов — считаем поправку только для них
+            cols = np.flatnonzero(move)
+            qm, nm = q[i - 1:i + 2, cols], n[i - 1:i + 2, cols]
+            s = np.where(up[cols], 1.0, -1.0)
+            left = nm[1] - nm[0]
+            right = nm[2] - nm[1]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Параболическая поправка, при выходе за соседей — линейная
+                parabolic = qm[1] + s / (nm[2] - nm[0]) * (
+                    (left + s) * (qm[2] - qm[1]) / right + (right - s) * (qm[1] - qm[0]) / left)
+                linear = qm[1] + s * np.where(s > 0, (qm[2] - qm[1]) / right, (qm[1] - qm[0]) / left)
+            inside = (qm[0] < parabolic) & (parabolic < qm[2])
+            q[i, cols] = np.where(inside, parabolic, linear)
+            n[i, cols] += s
+
+
+class StreamingBaseline:
+    """Базовая линия как процентиль последних свипов по каждому бину."""
+    def __init__(self, size: int, percentile: float = 20.0, window: int = 500):
+        self.percentile = percentile
+        self.window = max(10, int(window))
+        self._estimators = [P2Quantile(size, percentile / 100.0), P2Quantile(size, percentile / 100.0)]
+        self.sweeps = 0
+        self.value = np.zeros(size, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    @property
+    def ready(self) -> bool:
+        return self.sweeps >= 5
+
+    def update(self, y: np.ndarray) -> Optional[np.ndarray]:
+        """Добавить свип; вернуть текущую базовую линию (None, пока свипов меньше пяти)."""
+        half = self.window // 2
+        if self.sweeps >= half and self.sweeps % half == 0:
+            # Более старая из двух оценок перезапускается каждые полокна
+            older = max(self._estimators, key=lambda e: e.count)
+            older.reset()
+        for estimator in self._estimators:
+            estimator.update(y)
+        self.sweeps += 1
+        if not self.ready:
+            return None
+        best = max(self._estimators, key=lambda e: e.count)
+        self.value[:] = best.value
+        return self.value
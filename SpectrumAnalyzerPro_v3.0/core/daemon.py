@@ -0,0 +1,240 @@
+"""
+Демон мониторинга спектра без GUI.
+Запускает SDR-утилиту через core.driver, собирает полные свипы, при необходимости
+пишет их в долговременную запись, ищет пики и дописывает оповещения в JSONL.
+С --tracks пики связываются в треки источников (core.tracker), сводка по
+трекам сохраняется при остановке.
+
+Запуск из корня проекта:
+    python -m core.daemon --backend rtl_power --start 88 --end 108 --step 10 \\
+        --record /data/fm --alerts alerts.jsonl --threshold -40
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+from typing import Optional
+from utils.signal_classifier import SignalClassifier
+from .alerts import AlertEngine, format_event, load_rules, open_event_store
+from .driver import build_command, run_backend
+from .occupancy import OccupancyStats
+from .peaks import analyze_peaks_array, peaks_to_list
+from .spectrum_recorder import SpectrumRecorder
+from .sweep_grid import SweepGrid
+from .tracker import EmitterTracker
+from .traces import TraceAccumulator, fuse_traces
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorDaemon:
+    """Обработка потока сегментов: сборка свипов, запись, пики, оповещения."""
+    STATUS_INTERVAL = 60.0
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.grid = SweepGrid(args.start + args.lnb_lo, args.end + args.lnb_lo)
+        self.recorder = None
+        if args.record:
+            self.recorder = SpectrumRecorder(args.record)
+        self.classifier = SignalClassifier()
+        self.alerts = open(args.alerts, 'a', encoding='utf-8') if args.alerts else None
+        self.rules = AlertEngine(load_rules(args.rules)) if args.rules else None
+        self.events = open_event_store(args.events) if args.rules and args.events else None
+        self.occupancy = None
+        self.tracker = EmitterTracker(args.track_tolerance, args.track_timeout) if args.tracks else None
+        self.traces = None
+        self._acc = None
+        self._last_peaks = 0.0
+        self._last_alert = {}  # округлённая частота -> время последнего оповещения
+        self._last_status = time.monotonic()
+        self.sweeps = 0
+        self.alert_count = 0
+        self.stop = None
+
+    def on_segment(self, segment: dict):
+        frame = self.grid.update(segment)
+        if frame is not None:
+            self.on_frame(frame)
+
+    def on_frame(self, frame: dict):
+        self.sweeps += 1
+        x, y = frame['x'], frame['y']
+        if self.recorder is not None:
+            self.recorder.append(x, y)
+        if self.args.occupancy:
+            if self.occupancy is None or len(self.occupancy.x) != len(y):
+                self.occupancy = OccupancyStats(x, self.args.occupancy_threshold, period=self.args.occupancy_period)
+            self.occupancy.update(y)
+        if self._acc is None or len(self._acc.ema) != len(y):
+            self._acc = TraceAccumulator(len(y))
+            self.traces = None
+        self._acc.fold(y)
+        self.traces = fuse_traces(self.traces, self._acc, x)
+        self._acc.count = 0
+
+        if self.rules is not None:
+            self.check_rules(x, y)
+
+        now = time.monotonic()
+        if now - self._last_peaks >= self.args.peaks_interval:
+            self._last_peaks = now
+            self.check_alerts(x, y)
+        if now - self._last_status >= self.STATUS_INTERVAL:
+            self._last_status = now
+            logger.info(f"Свипов: {self.sweeps}, оповещений: {self.alert_count}")
+        if self.args.sweeps and self.sweeps >= self.args.sweeps and self.stop is not None:
+            self.stop.set()
+
+    def check_alerts(self, x, y):
+        peaks = analyze_peaks_array(x, y, self.classifier)
+        now = time.time()
+        if self.tracker is not None:
+            self.tracker.update(peaks, now)
+        for peak in peaks_to_list(peaks):
+            if peak["Амплитуда (дБ)"] < self.args.threshold:
+                continue
+            # Один и тот же сигнал не чаще, чем раз в holdoff секунд
+            key = round(peak["Частота (МГц)"] / self.args.alert_resolution)
+            if now - self._last_alert.get(key, 0.0) < self.args.holdoff:
+                continue
+            self._last_alert[key] = now
+            self.alert_count += 1
+            if self.alerts is not None:
+                self.alerts.write(json.dumps({'time': now, **peak}, ensure_ascii=False) + "\n")
+                self.alerts.flush()
+            logger.warning(f"Сигнал {peak['Частота (МГц)']:.3f} МГц, {peak['Амплитуда (дБ)']:.1f} дБ, {peak['Тип']}")
+
+    def check_rules(self, x, y):
+        events = self.rules.process(x, y)
+        if not events:
+            return
+        self.alert_count += sum(event['state'] == 'raised' for event in events)
+        if self.events is not None:
+            self.events.write(events)
+        for event in events:
+            logger.warning(format_event(event))
+
+    async def run(self) -> int:
+        args = self.args
+        self.stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # нет поддержки сигналов в цикле событий (Windows)
+        argv, decoder = build_command(args.backend, args.start, args.end, args.step, args.gain,
+                                      args.interval, args.device, args.lnb_lo)
+        if args.executable:
+            argv[0] = args.executable
+        code = 0
+        try:
+            while not self.stop.is_set():
+                code = await run_backend(argv, decoder, self.on_segment, self.stop)
+                if not self.stop.is_set():
+                    # Утилита завершилась сама — последний проход без перехода отдаём кадром
+                    frame = self.grid.flush()
+                    if frame is not None:
+                        self.on_frame(frame)
+                if self.stop.is_set() or not args.restart:
+                    break
+                logger.warning(f"{argv[0]} завершился с кодом {code}, перезапуск через 1 с")
+                try:
+                    await asyncio.wait_for(self.stop.wait(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.close()
+        return code
+
+    def close(self):
+        # Сначала закрываются запись и журналы, затем экспорт сводок: сбой экспорта их не теряет
+        if self.recorder is not None:
+            self.recorder.close()
+            logger.info(f"Запись закрыта: {self.recorder.rows_written} свипов")
+        if self.alerts is not None:
+            self.alerts.close()
+        if self.events is not None:
+            self.events.close()
+        if self.occupancy is not None and self.occupancy.sweeps:
+            self.export_occupancy()
+        if self.tracker is not None and len(self.tracker):
+            self.export_tracks()
+        logger.info(f"Остановлено: свипов {self.sweeps}, оповещений {self.alert_count}")
+
+    def export_occupancy(self):
+        prefix = self.args.occupancy
+        try:
+            self.occupancy.to_csv(prefix + ".csv")
+            self.occupancy.heatmap_to_csv(prefix + "_heatmap.csv")
+            self.occupancy.heatmap_to_png(prefix + "_heatmap.png")
+        except Exception:
+            logger.exception("Не удалось сохранить статистику занятости")
+            return
+        logger.info(f"Статистика занятости ({self.occupancy.sweeps} свипов): {prefix}.csv, {prefix}_heatmap.png")
+
+    def export_tracks(self):
+        """Сводка по трекам — последней: сбой экспорта не мешает закрыть остальные файлы."""
+        path = self.args.tracks
+        try:
+            if path.endswith('.parquet'):
+                try:
+                    self.tracker.to_parquet(path)
+                except RuntimeError as e:
+                    path = path[:-len('.parquet')] + '.csv'
+                    logger.error(f"{e} — сводка сохраняется в CSV")
+                    self.tracker.to_csv(path)
+            else:
+                self.tracker.to_csv(path)
+        except OSError as e:
+            logger.error(f"Не удалось сохранить треки источников: {e}")
+            return
+        logger.info(f"Треки источников ({len(self.tracker)}, активных {len(self.tracker.active)}): {path}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m core.daemon",
+                                 description="Мониторинг спектра без GUI: запись, пики, оповещения.")
+    ap.add_argument('--backend', default='rtl_power',
+                    choices=['rtl_power', 'hackrf_sweep', 'soapy_power', 'airspy_rx'])
+    ap.add_argument('--executable', default='', help='путь к утилите, если не в PATH')
+    ap.add_argument('--device', default='', help='индекс/серийный номер/строка SoapySDR')
+    ap.add_argument('--start', type=float, required=True, help='МГц')
+    ap.add_argument('--end', type=float, required=True, help='МГц')
+    ap.add_argument('--step', type=float, default=100, help='кГц')
+    ap.add_argument('--gain', type=float, default=20)
+    ap.add_argument('--interval', type=float, default=1, help='с')
+    ap.add_argument('--lnb-lo', type=float, default=0, help='МГц')
+    ap.add_argument('--record', default='', help='базовое имя файлов записи .sarec')
+    ap.add_argument('--alerts', default='', help='файл JSONL для оповещений')
+    ap.add_argument('--threshold', type=float, default=-40, help='порог оповещения, дБ')
+    ap.add_argument('--holdoff', type=float, default=60, help='не повторять оповещение по частоте, с')
+    ap.add_argument('--alert-resolution', type=float, default=0.025, help='шаг группировки частот, МГц')
+    ap.add_argument('--rules', default='', help='файл JSON с правилами оповещений (core.alerts)')
+    ap.add_argument('--events', default='', help='хранилище событий правил: .jsonl или .sqlite')
+    ap.add_argument('--occupancy', default='', help='префикс файлов статистики занятости (CSV и тепловая карта)')
+    ap.add_argument('--occupancy-threshold', type=float, default=-70, help='порог занятости, дБ')
+    ap.add_argument('--occupancy-period', type=float, default=3600, help='строка тепловой карты, с')
+    ap.add_argument('--tracks', default='', help='файл сводки по трекам источников (.csv или .parquet)')
+    ap.add_argument('--track-tolerance', type=float, default=0.025, help='допуск связывания пиков в трек, МГц')
+    ap.add_argument('--track-timeout', type=float, default=60, help='трек неактивен без пика дольше, с')
+    ap.add_argument('--peaks-interval', type=float, default=1.0, help='как часто искать пики, с')
+    ap.add_argument('--sweeps', type=int, default=0, help='остановиться после N свипов (0 — без ограничения)')
+    ap.add_argument('--restart', action='store_true', help='перезапускать утилиту при завершении')
+    ap.add_argument('--log-level', default='INFO')
+    return ap
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    return asyncio.run(MonitorDaemon(args).run())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Асинхронный драйвер SDR-утилит на asyncio (без Qt).
+Команда строится по шаблонам config.DEVICE_BACKENDS, вывод процесса читается
+крупными блоками и разбирается теми же парсерами, что и в потоках GUI.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from config import DEVICE_BACKENDS, SOAPY_POWER_DEFAULT_PARAMS
+from .stream_parsers import HackRFSweepParser, SoapyPowerBinParser, RtlPowerCsvDecoder
+from .welch_psd import WelchPSD
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK = 1 << 20
+
+
+def _now() -> str:
+    return datetime.now().strftime("%H:%M:%S")
+
+
+class RtlPowerDecoder:
+    """Пакетный разбор CSV rtl_power: один сегмент на сшитый свип (с флагом sweep_end)."""
+    def __init__(self, lnb_lo: float = 0):
+        self.lnb_lo = lnb_lo
+        self.parser = RtlPowerCsvDecoder()
+
+    @property
+    def errors(self) -> int:
+        return self.parser.errors
+
+    def _segment(self, sweep) -> dict:
+        timestamp, x, y = sweep
+        return {'x': x + self.lnb_lo, 'y': y, 'timestamp': timestamp, 'sweep_end': True}
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        return [self._segment(sweep) for sweep in self.parser.feed(chunk)]
+
+    def flush(self) -> List[dict]:
+        sweep = self.parser.flush()
+        return [] if sweep is None else [self._segment(sweep)]
+
+
+class HackRFSweepDecoder:
+    def __init__(self, lnb_lo: float = 0):
+        self.lnb_lo = lnb_lo
+        self.parser = HackRFSweepParser()
+
+    @property
+    def errors(self) -> int:
+        return self.parser.resyncs
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        segments = []
+        for low_edges, high_edges, rssi in self.parser.feed(chunk):
+            rssi = rssi.copy()  # данные должны пережить следующий feed()
+            count = rssi.shape[1]
+            for low_edge, high_edge, db_values in zip(low_edges.tolist(), high_edges.tolist(), rssi):
+                segments.append({
+                    'x': np.linspace(low_edge / 1e6, high_edge / 1e6, count) + self.lnb_lo,
+                    'y': db_values,
+                    'timestamp': _now()
+                })
+        return segments
+
+
+class SoapyPowerDecoder:
+    def __init__(self, lnb_lo: float = 0):
+        self.lnb_lo = lnb_lo
+        self.parser = SoapyPowerBinParser()
+
+    @property
+    def errors(self) -> int:
+        return self.parser.resyncs
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        segments = []
+        for time_starts, starts, stops, power in self.parser.feed(chunk):
+            power = power.copy()
+            count = power.shape[1]
+            for time_start, start_freq, stop_freq, y_data in zip(
+                    time_starts.tolist(), starts.tolist(), stops.tolist(), power):
+                segments.append({
+                    'x': np.linspace(start_freq / 1e6, stop_freq / 1e6, count) + self.lnb_lo,
+                    'y': y_data,
+                    'timestamp': datetime.fromtimestamp(time_start).strftime("%H:%M:%S")
+                })
+        return segments
+
+
+class AirspyRxDecoder:
+    """PSD Уэлча по потоку INT16 IQ одной настройки (без перестройки по тайлам)."""
+    SAMPLE_RATE = 2.5e6
+
+    def __init__(self, center: float, lnb_lo: float = 0):
+        self.psd = WelchPSD(self.SAMPLE_RATE, 1024, 0.5, 20, sample_format='int16')
+        self.freqs = (center * 1e6 + self.psd.freqs) / 1e6 + lnb_lo
+        self.errors = 0
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        return [{'x': self.freqs, 'y': power, 'timestamp': _now()} for power in self.psd.feed(chunk)]
+
+
+def build_command(backend: str, start: float, end: float, step: float, gain: float,
+                  interval: float, device: str = "", lnb_lo: float = 0) -> Tuple[List[str], object]:
+    """
+    Командная строка утилиты и декодер её вывода.
+    Аргументы те же, что у потоков GUI; бинарный вывод идёт в stdout.
+    """
+    if backend not in DEVICE_BACKENDS or not DEVICE_BACKENDS[backend]["cmd"]:
+        raise ValueError(f"Бэкенд {backend} не поддерживается демоном")
+    spec = DEVICE_BACKENDS[backend]
+    params = {
+        "start": start, "end": end, "step": step, "gain": gain, "interval": interval,
+        "device": device, "center": (start + end) / 2, "lna_gain": spec.get("lna_gain_default", 16),
+        "sample_rate": spec.get("default_sample_rate", 2000000), "ppm": spec.get("default_ppm", 0),
+    }
+    args = []
+    template = spec["args_template"]
+    for i, arg in enumerate(template):
+        if "{fd}" in arg or (i + 1 < len(template) and "{fd}" in template[i + 1]):
+            continue  # soapy_power пишет в stdout, если не задан --output-fd
+        args.append(arg.format(**params))
+
+    if backend == "rtl_power":
+        decoder = RtlPowerDecoder(lnb_lo)
+        if device:
+            args = ["-d", device] + args
+    elif backend == "hackrf_sweep":
+        decoder = HackRFSweepDecoder(lnb_lo)
+        args.insert(1, "-B")
+        if device:
+            args = ["-d", device] + args
+    elif backend == "soapy_power":
+        decoder = SoapyPowerDecoder(lnb_lo)
+        args += SOAPY_POWER_DEFAULT_PARAMS.split()
+    elif backend == "airspy_rx":
+        decoder = AirspyRxDecoder(params["center"], lnb_lo)
+    else:
+        raise ValueError(f"Бэкенд {backend} не поддерживается демоном")
+    return [spec["cmd"]] + args, decoder
+
+
+async def _log_stderr(stream: asyncio.StreamReader, name: str):
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        text = line.decode('utf-8', errors='ignore').strip()
+        if text:
+            logger.info(f"{name}: {text}")
+
+
+async def run_backend(argv: List[str], decoder, on_segment: Callable[[dict], None],
+                      stop: Optional[asyncio.Event] = None, read_block: int = READ_BLOCK) -> int:
+    """
+    Запустить утилиту и передавать каждый разобранный сегмент в on_segment,
+    пока процесс не завершится или не будет установлен stop.
+    :return: код завершения процесса
+    """
+    logger.info(f"Запуск: {' '.join(argv)}")
+    process = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=read_block)
+    stderr_task = asyncio.ensure_future(_log_stderr(process.stderr, argv[0]))
+    stop = stop or asyncio.Event()
+    stop_task = asyncio.ensure_future(stop.wait())
+    eof = False
+    try:
+        while True:
+            read_task = asyncio.ensure_future(process.stdout.read(read_block))
+            done, _ = await asyncio.wait({read_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            if read_task not in done:
+                read_task.cancel()
+                break
+            chunk = read_task.result()
+            if not chunk:
+                eof = True  # процесс закрыл stdout
+                # Декодеры, держащие незаконченный свип, отдают его в конце потока
+                for segment in getattr(decoder, 'flush', list)():
+                    on_segment(segment)
+                break
+            for segment in decoder.feed(chunk):
+                on_segment(segment)
+    finally:
+        stop_task.cancel()
+        if not eof:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass  # уже завершился
+        try:
+            await asyncio.wait_for(process.wait(), 2)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        await stderr_task
+    return process.returncode
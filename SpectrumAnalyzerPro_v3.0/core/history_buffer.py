@@ -0,0 +1,62 @@
+"""
+Кольцевой буфер для хранения истории водопада.
+Аналогично qspectrumanalyzer.data.HistoryBuffer, но без зависимостей от DataStorage.
+
+Буфер хранит каждую строку дважды (в позициях i и i + max_size), поэтому
+упорядоченная история всегда доступна как непрерывное представление (view)
+без копирования, а добавление строки стоит O(data_size), а не O(max_size * data_size).
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+class HistoryBuffer:
+    """Fixed-size NumPy array ring buffer for waterfall history."""
+    def __init__(self, max_size: int, data_size: int):
+        self.max_size = max_size
+        self.data_size = data_size
+        self.history_size = 0
+        self.counter = 0
+        # Индекс строки, в которую будет записан следующий ряд
+        self.write_index = 0
+        self._storage = np.full((2 * max_size, data_size), -100.0, dtype=np.float32)
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Весь буфер (max_size строк) от самой старой строки к самой новой — view без копии."""
+        return self._storage[self.write_index:self.write_index + self.max_size]
+
+    def append(self, data: np.ndarray):
+        """Добавить новый ряд данных в буфер."""
+        if len(data) != self.data_size:
+            raise ValueError(f"Ожидается {self.data_size} значений, получено {len(data)}")
+        self.counter += 1
+        if self.history_size < self.max_size:
+            self.history_size += 1
+        # Пишем ряд в обе половины — так упорядоченное окно всегда непрерывно
+        idx = self.write_index
+        self._storage[idx] = data
+        self._storage[idx + self.max_size] = data
+        self.write_index = (idx + 1) % self.max_size
+
+    def get_buffer(self) -> np.ndarray:
+        """Вернуть только реальные данные (не весь буфер) — упорядоченный view без копии."""
+        end = self.write_index + self.max_size
+        return self._storage[end - self.history_size:end]
+
+    def get_slices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Вернуть историю как два view (старая часть, новая часть) из одной половины хранилища.
+        Удобно, если потребителю нужно обойти данные без обращения ко второй копии.
+        """
+        start = (self.write_index - self.history_size) % self.max_size
+        if start + self.history_size <= self.max_size:
+            return self._storage[start:start + self.history_size], self._storage[0:0]
+        return self._storage[start:self.max_size], self._storage[0:self.write_index]
+
+    def get_last(self, n: int = 1) -> np.ndarray:
+        """Вернуть последние n рядов (view без копии)."""
+        n = min(n, self.history_size)
+        end = self.write_index + self.max_size
+        return self._storage[end - n:end]
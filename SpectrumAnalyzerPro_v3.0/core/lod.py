@@ -0,0 +1,79 @@
+"""
+Уровень детализации кривых спектра (без Qt).
+Видимый диапазон бинов делится на столбцы по числу пикселей, и каждый столбец
+заменяется парой точек: минимум и максимум его бинов. Узкий пик в один бин
+остаётся на экране, а на отрисовку уходит не больше 2 * ширина точек
+независимо от числа бинов (50k–500k у широких свипов hackrf).
+Разбиение на столбцы пересчитывается только при смене видимого диапазона,
+ширины или сетки частот; при новых данных — один проход reduceat.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+class MinMaxLOD:
+    """Огибающая мин/макс одной кривой для текущего вида."""
+    def __init__(self):
+        self.x = None
+        self.y = None
+        self._key = None      # (сетка, i0, i1, пиксели) текущего разбиения
+        self._i0 = 0
+        self._i1 = 0
+        self._starts = None   # начала столбцов относительно i0; None — бинов мало, без прореживания
+        self._xd = None
+
+    def clear(self):
+        self.x = None
+        self.y = None
+        self._key = None
+
+    def set_data(self, x: np.ndarray, y: np.ndarray):
+        """Новые данные; x — возрастающая сетка частот."""
+        if self.x is not x and (self.x is None or len(self.x) != len(x) or not np.array_equal(self.x, x)):
+            self._key = None  # другая сетка — разбиение строится заново
+        self.x, self.y = x, y
+
+    def set_view(self, x0: float, x1: float, pixels: int) -> bool:
+        """
+        Видимый диапазон [x0, x1] и ширина в пикселях.
+        :return: True, если разбиение изменилось и кривую нужно перерисовать
+        """
+        x = self.x
+        if x is None or len(x) == 0:
+            return False
+        # Одна точка запаса с каждой стороны — линия доходит до краёв вида
+        i0 = max(int(np.searchsorted(x, x0, 'left')) - 1, 0)
+        i1 = min(int(np.searchsorted(x, x1, 'right')) + 1, len(x))
+        pixels = max(int(pixels), 1)
+        key = (len(x), i0, i1, pixels)
+        if key == self._key:
+            return False
+        self._key = key
+        self._i0, self._i1 = i0, i1
+        count = i1 - i0
+        if count <= 2 * pixels:
+            self._starts = None
+            return True
+        # Столбцы по числу бинов: на равномерной сетке совпадают с пикселями
+        starts = np.arange(pixels, dtype=np.intp) * count // pixels
+        ends = np.append(starts[1:], count) - 1
+        # Минимум ставится на начало столбца, максимум — на конец: крайние точки
+        # огибающей совпадают с крайними бинами, и автомасштаб не меняется
+        xd = np.empty(2 * pixels, dtype=np.float64)
+        xd[0::2] = x[i0 + starts]
+        xd[1::2] = x[i0 + ends]
+        self._starts, self._xd = starts, xd
+        return True
+
+    def render(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Точки для отрисовки: огибающая или срез видимых бинов (без копирования)."""
+        if self.y is None or self._key is None:
+            return None
+        segment = self.y[self._i0:self._i1]
+        if self._starts is None:
+            return self.x[self._i0:self._i1], segment
+        yd = np.empty(len(self._xd), dtype=segment.dtype)
+        np.minimum.reduceat(segment, self._starts, out=yd[0::2])
+        np.maximum.reduceat(segment, self._starts, out=yd[1::2])
+        return self._xd, yd
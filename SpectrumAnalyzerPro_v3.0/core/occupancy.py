@@ -0,0 +1,187 @@
+"""
+Статистика занятости каналов за долгое сканирование (без Qt).
+На каждый свип по каждому бину обновляются счётчик превышений порога, время
+выше порога, сумма мощности и гистограмма уровней с фиксированными корзинами.
+Все массивы выделяются заранее, обновление — O(бинов) без выделений памяти.
+Дополнительно копится тепловая карта занятости: доля свипов выше порога по
+периодам времени (строки) и бинам (столбцы).
+"""
+
+import struct
+import time
+import zlib
+from typing import Optional
+import numpy as np
+
+
+class OccupancyStats:
+    def __init__(self, x: np.ndarray, threshold_db: float = -70.0, hist_min: float = -120.0,
+                 hist_max: float = 0.0, hist_step: float = 1.0, period: float = 3600.0):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.threshold_db = threshold_db
+        self.hist_min = hist_min
+        self.hist_step = hist_step
+        self.hist_bins = max(1, int(round((hist_max - hist_min) / hist_step)))
+        self.period = period  # с — строка тепловой карты
+        n = len(self.x)
+
+        self.above_count = np.zeros(n, dtype=np.int64)
+        self.time_above = np.zeros(n, dtype=np.float64)
+        self.power_sum = np.zeros(n, dtype=np.float64)
+        self.hist = np.zeros((n, self.hist_bins), dtype=np.int32)
+        self.sweeps = 0
+        self.first_time = None
+        self.last_time = None
+
+        # Рабочие буферы — чтобы update() ничего не выделял
+        self._above = np.empty(n, dtype=bool)
+        self._level = np.empty(n, dtype=np.float32)
+        self._index = np.empty(n, dtype=np.intp)
+        self._counts = np.empty(n, dtype=np.int32)
+        self._offsets = np.arange(n, dtype=np.intp) * self.hist_bins
+        self._hist_flat = self.hist.reshape(-1)
+
+        # Тепловая карта растёт блоками строк, а не на каждом свипе
+        self._heat_counts = np.zeros((64, n), dtype=np.int32)
+        self._heat_sweeps = np.zeros(64, dtype=np.int32)
+        self._heat_rows = 0
+
+    def update(self, y: np.ndarray, timestamp: Optional[float] = None):
+        """Добавить свип (длина y равна числу бинов)."""
+        now = time.time() if timestamp is None else timestamp
+        np.greater_equal(y, self.threshold_db, out=self._above)
+        np.add(self.above_count, self._above, out=self.above_count)
+        np.add(self.power_sum, y, out=self.power_sum)
+        if self.last_time is not None:
+            # Время выше порога: интервал до предыдущего свипа засчитывается бинам, занятым сейчас
+            np.add(self.time_above, now - self.last_time, out=self.time_above, where=self._above)
+
+        # Корзина гистограммы: (y - min) / step, зажато в [0, bins - 1]
+        np.subtract(y, self.hist_min, out=self._level)
+        np.multiply(self._level, 1.0 / self.hist_step, out=self._level)
+        np.clip(self._level, 0, self.hist_bins - 1, out=self._level)
+        np.copyto(self._index, self._level, casting='unsafe')
+        np.add(self._index, self._offsets, out=self._index)
+        # Индексы разных бинов не пересекаются, поэтому take/put вместо медленного np.add.at
+        np.take(self._hist_flat, self._index, out=self._counts)
+        self._counts += 1
+        np.put(self._hist_flat, self._index, self._counts)
+
+        if self.first_time is None:
+            self.first_time = now
+        row = int((now - self.first_time) // self.period)
+        if row >= len(self._heat_sweeps):
+            self._grow_heatmap(row + 1)
+        self._heat_rows = max(self._heat_rows, row + 1)
+        np.add(self._heat_counts[row], self._above, out=self._heat_counts[row])
+        self._heat_sweeps[row] += 1
+
+        self.last_time = now
+        self.sweeps += 1
+
+    def _grow_heatmap(self, rows: int):
+        size = len(self._heat_sweeps)
+        while size < rows:
+            size *= 2
+        counts = np.zeros((size, len(self.x)), dtype=np.int32)
+        counts[:len(self._heat_counts)] = self._heat_counts
+        sweeps = np.zeros(size, dtype=np.int32)
+        sweeps[:len(self._heat_sweeps)] = self._heat_sweeps
+        self._heat_counts, self._heat_sweeps = counts, sweeps
+
+    # --- сводка ---
+
+    @property
+    def duty_cycle(self) -> np.ndarray:
+        """Доля свипов выше порога по бинам."""
+        return self.above_count / max(self.sweeps, 1)
+
+    @property
+    def mean_power(self) -> np.ndarray:
+        return self.power_sum / max(self.sweeps, 1)
+
+    def level_percentile(self, q: float) -> np.ndarray:
+        """Уровень q-го процентиля (0..100) по гистограмме, дБ — по верхней границе корзины."""
+        cumulative = np.cumsum(self.hist, axis=1)
+        target = np.ceil(cumulative[:, -1] * q / 100.0).clip(min=1)
+        index = (cumulative < target[:, None]).sum(axis=1)
+        return self.hist_min + (index + 1) * self.hist_step
+
+    def heatmap(self) -> np.ndarray:
+        """Занятость (доля свипов выше порога) — массив (периоды, бины); пустые периоды — NaN."""
+        counts = self._heat_counts[:self._heat_rows]
+        sweeps = self._heat_sweeps[:self._heat_rows, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(sweeps > 0, counts / sweeps, np.nan)
+
+    def summary(self) -> dict:
+        """Колонки сводки по бинам."""
+        return {
+            'freq_mhz': self.x,
+            'duty_cycle': self.duty_cycle,
+            'time_above_s': self.time_above,
+            'mean_db': self.mean_power,
+            'median_db': self.level_percentile(50),
+            'p90_db': self.level_percentile(90),
+            'sweeps': np.full(len(self.x), self.sweeps, dtype=np.int64),
+        }
+
+    # --- экспорт ---
+
+    def to_csv(self, path: str):
+        summary = self.summary()
+        columns = list(summary)
+        np.savetxt(path, np.column_stack([summary[c] for c in columns]), delimiter=',',
+                   header=','.join(columns), comments='', fmt='%.6g')
+
+    def to_parquet(self, path: str):
+        try:
+            import pandas as pd
+            pd.DataFrame(self.summary()).to_parquet(path, index=False)
+        except ImportError as e:  # нет pandas или движка Parquet (pyarrow/fastparquet)
+            raise RuntimeError(f"Для экспорта в Parquet нужны pandas и pyarrow: {e}") from e
+
+    def heatmap_to_csv(self, path: str):
+        """Тепловая карта в CSV: первая колонка — начало периода (Unix-время), далее бины."""
+        heat = self.heatmap()
+        starts = (self.first_time or 0) + np.arange(len(heat)) * self.period
+        header = 'period_start,' + ','.join(f'{f:.6f}' for f in self.x)
+        np.savetxt(path, np.column_stack((starts, heat)), delimiter=',', header=header, comments='', fmt='%.4g')
+
+    def heatmap_to_png(self, path: str, width: int = 1024):
+        """Тепловая карта в PNG (период — строка, частота — столбец, 0..100% — от тёмного к жёлтому)."""
+        heat = self.heatmap()
+        if heat.size == 0:
+            raise ValueError("Нет данных для тепловой карты")
+        # По частоте — максимум в столбце пикселя, чтобы узкие занятые каналы не терялись
+        if heat.shape[1] > width:
+            edges = np.linspace(0, heat.shape[1], width + 1).astype(np.intp)
+            heat = np.fmax.reduceat(heat, edges[:-1], axis=1)
+        write_png(path, occupancy_colors(heat))
+
+
+def occupancy_colors(values: np.ndarray) -> np.ndarray:
+    """Доля 0..1 -> RGB uint8 (тёмно-синий -> красный -> жёлтый), NaN — серый."""
+    stops = np.array([[10, 10, 40], [40, 60, 160], [200, 40, 40], [255, 230, 60]], dtype=np.float64)
+    v = np.nan_to_num(np.clip(values, 0, 1), nan=0.0) * (len(stops) - 1)
+    lo = np.minimum(v.astype(np.intp), len(stops) - 2)
+    frac = (v - lo)[..., None]
+    rgb = stops[lo] * (1 - frac) + stops[lo + 1] * frac
+    rgb[np.isnan(values)] = 80
+    return rgb.astype(np.uint8)
+
+
+def write_png(path: str, rgb: np.ndarray):
+    """Минимальная запись 8-битного RGB PNG без сторонних библиотек."""
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # байт фильтра 0 в начале строки
+    raw[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
@@ -0,0 +1,127 @@
+"""
+Поиск и измерение пиков спектра (без Qt).
+Ширина по уровню половины высоты над порогом считается одним вызовом
+scipy.signal.peak_widths вместо побинового обхода в Python.
+Результат — структурированный массив PEAK_DTYPE (строки по возрастанию частоты);
+список словарей с русскими ключами строится из него для демона и экспорта.
+"""
+
+import numpy as np
+
+PEAK_FLOOR_DB = -60
+MIN_WIDTH_MHZ = 0.01
+
+# Поля массива пиков и соответствующие им колонки таблицы / ключи словаря
+PEAK_DTYPE = np.dtype([
+    ('freq', np.float64),
+    ('amplitude', np.float64),
+    ('left', np.float64),
+    ('right', np.float64),
+    ('width', np.float64),
+    ('modulation', object),
+    ('type', object),
+    ('track', np.int64),      # номер трека core.tracker (-1 — без слежения)
+    ('on_air', np.float64),   # с с первого появления трека
+])
+PEAK_COLUMNS = ("Частота (МГц)", "Амплитуда (дБ)", "Левая гр.", "Правая гр.", "Ширина (МГц)", "Модуляция", "Тип",
+                "Источник", "В эфире (с)")
+
+
+def measure_peaks(x: np.ndarray, y: np.ndarray, floor: float = PEAK_FLOOR_DB):
+    """
+    Найти пики и их границы.
+    Граница — ближайший к пику бин с мощностью не выше peak - (peak - floor) / 2,
+    как в прежнем обходе влево/вправо от пика.
+    :return: (peaks, left, right) — индексы пиков и их левых/правых границ
+    """
+    from scipy.signal import find_peaks, peak_widths  # тяжёлый импорт — только при первом поиске
+    peaks, _ = find_peaks(y, height=floor, prominence=5, distance=10)
+    peak_vals = y[peaks]
+    # Пик ровно на пороге имеет нулевую ширину — он всё равно был бы отброшен
+    peaks = peaks[peak_vals > floor]
+    if len(peaks) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, empty
+    # Высота контура = peak - prominence * rel_height; границы поиска — весь спектр
+    heights = (y[peaks] - floor) / 2
+    n = len(y)
+    _, _, left_ips, right_ips = peak_widths(
+        y, peaks, rel_height=1.0,
+        prominence_data=(heights.astype(np.float64),
+                         np.zeros(len(peaks), dtype=np.intp),
+                         np.full(len(peaks), n - 1, dtype=np.intp))
+    )
+    # peak_widths интерполирует пересечение; нам нужен сам бин под контуром
+    left = np.floor(left_ips).astype(np.intp)
+    right = np.ceil(right_ips).astype(np.intp)
+    return peaks, left, right
+
+
+def analyze_peaks_array(x: np.ndarray, y: np.ndarray, classifier) -> np.ndarray:
+    """Полный анализ: границы, ширина, модуляция и тип сигнала — массив PEAK_DTYPE."""
+    peaks, left, right = measure_peaks(x, y)
+    widths = np.where(right > left, x[right] - x[left], 0.0)
+    keep = widths >= MIN_WIDTH_MHZ
+    peaks, left, right, widths = peaks[keep], left[keep], right[keep], widths[keep]
+
+    # Признаки и классификация — одним пакетом на все пики
+    modulations = classifier.detect_modulation_batch(y, peaks)
+    signal_types = classifier.classify_signals(modulations, widths)
+
+    result = np.empty(len(peaks), dtype=PEAK_DTYPE)
+    result['freq'] = x[peaks]
+    result['amplitude'] = y[peaks]
+    result['left'] = x[left]
+    result['right'] = x[right]
+    result['width'] = widths
+    result['modulation'] = modulations
+    result['type'] = signal_types
+    result['track'] = -1
+    result['on_air'] = 0.0
+    return result
+
+
+def analyze_peaks(x: np.ndarray, y: np.ndarray, classifier) -> list:
+    """То же, что analyze_peaks_array, списком словарей с ключами PEAK_COLUMNS."""
+    return peaks_to_list(analyze_peaks_array(x, y, classifier))
+
+
+def peaks_to_list(peaks: np.ndarray) -> list:
+    return [dict(zip(PEAK_COLUMNS, row)) for row in peaks.tolist()]
+
+
+def peaks_from_list(peak_list: list) -> np.ndarray:
+    result = np.zeros(len(peak_list), dtype=PEAK_DTYPE)
+    result['track'] = -1
+    for name, column in zip(PEAK_DTYPE.names, PEAK_COLUMNS):
+        # Списки без полей слежения (прежний формат) — поля остаются по умолчанию
+        if peak_list and column in peak_list[0]:
+            result[name] = [peak[column] for peak in peak_list]
+    return result
+
+
+def match_peaks(old: np.ndarray, new: np.ndarray):
+    """
+    Сопоставить пики двух свипов (оба массива по возрастанию частоты).
+    Новый пик — тот же сигнал, если лежит в границах ближайшего по частоте
+    старого; из нескольких таких новых остаётся ближайший.
+    :return: (индексы в old, индексы в new) совпавших пар, оба по возрастанию
+    """
+    empty = np.empty(0, dtype=np.intp)
+    if len(old) == 0 or len(new) == 0:
+        return empty, empty
+    freqs, new_freqs = old['freq'], new['freq']
+    k = np.searchsorted(freqs, new_freqs)
+    below = np.clip(k - 1, 0, len(old) - 1)
+    above = np.clip(k, 0, len(old) - 1)
+    nearest = np.where(np.abs(freqs[below] - new_freqs) <= np.abs(freqs[above] - new_freqs), below, above)
+    j = np.flatnonzero((new_freqs >= old['left'][nearest]) & (new_freqs <= old['right'][nearest]))
+    i = nearest[j]
+    if len(i) == 0:
+        return empty, empty
+    # Отображение ближайшего соседа монотонно: дубликаты i идут подряд, оставляем ближайший
+    order = np.lexsort((np.abs(freqs[i] - new_freqs[j]), i))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = i[order][1:] != i[order][:-1]
+    keep = np.sort(order[first])
+    return i[keep], j[keep]
@@ -0,0 +1,72 @@
+"""
+Сглаживание спектра фильтром Савицкого–Голея (без Qt и без scipy).
+Ядро — взвешенная полиномиальная аппроксимация в скользящем окне: веса точек
+задаёт функция окна (rectangular — классический фильтр Савицкого–Голея).
+Матрицы проекции кэшируются по (длина, порядок, окно): центр спектра
+сглаживается одной свёрткой np.convolve, края — готовыми строками матрицы,
+как в savgol_filter(mode='interp'). История (строки — свипы) сглаживается
+той же одной свёрткой по развёрнутой матрице.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+SMOOTH_WINDOWS = ("rectangular", "hanning", "hamming", "bartlett", "blackman")
+
+_WINDOW_FUNCS = {
+    "hanning": np.hanning,
+    "hamming": np.hamming,
+    "bartlett": np.bartlett,
+    "blackman": np.blackman,
+}
+
+
+def _window_weights(length: int, window: str) -> np.ndarray:
+    if window == "rectangular":
+        return np.ones(length)
+    if window not in _WINDOW_FUNCS:
+        raise ValueError(f"Неизвестная функция окна сглаживания: {window}")
+    # Окно на две точки длиннее и без концов — нулевых весов нет, все точки участвуют в подгонке
+    return _WINDOW_FUNCS[window](length + 2)[1:-1]
+
+
+@lru_cache(maxsize=32)
+def savgol_matrix(length: int, order: int, window: str = "rectangular", dtype: str = "float32") -> np.ndarray:
+    """
+    Матрица (length, length): строка i — веса, дающие значение подогнанного
+    полинома в i-й точке окна. Средняя строка — ядро свёртки, остальные — для краёв.
+    Массив из кэша, только для чтения.
+    """
+    half = length // 2
+    t = (np.arange(length) - half) / max(half, 1)  # нормировка — хорошо обусловленная матрица Вандермонда
+    vander = t[:, None] ** np.arange(order + 1)
+    weighted = vander.T * _window_weights(length, window)
+    matrix = vander @ np.linalg.solve(weighted @ vander, weighted)
+    matrix = matrix.astype(dtype)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def savgol_smooth(data: np.ndarray, length: int = 11, order: int = 3, window: str = "rectangular") -> np.ndarray:
+    """
+    Сгладить спектр (1D) или историю (2D, сглаживание вдоль частоты).
+    Чётная длина увеличивается до нечётной, порядок ограничивается длиной - 1.
+    Если бинов меньше длины окна, данные возвращаются без изменений.
+    """
+    data = np.asarray(data)
+    length = int(length) | 1
+    if length < 3 or data.shape[-1] < length:
+        return data
+    dtype = np.result_type(data.dtype, np.float32)
+    matrix = savgol_matrix(length, min(int(order), length - 1), window, dtype.name)
+    half = length // 2
+
+    rows = data.reshape(-1, data.shape[-1])
+    out = np.empty(rows.shape, dtype=dtype)
+    flat = out.reshape(-1)
+    # Одна свёртка по всем строкам подряд: значения на стыках строк попадают
+    # в краевые бины и перезаписываются ниже
+    flat[half:flat.size - half] = np.convolve(rows.reshape(-1), matrix[half, ::-1], mode='valid')
+    out[:, :half] = rows[:, :length] @ matrix[:half].T
+    out[:, -half:] = rows[:, -length:] @ matrix[half + 1:].T
+    return out.reshape(data.shape)
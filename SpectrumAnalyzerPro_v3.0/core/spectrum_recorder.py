@@ -0,0 +1,187 @@
+"""
+Долговременная запись спектра в бинарные memory-mapped файлы.
+
+Каждый сегмент — один файл фиксированной ёмкости:
+    заголовок (64 байта) | частоты float64[bins] | метки времени float64[capacity] | мощности float32[capacity, bins]
+Файл создаётся сразу нужного размера (разреженный), строки пишутся прямо в
+отображение памяти. Когда сегмент заполнен или меняется сетка частот,
+начинается следующий файл <base>_0001.sarec, <base>_0002.sarec, ...
+"""
+
+import glob
+import struct
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SAREC\x00\x00\x01"
+HEADER = struct.Struct('<8sIIQQ')  # magic, version, bins, capacity, rows
+HEADER_SIZE = 64
+VERSION = 1
+SEGMENT_SUFFIX = ".sarec"
+
+
+def segment_path(base_path: str, index: int) -> str:
+    return f"{base_path}_{index:04d}{SEGMENT_SUFFIX}"
+
+
+class RecordingSegment:
+    """Один файл записи, отображённый в память."""
+    def __init__(self, path: str, mode: str = 'r'):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, bins, capacity, rows = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: не файл записи спектра")
+        if version != VERSION:
+            raise ValueError(f"{path}: неподдерживаемая версия формата {version}")
+        self.bins = bins
+        self.capacity = capacity
+        self._map(mode)
+
+    def _map(self, mode: str):
+        bins, capacity = self.bins, self.capacity
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode=mode)
+        offset = HEADER_SIZE
+        self.freqs = np.ndarray((bins,), dtype='<f8', buffer=self._mm, offset=offset)
+        offset += 8 * bins
+        self.timestamps = np.ndarray((capacity,), dtype='<f8', buffer=self._mm, offset=offset)
+        offset += 8 * capacity
+        self.power = np.ndarray((capacity, bins), dtype='<f4', buffer=self._mm, offset=offset)
+        self._rows = np.ndarray((1,), dtype='<u8', buffer=self._mm, offset=HEADER.size - 8)
+
+    @property
+    def rows(self) -> int:
+        return int(self._rows[0])
+
+    @classmethod
+    def create(cls, path: str, freqs: np.ndarray, capacity: int) -> 'RecordingSegment':
+        bins = len(freqs)
+        size = HEADER_SIZE + 8 * bins + capacity * (8 + 4 * bins)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, bins, capacity, 0).ljust(HEADER_SIZE, b'\x00'))
+            f.truncate(size)  # разреженный файл — место занимается по мере записи
+        segment = cls(path, mode='r+')
+        segment.freqs[:] = freqs
+        return segment
+
+    def append(self, timestamp: float, y: np.ndarray):
+        row = self.rows
+        self.power[row] = y
+        self.timestamps[row] = timestamp
+        self._rows[0] = row + 1  # счётчик строк обновляем последним
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is not None:
+            if self._mm.mode != 'r':
+                self._mm.flush()
+            # Отображение закроется, когда на него не останется ссылок (в т.ч. из выданных view)
+            self.freqs = self.timestamps = self.power = self._rows = self._mm = None
+
+
+class SpectrumRecorder:
+    """Дописывает каждый полный свип в текущий сегмент, ротирует сегменты по размеру."""
+    def __init__(self, base_path: str, max_segment_bytes: int = 256 * 1024 * 1024):
+        self.base_path = base_path
+        self.max_segment_bytes = max_segment_bytes
+        self.segment = None
+        self.segment_index = len(glob.glob(f"{glob.escape(base_path)}_*{SEGMENT_SUFFIX}"))
+        self.rows_written = 0
+
+    def _open_segment(self, freqs: np.ndarray):
+        self.close()
+        row_bytes = 8 + 4 * len(freqs)
+        capacity = max(1, (self.max_segment_bytes - HEADER_SIZE - 8 * len(freqs)) // row_bytes)
+        path = segment_path(self.base_path, self.segment_index)
+        self.segment = RecordingSegment.create(path, freqs, capacity)
+        self.segment_index += 1
+        logger.info(f"Новый сегмент записи: {path} ({capacity} строк по {len(freqs)} бинов)")
+
+    def record(self, sweep: dict):
+        """Слот для сигнала с полным свипом {'x', 'y', ...}."""
+        self.append(sweep['x'], sweep['y'])
+
+    def append(self, x: np.ndarray, y: np.ndarray, timestamp: Optional[float] = None):
+        segment = self.segment
+        if segment is None or segment.bins != len(x) or segment.rows >= segment.capacity \
+                or segment.freqs[0] != x[0] or segment.freqs[-1] != x[-1]:
+            self._open_segment(np.asarray(x, dtype=np.float64))
+            segment = self.segment
+        segment.append(time.time() if timestamp is None else timestamp, y)
+        self.rows_written += 1
+
+    def close(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
+
+
+class SpectrumRecording:
+    """Чтение записи: произвольный доступ к строкам и поиск по времени через индекс."""
+    def __init__(self, path: str):
+        # Можно указать любой сегмент или базовое имя — открываем все сегменты записи
+        base = path[:-len(SEGMENT_SUFFIX) - 5] if path.endswith(SEGMENT_SUFFIX) else path
+        self.base_path = base
+        paths = sorted(glob.glob(f"{glob.escape(base)}_*{SEGMENT_SUFFIX}"))
+        if not paths:
+            raise FileNotFoundError(f"Нет сегментов записи для {path}")
+        self.segments: List[RecordingSegment] = [RecordingSegment(p) for p in paths]
+        self.segments = [s for s in self.segments if s.rows > 0]
+        if not self.segments:
+            raise ValueError(f"Запись {base} пуста")
+        # Индекс: первая строка и первая метка времени каждого сегмента
+        self.offsets = np.cumsum([0] + [s.rows for s in self.segments])
+        self.segment_starts = np.array([s.timestamps[0] for s in self.segments])
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def start_time(self) -> float:
+        return float(self.segments[0].timestamps[0])
+
+    @property
+    def end_time(self) -> float:
+        last = self.segments[-1]
+        return float(last.timestamps[last.rows - 1])
+
+    def locate(self, index: int) -> Tuple[RecordingSegment, int]:
+        seg = int(np.searchsorted(self.offsets, index, side='right')) - 1
+        return self.segments[seg], index - int(self.offsets[seg])
+
+    def row(self, index: int) -> Tuple[float, np.ndarray, np.ndarray]:
+        """(метка времени, частоты, мощности) — мощности как view в отображение файла."""
+        segment, row = self.locate(index)
+        return float(segment.timestamps[row]), segment.freqs, segment.power[row]
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """Строки [start, stop) одним массивом (копия; может охватывать несколько сегментов)."""
+        stop = min(stop, len(self))
+        out = np.empty((max(stop - start, 0), self.segments[0].bins), dtype=np.float32)
+        pos = start
+        while pos < stop:
+            segment, row = self.locate(pos)
+            take = min(segment.rows - row, stop - pos)
+            out[pos - start:pos - start + take] = segment.power[row:row + take]
+            pos += take
+        return out
+
+    def timestamps(self) -> np.ndarray:
+        return np.concatenate([s.timestamps[:s.rows] for s in self.segments])
+
+    def seek(self, timestamp: float) -> int:
+        """Индекс первой строки с меткой времени >= timestamp (двоичный поиск, без чтения данных)."""
+        seg = max(int(np.searchsorted(self.segment_starts, timestamp, side='right')) - 1, 0)
+        segment = self.segments[seg]
+        row = int(np.searchsorted(segment.timestamps[:segment.rows], timestamp, side='left'))
+        return min(int(self.offsets[seg]) + row, len(self) - 1)
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
@@ -0,0 +1,322 @@
+"""
+Разбор вывода SDR-утилит без зависимостей от Qt.
+Используется как потоками бэкендов GUI, так и асинхронным драйвером core.driver.
+"""
+
+import io
+import struct
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class BinaryStreamBuffer:
+    """
+    Буфер сборки записей бинарного потока: куски копируются в заранее выделенный
+    bytearray, неразобранный хвост (обычно меньше одной записи) сдвигается в начало.
+    Наследники разбирают данные в диапазоне [_start, _end).
+    """
+    def __init__(self, initial_size: int = 1 << 20):
+        self._buf = bytearray(initial_size)
+        self._view = memoryview(self._buf)
+        self._start = 0  # начало неразобранных данных
+        self._end = 0    # конец записанных данных
+
+    def _write(self, chunk: bytes):
+        size = len(chunk)
+        if self._end + size > len(self._buf):
+            pending = self._end - self._start
+            if pending + size > len(self._buf):
+                # Буфер мал — выделяем новый, старые представления остаются валидными
+                new_buf = bytearray(max(2 * len(self._buf), pending + size))
+                new_buf[:pending] = self._view[self._start:self._end]
+                self._buf = new_buf
+                self._view = memoryview(new_buf)
+            else:
+                self._view[:pending] = self._view[self._start:self._end]
+            self._start = 0
+            self._end = pending
+        self._view[self._end:self._end + size] = chunk
+        self._end += size
+
+    @property
+    def pending(self) -> int:
+        """Число байт неполной записи в буфере."""
+        return self._end - self._start
+
+
+class HackRFSweepParser(BinaryStreamBuffer):
+    """
+    Потоковый разбор бинарного вывода `hackrf_sweep -B`.
+
+    Формат записи: uint32 длина записи (без самого поля длины), uint64 нижняя
+    граница, uint64 верхняя граница (Гц), затем float32 значения мощности.
+    Входящие куски копируются в заранее выделенный bytearray, все полные записи
+    одной длины декодируются одним вызовом np.frombuffer (без копий) и
+    возвращаются пакетом. Возвращаемые массивы — представления внутреннего
+    буфера и действительны только до следующего вызова feed().
+    """
+    LENGTH = struct.Struct('<I')
+    HEADER_SIZE = 4 + 8 + 8
+    MAX_SAMPLES = 1 << 24
+
+    def __init__(self, initial_size: int = 1 << 20):
+        super().__init__(initial_size)
+        self._dtypes = {}
+        self.records = 0
+        self.bytes_parsed = 0
+        self.resyncs = 0
+
+    def _record_dtype(self, length: int) -> np.dtype:
+        dtype = self._dtypes.get(length)
+        if dtype is None:
+            count = (length - 16) // 4
+            dtype = np.dtype([
+                ('length', '<u4'),
+                ('low', '<u8'),
+                ('high', '<u8'),
+                ('rssi', '<f4', (count,)),
+            ])
+            self._dtypes[length] = dtype
+        return dtype
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Добавить кусок данных и разобрать все полные записи.
+        :return: список пакетов (low_edges, high_edges, rssi[n_records, n_bins])
+        """
+        if chunk:
+            self._write(chunk)
+        batches = []
+        while self._end - self._start >= self.HEADER_SIZE:
+            length, = self.LENGTH.unpack_from(self._buf, self._start)
+            if length < 16 or (length - 16) % 4 or length > 16 + 4 * self.MAX_SAMPLES:
+                # Поток повреждён (в т.ч. длина больше допустимой, иначе буфер ждал бы
+                # её бесконечно) — отбрасываем накопленное и ждём новых данных
+                self.resyncs += 1
+                self._start = self._end = 0
+                break
+            record_size = 4 + length
+            n = (self._end - self._start) // record_size
+            if n == 0:
+                break
+            block = np.frombuffer(self._buf, dtype=self._record_dtype(length),
+                                  count=n, offset=self._start)
+            mismatch = np.flatnonzero(block['length'] != length)
+            if mismatch.size:
+                n = int(mismatch[0])
+                block = block[:n]
+            batches.append((block['low'], block['high'], block['rssi']))
+            self._start += n * record_size
+            self.records += n
+            self.bytes_parsed += n * record_size
+        if self._start == self._end:
+            self._start = self._end = 0
+        return batches
+
+
+class SoapyPowerBinParser(BinaryStreamBuffer):
+    """
+    Потоковый разбор формата `soapy_power -F soapy_power_bin`.
+
+    Запись: заголовок '<5sBddddQQ2x' — magic b'SDRFF', версия, время начала и
+    конца (с), начальная и конечная частоты (Гц), шаг (Гц, целое), число бинов — затем
+    float32 значения мощности. Записи, разрезанные между чтениями, собираются
+    в буфере; все полные записи одной длины декодируются одним np.frombuffer.
+    Возвращаемые массивы — представления внутреннего буфера и действительны
+    только до следующего вызова feed().
+    """
+    MAGIC = b"SDRFF"
+    HEADER = struct.Struct('<5sBddddQQ2x')
+    HEADER_SIZE = HEADER.size
+    SAMPLES_OFFSET = HEADER_SIZE - 10
+    MAX_SAMPLES = 1 << 24
+
+    def __init__(self, initial_size: int = 1 << 20):
+        super().__init__(initial_size)
+        self._dtypes = {}
+        self.records = 0
+        self.bytes_parsed = 0
+        self.resyncs = 0
+
+    def _record_dtype(self, samples: int) -> np.dtype:
+        dtype = self._dtypes.get(samples)
+        if dtype is None:
+            dtype = np.dtype([
+                ('magic', 'S5'),
+                ('version', 'u1'),
+                ('time_start', '<f8'),
+                ('time_stop', '<f8'),
+                ('start', '<f8'),
+                ('stop', '<f8'),
+                ('step', '<u8'),
+                ('samples', '<u8'),
+                ('reserved', 'V2'),
+                ('power', '<f4', (samples,)),
+            ])
+            self._dtypes[samples] = dtype
+        return dtype
+
+    def _resync(self):
+        """Пропустить мусор до следующего magic; неполный magic в конце сохраняется."""
+        self.resyncs += 1
+        index = self._buf.find(self.MAGIC, self._start + 1, self._end)
+        if index < 0:
+            self._start = max(self._start, self._end - len(self.MAGIC) + 1)
+        else:
+            self._start = index
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Добавить кусок данных и разобрать все полные записи.
+        :return: список пакетов (time_start, start, stop, power[n_records, n_bins])
+        """
+        if chunk:
+            self._write(chunk)
+        batches = []
+        while self._end - self._start >= self.HEADER_SIZE:
+            if self._buf[self._start:self._start + len(self.MAGIC)] != self.MAGIC:
+                self._resync()
+                continue
+            samples, = struct.unpack_from('<Q', self._buf, self._start + self.SAMPLES_OFFSET)
+            if samples == 0 or samples > self.MAX_SAMPLES:
+                self._resync()
+                continue
+            record_size = self.HEADER_SIZE + 4 * samples
+            n = (self._end - self._start) // record_size
+            if n == 0:
+                break
+            block = np.frombuffer(self._buf, dtype=self._record_dtype(samples),
+                                  count=n, offset=self._start)
+            # Пакет заканчивается там, где начинается запись другой длины (или мусор)
+            mismatch = np.flatnonzero((block['magic'] != self.MAGIC) | (block['samples'] != samples))
+            if mismatch.size:
+                n = int(mismatch[0])
+                block = block[:n]
+            batches.append((block['time_start'], block['start'], block['stop'], block['power']))
+            self._start += n * record_size
+            self.records += n
+            self.bytes_parsed += n * record_size
+        if self._start == self._end:
+            self._start = self._end = 0
+        return batches
+
+
+def parse_rtl_power_line(line: str) -> Optional[Tuple[float, float, np.ndarray]]:
+    """
+    Разобрать строку CSV rtl_power: дата, время, Гц нач., Гц кон., шаг Гц, число отсчётов, дБ...
+    Шестое поле — число усреднённых отсчётов FFT, а не бинов: мощности — все поля после него.
+    :return: (начальная частота МГц, шаг МГц, мощности) или None, если строка не с данными
+    """
+    parts = line.split(',')
+    # Проверяем, что это строка с данными (первый элемент — число)
+    if len(parts) < 7 or not parts[0].strip().replace('-', '').isdigit():
+        return None
+    start_freq = float(parts[2]) / 1e6
+    step_mhz = float(parts[4]) / 1e6
+    db_values = np.array(parts[6:], dtype=np.float64)
+    return start_freq, step_mhz, db_values
+
+
+class RtlPowerCsvDecoder:
+    """
+    Пакетный разбор CSV rtl_power с объединением хопов в свипы.
+
+    Все полные строки куска разбираются одним вызовом np.loadtxt (строки с
+    одинаковым числом полей — одной таблицей). Хопы одного свипа rtl_power
+    печатает с одинаковыми полями даты и времени; свип считается законченным,
+    когда эти поля меняются или частота хопа не растёт (новый проход в ту же
+    секунду). Наружу уходит один сшитый спектр на свип.
+    """
+    def __init__(self):
+        self._tail = b""
+        self._key = None
+        self._hops = []  # [(нижняя частота Гц, шаг Гц, мощности)] текущего свипа
+        self.errors = 0
+        self.lines = 0
+        self.sweeps = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._tail)
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """
+        Разобрать очередной кусок вывода.
+        :return: законченные свипы [(время 'HH:MM:SS', частоты МГц, мощности float32)]
+        """
+        data = self._tail + bytes(chunk)
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            self._tail = data
+            return []
+        self._tail = data[cut + 1:]
+
+        keys, rests = [], []
+        for line in data[:cut].split(b'\n'):
+            parts = line.split(b',', 2)
+            # Строки не с данными (сообщения rtl_power в объединённом выводе) пропускаются
+            if len(parts) < 3 or not parts[0].strip()[:1].isdigit():
+                continue
+            keys.append(parts[0].strip() + b' ' + parts[1].strip())
+            rests.append(parts[2])
+        self.lines += len(rests)
+
+        sweeps = []
+        # Подряд идущие строки с одинаковым числом полей разбираются одной таблицей
+        start = 0
+        while start < len(rests):
+            width = rests[start].count(b',')
+            end = start + 1
+            while end < len(rests) and rests[end].count(b',') == width:
+                end += 1
+            for i, row in zip(range(start, end), self._parse_rows(rests[start:end])):
+                if row is None:
+                    continue
+                low, step, values = row[0], row[2], row[4:]
+                if self._hops and (keys[i] != self._key or low <= self._hops[-1][0]):
+                    sweeps.append(self._finish_sweep())
+                self._key = keys[i]
+                self._hops.append((low, step, values))
+            start = end
+        return sweeps
+
+    def _parse_rows(self, rests: List[bytes]):
+        """Таблица (строки, поля) одним вызовом; при битой строке — построчно с учётом ошибок."""
+        try:
+            return np.loadtxt(io.BytesIO(b'\n'.join(rests)), delimiter=',', dtype=np.float64, ndmin=2)
+        except ValueError:
+            rows = []
+            for rest in rests:
+                try:
+                    rows.append(np.array(rest.split(b','), dtype=np.float64))
+                except ValueError:
+                    self.errors += 1
+                    rows.append(None)
+            return rows
+
+    def flush(self) -> Optional[Tuple[str, np.ndarray, np.ndarray]]:
+        """Отдать незаконченный свип (процесс завершился)."""
+        return self._finish_sweep() if self._hops else None
+
+    def _finish_sweep(self) -> Tuple[str, np.ndarray, np.ndarray]:
+        hops = sorted(self._hops, key=lambda hop: hop[0])
+        self._hops = []
+        self.sweeps += 1
+        lows = np.array([hop[0] for hop in hops])
+        steps = np.array([hop[1] for hop in hops])
+        sizes = [len(hop[2]) for hop in hops]
+        if len(set(sizes)) == 1:
+            # Обычный случай — все хопы одной длины: сетка и мощности без цикла
+            x = (lows[:, None] + np.arange(sizes[0]) * steps[:, None]).ravel()
+            y = np.vstack([hop[2] for hop in hops]).ravel()
+        else:
+            x = np.concatenate([low + np.arange(size) * step for low, step, size in zip(lows, steps, sizes)])
+            y = np.concatenate([hop[2] for hop in hops])
+        # Перекрывающиеся хопы: оставляем только бины, продолжающие сетку по возрастанию
+        if len(x) > 1 and not np.all(x[1:] > x[:-1]):
+            keep = np.empty(len(x), dtype=bool)
+            keep[0] = True
+            np.greater(x[1:], np.maximum.accumulate(x)[:-1], out=keep[1:])
+            x, y = x[keep], y[keep]
+        timestamp = self._key.decode('ascii', errors='ignore').split(' ')[-1]
+        return timestamp, x / 1e6, y.astype(np.float32)
@@ -0,0 +1,94 @@
+"""
+Сборка полного свипа из сегментов бэкенда (без Qt).
+hackrf_sweep (и rtl_power по хопам) отдаёт спектр кусками по несколько МГц —
+здесь они раскладываются по заранее выделенной частотной сетке всего диапазона,
+а наружу уходит ровно один кадр на каждый проход диапазона. Последний проход,
+после которого сетка уже не переходит на новый круг (rtl_power -1, конец файла),
+отдаёт flush() при завершении сканирования.
+"""
+
+import numpy as np
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SweepGrid:
+    """Собирает сегменты в один кадр с постоянным числом бинов."""
+    def __init__(self, start_freq: float, end_freq: float, fill_value: float = -100.0):
+        self.start_freq = start_freq
+        self.end_freq = end_freq
+        self.fill_value = fill_value
+        self.x = None
+        self.y = None
+        self.step = None
+        self.sweeps = 0
+        self.segments = 0
+        self._last_segment_start = None
+        self._pending = False  # в сетке есть сегменты, ещё не ушедшие кадром
+        self._timestamp = ''
+
+    def reset(self):
+        self.x = None
+        self.y = None
+        self.step = None
+        self._last_segment_start = None
+        self._pending = False
+        self._timestamp = ''
+
+    def _frame(self, timestamp: str) -> dict:
+        self.sweeps += 1
+        self._pending = False
+        return {'x': self.x, 'y': self.y.copy(), 'timestamp': timestamp}
+
+    def flush(self, timestamp: str = '') -> Optional[dict]:
+        """Сканирование завершилось: отдать незакрытый проход, если в нём есть сегменты."""
+        if not self._pending:
+            return None
+        self._last_segment_start = None
+        return self._frame(timestamp or self._timestamp)
+
+    def _allocate(self, seg_x: np.ndarray):
+        """Выделить сетку по разрешению первого сегмента."""
+        self.step = (seg_x[-1] - seg_x[0]) / (len(seg_x) - 1)
+        size = int(round((self.end_freq - self.start_freq) / self.step)) + 1
+        self.x = self.start_freq + np.arange(size) * self.step
+        self.y = np.full(size, self.fill_value, dtype=np.float32)
+        logger.info(f"Сетка свипа: {size} бинов, шаг {self.step:.6f}")
+
+    def update(self, segment: dict) -> Optional[dict]:
+        """
+        Записать сегмент в сетку.
+        Сегмент с флагом 'sweep_end' (бэкенд сам знает границы свипа) закрывает кадр сразу.
+        :return: готовый кадр {'x', 'y', 'timestamp'} на переходе к новому свипу, иначе None
+        """
+        seg_x = np.asarray(segment['x'])
+        seg_y = segment['y']
+        if len(seg_x) < 2:
+            return None
+        if self.x is None:
+            self._allocate(seg_x)
+
+        frame = None
+        # Частота не выросла — начался новый проход, отдаём накопленный кадр
+        if self._last_segment_start is not None and seg_x[0] <= self._last_segment_start:
+            frame = self._frame(segment.get('timestamp', ''))
+        self._last_segment_start = seg_x[0]
+        self._timestamp = segment.get('timestamp', '')
+        self.segments += 1
+
+        i0 = int(round((seg_x[0] - self.start_freq) / self.step))
+        i1 = int(round((seg_x[-1] - self.start_freq) / self.step)) + 1
+        lo, hi = max(i0, 0), min(i1, len(self.y))
+        if lo < hi:
+            if i1 - i0 == len(seg_y):
+                # Разрешение совпадает с сеткой — прямое копирование среза
+                self.y[lo:hi] = seg_y[lo - i0:hi - i0]
+            else:
+                self.y[lo:hi] = np.interp(self.x[lo:hi], seg_x, seg_y)
+        self._pending = True
+        if segment.get('sweep_end') and frame is None:
+            self._last_segment_start = None
+            frame = self._frame(segment.get('timestamp', ''))
+        return frame
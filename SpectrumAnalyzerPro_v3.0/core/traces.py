@@ -0,0 +1,66 @@
+"""
+Производные кривые спектра (среднее, пик-холд макс/мин) без Qt.
+Свипы сворачиваются в TraceAccumulator, а fuse_traces применяет накопленное
+к предыдущему снимку одним проходом и возвращает неизменяемый снимок.
+"""
+
+import numpy as np
+from typing import Optional
+
+EMA_ALPHA = 0.1
+
+
+class TraceAccumulator:
+    """Свёртка нескольких свипов: вклад в EMA, максимум и минимум. Буферы выделяются один раз."""
+    def __init__(self, size: int):
+        self.ema = np.zeros(size, dtype=np.float32)
+        self.max = np.empty(size, dtype=np.float32)
+        self.min = np.empty(size, dtype=np.float32)
+        self.scratch = np.empty(size, dtype=np.float32)
+        self.count = 0
+
+    def fold(self, y: np.ndarray, alpha: float = EMA_ALPHA):
+        """Добавить свип: ema = (1 - alpha) * ema + alpha * y, max/min — на месте."""
+        np.multiply(y, alpha, out=self.scratch)
+        if self.count == 0:
+            np.copyto(self.ema, self.scratch)
+            np.copyto(self.max, y)
+            np.copyto(self.min, y)
+        else:
+            self.ema *= (1 - alpha)
+            self.ema += self.scratch
+            np.maximum(self.max, y, out=self.max)
+            np.minimum(self.min, y, out=self.min)
+        self.count += 1
+
+
+def _snapshot(out: np.ndarray, x: np.ndarray) -> dict:
+    out.flags.writeable = False
+    return {'x': x, 'average': out[0], 'peak_hold_max': out[1], 'peak_hold_min': out[2]}
+
+
+def fuse_traces(prev: Optional[dict], acc: TraceAccumulator, x: np.ndarray, alpha: float = EMA_ALPHA) -> dict:
+    """Один проход: новые среднее/макс/мин пишутся сразу в выходной массив (3, bins)."""
+    out = np.empty((3, len(acc.ema)), dtype=np.float32)
+    average, peak_max, peak_min = out
+    decay = (1 - alpha) ** acc.count
+    if prev is None or len(prev['average']) != len(average):
+        # Первое среднее — нормированная взвешенная сумма накопленных свипов
+        np.divide(acc.ema, 1 - decay, out=average)
+        np.copyto(peak_max, acc.max)
+        np.copyto(peak_min, acc.min)
+    else:
+        np.multiply(prev['average'], decay, out=average)
+        average += acc.ema
+        np.maximum(prev['peak_hold_max'], acc.max, out=peak_max)
+        np.minimum(prev['peak_hold_min'], acc.min, out=peak_min)
+    return _snapshot(out, x)
+
+
+def history_traces(history: np.ndarray, x: np.ndarray) -> dict:
+    """Снимок кривых, пересчитанный заново по всей истории (history: строки — свипы)."""
+    out = np.empty((3, history.shape[1]), dtype=np.float32)
+    np.mean(history, axis=0, out=out[0])
+    np.max(history, axis=0, out=out[1])
+    np.min(history, axis=0, out=out[2])
+    return _snapshot(out, x)
@@ -0,0 +1,191 @@
+"""
+Слежение за источниками излучения между свипами (без Qt).
+Пики свипа связываются с активными треками по близости частоты: частоты
+активных треков лежат отсортированными, и соединение — один searchsorted
+(векторный bisect) на весь свип. Трек получает постоянный номер, время
+первого и последнего появления, бегущие среднее/СКО/максимум мощности и
+среднюю/максимальную ширину полосы.
+
+Треки хранятся по колонкам в массивах, растущих удвоением; номер трека —
+номер его строки, строки не удаляются. Трек, не появлявшийся дольше timeout,
+становится неактивным и остаётся в хранилище как история обзора.
+"""
+
+import time
+from typing import Optional
+import numpy as np
+
+TRACK_COLUMNS = (
+    ('freq', np.float64),        # средняя частота, МГц
+    ('last_freq', np.float64),   # частота последнего пика — по ней идёт соединение
+    ('first_seen', np.float64),
+    ('last_seen', np.float64),
+    ('hits', np.int64),          # число свипов с пиком
+    ('power_mean', np.float64),
+    ('power_m2', np.float64),    # сумма квадратов отклонений (Уэлфорд)
+    ('power_max', np.float64),
+    ('width_mean', np.float64),
+    ('width_max', np.float64),
+)
+
+
+def nearest_join(sorted_freqs: np.ndarray, freqs: np.ndarray, tolerance: float):
+    """
+    Сопоставить частоты с ближайшими из отсортированного массива в пределах tolerance.
+    Каждый элемент sorted_freqs достаётся не более чем одной частоте — ближайшей.
+    :return: (индексы в sorted_freqs, индексы в freqs) совпавших пар
+    """
+    empty = np.empty(0, dtype=np.intp)
+    if len(sorted_freqs) == 0 or len(freqs) == 0:
+        return empty, empty
+    k = np.searchsorted(sorted_freqs, freqs)
+    below = np.clip(k - 1, 0, len(sorted_freqs) - 1)
+    above = np.clip(k, 0, len(sorted_freqs) - 1)
+    below_dist = np.abs(sorted_freqs[below] - freqs)
+    above_dist = np.abs(sorted_freqs[above] - freqs)
+    nearest = np.where(below_dist <= above_dist, below, above)
+    dist = np.minimum(below_dist, above_dist)
+    j = np.flatnonzero(dist <= tolerance)
+    i = nearest[j]
+    # Несколько частот у одного элемента — остаётся ближайшая, остальные не сопоставлены
+    order = np.lexsort((dist[j], i))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = i[order][1:] != i[order][:-1]
+    keep = order[first]
+    return i[keep], j[keep]
+
+
+class EmitterTracker:
+    def __init__(self, tolerance_mhz: float = 0.025, timeout: float = 60.0, capacity: int = 1024):
+        self.tolerance_mhz = tolerance_mhz
+        self.timeout = timeout  # с без пика, после которых трек неактивен
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in TRACK_COLUMNS}
+        self.count = 0
+        self.sweeps = 0
+        self._active = np.empty(0, dtype=np.intp)  # номера активных треков по возрастанию last_freq
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reset(self):
+        self.count = 0
+        self.sweeps = 0
+        self._active = np.empty(0, dtype=np.intp)
+
+    @property
+    def active(self) -> np.ndarray:
+        """Номера активных треков по возрастанию частоты."""
+        return self._active
+
+    def update(self, peaks: np.ndarray, timestamp: Optional[float] = None) -> np.ndarray:
+        """
+        Связать пики свипа (массив core.peaks.PEAK_DTYPE) с треками.
+        Заполняет поля 'track' и 'on_air' пиков на месте.
+        :return: номера треков для каждого пика
+        """
+        now = time.time() if timestamp is None else timestamp
+        c = self.columns
+        active = self._active
+        # Треки, молчащие дольше timeout, выходят из соединения
+        active = active[c['last_seen'][active] >= now - self.timeout]
+
+        track_pos, peak_idx = nearest_join(c['last_freq'][active], peaks['freq'], self.tolerance_mhz)
+        rows = active[track_pos]
+        tracks = np.full(len(peaks), -1, dtype=np.int64)
+        tracks[peak_idx] = rows
+
+        if len(rows):
+            freq = peaks['freq'][peak_idx]
+            power = peaks['amplitude'][peak_idx]
+            width = peaks['width'][peak_idx]
+            n = c['hits'][rows] + 1
+            c['hits'][rows] = n
+            c['freq'][rows] += (freq - c['freq'][rows]) / n
+            c['last_freq'][rows] = freq
+            c['last_seen'][rows] = now
+            delta = power - c['power_mean'][rows]
+            mean = c['power_mean'][rows] + delta / n
+            c['power_m2'][rows] += delta * (power - mean)
+            c['power_mean'][rows] = mean
+            c['power_max'][rows] = np.maximum(c['power_max'][rows], power)
+            c['width_mean'][rows] += (width - c['width_mean'][rows]) / n
+            c['width_max'][rows] = np.maximum(c['width_max'][rows], width)
+
+        unmatched = np.ones(len(peaks), dtype=bool)
+        unmatched[peak_idx] = False
+        new_peaks = np.flatnonzero(unmatched)
+        new_rows = self._append(peaks[new_peaks], now)
+        tracks[new_peaks] = new_rows
+
+        active = np.concatenate((active, new_rows))
+        self._active = active[np.argsort(c['last_freq'][active], kind='stable')]
+        self.sweeps += 1
+
+        peaks['track'] = tracks
+        peaks['on_air'] = now - c['first_seen'][tracks]
+        return tracks
+
+    def _append(self, peaks: np.ndarray, now: float) -> np.ndarray:
+        start, stop = self.count, self.count + len(peaks)
+        if stop > len(self.columns['freq']):
+            self._grow(stop)
+        c = self.columns
+        rows = np.arange(start, stop, dtype=np.intp)
+        c['freq'][rows] = peaks['freq']
+        c['last_freq'][rows] = peaks['freq']
+        c['first_seen'][rows] = now
+        c['last_seen'][rows] = now
+        c['hits'][rows] = 1
+        c['power_mean'][rows] = peaks['amplitude']
+        c['power_m2'][rows] = 0.0
+        c['power_max'][rows] = peaks['amplitude']
+        c['width_mean'][rows] = peaks['width']
+        c['width_max'][rows] = peaks['width']
+        self.count = stop
+        return rows
+
+    def _grow(self, size: int):
+        capacity = len(self.columns['freq'])
+        while capacity < size:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    # --- сводка ---
+
+    def summary(self) -> dict:
+        """Колонки сводки по всем трекам (номер трека — индекс строки)."""
+        c = {name: column[:self.count] for name, column in self.columns.items()}
+        active = np.zeros(self.count, dtype=bool)
+        active[self._active] = True
+        return {
+            'track': np.arange(self.count, dtype=np.int64),
+            'freq_mhz': c['freq'],
+            'first_seen': c['first_seen'],
+            'last_seen': c['last_seen'],
+            'on_air_s': c['last_seen'] - c['first_seen'],
+            'hits': c['hits'],
+            'power_mean_db': c['power_mean'],
+            'power_std_db': np.sqrt(c['power_m2'] / np.maximum(c['hits'] - 1, 1)),
+            'power_max_db': c['power_max'],
+            'bandwidth_mean_mhz': c['width_mean'],
+            'bandwidth_max_mhz': c['width_max'],
+            'active': active,
+        }
+
+    # --- экспорт ---
+
+    def to_csv(self, path: str):
+        summary = self.summary()
+        columns = list(summary)
+        np.savetxt(path, np.column_stack([summary[c] for c in columns]), delimiter=',',
+                   header=','.join(columns), comments='', fmt='%.15g')
+
+    def to_parquet(self, path: str):
+        try:
+            import pandas as pd
+            pd.DataFrame(self.summary()).to_parquet(path, index=False)
+        except ImportError as e:  # нет pandas или движка Parquet (pyarrow/fastparquet)
+            raise RuntimeError(f"Для экспорта в Parquet нужны pandas и pyarrow: {e}") from e
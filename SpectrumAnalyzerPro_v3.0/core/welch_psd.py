@@ -0,0 +1,131 @@
+"""
+Потоковая оценка спектральной плотности мощности методом Уэлча для IQ-бэкендов.
+
+Поток IQ режется на сегменты фиксированной длины fft_size с перекрытием;
+сегменты берутся strided-представлением (без копий), умножаются на окно,
+преобразуются одним вызовом np.fft.fft по двумерному блоку и усредняются
+по `averages` сегментам. Каждый кадр PSD покрывает одно и то же число отсчётов,
+поэтому спектры выходят с постоянным числом бинов и постоянной частотой.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List
+
+# Формат отсчётов -> (тип компоненты, масштаб до [-1, 1))
+SAMPLE_FORMATS = {
+    'float32': (np.dtype('<f4'), 1.0),
+    'int16': (np.dtype('<i2'), 1.0 / 32768),
+}
+
+
+class WelchPSD:
+    """
+    Накопитель IQ-отсчётов и вычислитель кадров PSD.
+    feed(bytes) возвращает список готовых кадров — массивов мощности в дБ
+    (относительно полной шкалы) длиной fft_size, частоты по возрастанию.
+    """
+    def __init__(self, sample_rate: float, fft_size: int = 1024, overlap: float = 0.5,
+                 update_rate: float = 20.0, sample_format: str = 'float32'):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Неизвестный формат отсчётов: {sample_format}")
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.hop = max(1, int(round(fft_size * (1 - overlap))))
+        # Сколько сегментов усреднять, чтобы кадры выходили ~update_rate раз в секунду
+        self.averages = max(1, int(round(sample_rate / (self.hop * update_rate))))
+        self.frame_samples = self.averages * self.hop  # на столько продвигается поток за кадр
+        self.component_dtype, self.scale = SAMPLE_FORMATS[sample_format]
+        self.sample_bytes = 2 * self.component_dtype.itemsize
+
+        # Окно и нормировка считаются один раз: 0 дБ — синусоида полной шкалы
+        # Периодическое окно Ханна (как scipy.signal.get_window('hann')) — без импорта scipy
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(fft_size) / fft_size)).astype(np.float32)
+        self._norm = 1.0 / (self.averages * float(self.window.sum()) ** 2)
+
+        # Кольцо отсчётов: хвост прошлого кадра + новые данные; ёмкость — несколько кадров
+        window_span = (self.averages - 1) * self.hop + fft_size
+        self._samples = np.zeros(max(4 * window_span, 1 << 16), dtype=np.complex64)
+        self._count = 0
+        self._window_span = window_span
+        self._work = np.empty((self.averages, fft_size), dtype=np.complex64)
+        self._tail = b""  # неполный IQ-отсчёт между чтениями
+        self.frames = 0
+
+    @property
+    def freqs(self) -> np.ndarray:
+        """Смещения бинов от центральной частоты, Гц."""
+        return np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1 / self.sample_rate))
+
+    @property
+    def span(self) -> int:
+        """Сколько отсчётов нужно для одного кадра (все усредняемые сегменты)."""
+        return self._window_span
+
+    @property
+    def pending(self) -> int:
+        """Число байт IQ, накопленных, но ещё не вошедших в кадр."""
+        return self._count * self.sample_bytes + len(self._tail)
+
+    def reset(self):
+        self._count = 0
+        self._tail = b""
+
+    def _append(self, chunk) -> None:
+        chunk = memoryview(chunk).cast('B')
+        if self._tail:
+            # Дособираем отсчёт, разрезанный между чтениями, остальное — без копий
+            need = self.sample_bytes - len(self._tail)
+            head, chunk = self._tail + bytes(chunk[:need]), chunk[need:]
+            self._tail = b""
+            if len(head) < self.sample_bytes:
+                self._tail = head
+                return
+            self._append_samples(head)
+        usable = len(chunk) - len(chunk) % self.sample_bytes
+        if usable != len(chunk):
+            self._tail = bytes(chunk[usable:])
+        if usable:
+            self._append_samples(chunk[:usable])
+
+    def _append_samples(self, data) -> None:
+        # Представление входных байт как пар (I, Q) — без копии
+        iq = np.frombuffer(data, dtype=self.component_dtype)
+        n = len(iq) // 2
+        if self._count + n > len(self._samples):
+            grown = np.zeros(max(2 * len(self._samples), self._count + n), dtype=np.complex64)
+            grown[:self._count] = self._samples[:self._count]
+            self._samples = grown
+        # Единственное преобразование: компоненты пишутся прямо в complex64 как в float32-пары
+        dest = self._samples[self._count:self._count + n].view(np.float32)
+        if self.scale == 1.0:
+            dest[:] = iq
+        else:
+            np.multiply(iq, self.scale, out=dest, casting='unsafe')
+        self._count += n
+
+    def _frame(self, start: int) -> np.ndarray:
+        block = self._samples[start:start + self._window_span]
+        segments = sliding_window_view(block, self.fft_size)[::self.hop]  # (averages, fft_size)
+        np.multiply(segments, self.window, out=self._work)
+        spectrum = np.fft.fft(self._work, axis=1)
+        power = np.einsum('ij,ij->j', spectrum.real, spectrum.real)
+        power += np.einsum('ij,ij->j', spectrum.imag, spectrum.imag)
+        power *= self._norm
+        return (10 * np.log10(np.fft.fftshift(power) + 1e-20)).astype(np.float32)
+
+    def feed(self, chunk) -> List[np.ndarray]:
+        """Добавить байты IQ и вернуть все полностью накопленные кадры PSD."""
+        self._append(chunk)
+        frames = []
+        start = 0
+        while self._count - start >= self._window_span:
+            frames.append(self._frame(start))
+            start += self.frame_samples
+        if start:
+            # Перекрытие со следующим кадром сохраняется: сдвигаем несъеденный хвост в начало
+            remaining = self._count - start
+            self._samples[:remaining] = self._samples[start:self._count]
+            self._count = remaining
+            self.frames += len(frames)
+        return frames
@@ -1,12 +1,28 @@
 """
 Инициализация модуля управления данными.
 Позволяет импортировать классы из data/ через 'from data import *'
+
+Имена загружаются при первом обращении (PEP 562).
 """
 
-from .history_buffer import HistoryBuffer
-from .data_storage import DataStorage
+import importlib
+
+_EXPORTS = {
+    'HistoryBuffer': 'core.history_buffer',
+    'DataStorage': '.data_storage',
+    'SweepAssembler': '.sweep_assembler',
+    'SpectrumRecorder': 'core.spectrum_recorder',
+    'SpectrumRecording': 'core.spectrum_recorder',
+    'WaterfallPyramid': '.waterfall_pyramid',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'HistoryBuffer',
-    'DataStorage'
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,75 +1,104 @@
 """
 Централизованное хранилище данных — аналог qspectrumanalyzer.data.DataStorage.
-Поддерживает: скользящее среднее, пик-холд, сглаживание, персистентность, базовую линию.
+Поддерживает: скользящее среднее, пик-холд, сглаживание, персистентность, базовую линию
+(из файла или живую — процентиль последних свипов, core.baseline), статистику
+занятости каналов (core.occupancy). Сглаживание — кэшированные ядра
+Савицкого–Голея (core.smoothing); при смене настроек вся история сглаживается
+одним вызовом в фоновом потоке.
+
+Производные кривые (среднее, пик-холд макс/мин) считаются одним проходом в
+фоновом потоке и публикуются одним неизменяемым снимком. Свипы, пришедшие,
+пока расчёт идёт, не ставятся в очередь, а сворачиваются в накопители.
 """
 
+import os
+import threading
 import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal, QThreadPool, QRunnable
-from scipy.signal import savgol_filter
 from typing import Optional
 import logging
+from core.baseline import StreamingBaseline
+from core.history_buffer import HistoryBuffer
+from core.occupancy import OccupancyStats
+from core.smoothing import savgol_smooth
+from core.traces import TraceAccumulator, fuse_traces, history_traces, EMA_ALPHA
 
 logger = logging.getLogger(__name__)
 
-class HistoryBuffer:
-    """Кольцевой буфер для водопада."""
-    def __init__(self, max_size: int, data_size: int):
-        self.max_size = max_size
-        self.data_size = data_size
-        self.history_size = 0
-        self.buffer = np.full((max_size, data_size), -100.0, dtype=np.float32)
-        self.counter = 0
-
-    def append(self, data: np.ndarray):
-        if len(data) != self.data_size:
-            raise ValueError(f"Ожидается {self.data_size} значений, получено {len(data)}")
-        self.counter += 1
-        if self.history_size < self.max_size:
-            self.history_size += 1
-        self.buffer = np.roll(self.buffer, -1, axis=0)
-        self.buffer[-1] = data.copy()
-
-    def get_buffer(self) -> np.ndarray:
-        return self.buffer[-self.history_size:]
-
 
 class DataStorage(QObject):
     """Главный менеджер данных для спектра и водопада."""
     data_updated = pyqtSignal(dict)
     history_updated = pyqtSignal(object)
-    average_updated = pyqtSignal(dict)
-    peak_hold_max_updated = pyqtSignal(dict)
-    peak_hold_min_updated = pyqtSignal(dict)
+    traces_updated = pyqtSignal(dict)  # {'x', 'average', 'peak_hold_max', 'peak_hold_min'} — только чтение
     history_recalculated = pyqtSignal(object)
     baseline_updated = pyqtSignal(dict)  # <-- ДОБАВЛЕНО!
 
+    EMA_ALPHA = EMA_ALPHA
+    BASELINE_EMIT_INTERVAL = 10  # свипов между обновлениями кривой живой базовой линии
+
     def __init__(self, max_history_size: int = 100):
         super().__init__()
         self.max_history_size = max_history_size
         self.history = None
         self.x = None
         self.y = None
-        self.average = None
-        self.peak_hold_max = None
-        self.peak_hold_min = None
+        self.raw_y = None               # последний свип до вычитания базовой линии и сглаживания
+        self.traces = None
         self.smooth = False
         self.smooth_length = 11
         self.smooth_window = "hanning"
+        self.smooth_order = 3
         self.subtract_baseline = False
-        self.baseline = None
+        self.baseline = None            # базовая линия на текущей сетке частот
         self.baseline_x = None
+        self._baseline_source = None    # (x, db) загруженного файла — интерполируется на сетку
+        self.live_baseline = None       # StreamingBaseline текущего скана
+        self.live_baseline_settings = None  # {'percentile', 'window'}; None — живая линия выключена
+        self.occupancy = None           # OccupancyStats текущего скана
+        self.occupancy_settings = None  # параметры OccupancyStats; None — статистика выключена
         self.threadpool = QThreadPool()
         self.threadpool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending = None      # накопитель, в который сворачиваются новые свипы
+        self._spare = None        # второй накопитель — обрабатывается фоновой задачей
+        self._pending_x = None
+        self._recalc = None       # (история, x, параметры сглаживания) для пересчёта в фоне
+        self._generation = 0
+        self._task_running = False
+
+    @property
+    def average(self) -> Optional[np.ndarray]:
+        return self.traces['average'] if self.traces else None
+
+    @property
+    def peak_hold_max(self) -> Optional[np.ndarray]:
+        return self.traces['peak_hold_max'] if self.traces else None
+
+    @property
+    def peak_hold_min(self) -> Optional[np.ndarray]:
+        return self.traces['peak_hold_min'] if self.traces else None
 
     def reset(self):
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+            self._spare = None
+            self._recalc = None
+            self.traces = None
         self.history = None
         self.x = None
         self.y = None
-        self.average = None
-        self.peak_hold_max = None
-        self.peak_hold_min = None
+        self.raw_y = None
         self.baseline = None
         self.baseline_x = None
+        self.live_baseline = None
+        self.occupancy = None
+
+    def set_occupancy(self, enable: bool, **settings):
+        """Включить накопление статистики занятости (параметры — как у OccupancyStats)."""
+        self.occupancy_settings = settings if enable else None
+        self.occupancy = None
 
     def update(self, sweep: dict):
         """Добавить новый снимок спектра."""
@@ -82,9 +111,17 @@ class DataStorage(QObject):
             logger.warning(f"Изменение числа бинов: {len(self.x)} → {len(x)}. Пропускаем.")
             return
 
+        # Занятость считается по абсолютному уровню — до вычитания базовой линии
+        if self.occupancy_settings is not None:
+            if self.occupancy is None:
+                self.occupancy = OccupancyStats(self.x, **self.occupancy_settings)
+            self.occupancy.update(y)
+
+        self._update_baseline(y)
+        self.raw_y = y  # y — уже копия свипа
         # Применяем LNB LO уже в бэкенде — здесь только базовая обработка
-        if self.subtract_baseline and self.baseline is not None and len(y) == len(self.baseline):
-            y = y - self.baseline
+        if self.subtract_baseline and self.baseline is not None:
+            y = y - self.baseline  # не на месте: raw_y остаётся абсолютным уровнем
 
         # Обновляем историю
         if self.history is None:
@@ -96,82 +133,164 @@ class DataStorage(QObject):
         self.y = y_processed
         self.data_updated.emit({'x': self.x, 'y': self.y})
 
-        # Расчет производных в отдельных потоках
-        self.threadpool.start(Task(self._update_average, y))
-        self.threadpool.start(Task(self._update_peak_hold_max, y))
-        self.threadpool.start(Task(self._update_peak_hold_min, y))
+        # Производные кривые (по сглаженному спектру, как и при пересчёте истории) —
+        # свёртка в накопитель и не более одной фоновой задачи
+        self._schedule_traces(y_processed)
 
         self.history_updated.emit(self)
 
+    def _update_baseline(self, y: np.ndarray):
+        """Живая базовая линия обновляется по сырому свипу; файловая — приводится к сетке один раз."""
+        if self.live_baseline_settings is not None:
+            if self.live_baseline is None:
+                self.live_baseline = StreamingBaseline(len(self.x), **self.live_baseline_settings)
+            value = self.live_baseline.update(y)
+            if value is None:
+                return
+            self.baseline, self.baseline_x = value, self.x
+            if self.live_baseline.sweeps % self.BASELINE_EMIT_INTERVAL == 0:
+                self.baseline_updated.emit({'baseline_x': self.baseline_x, 'baseline': self.baseline})
+        elif self._baseline_source is not None and self.baseline is None:
+            self._fit_baseline()
+
+    def _fit_baseline(self):
+        """Интерполировать загруженную базовую линию на текущую сетку вместо отказа при другом числе бинов."""
+        source_x, source_db = self._baseline_source
+        if len(source_x) != len(self.x) or not np.allclose(source_x, self.x):
+            logger.info(f"Базовая линия ({len(source_x)} точек) интерполирована на {len(self.x)} бинов")
+            outside = (self.x < source_x[0]) | (self.x > source_x[-1])
+            if outside.any():
+                logger.warning(f"{int(outside.sum())} бинов вне диапазона базовой линии — взяты крайние значения")
+        self.baseline = np.interp(self.x, source_x, source_db).astype(np.float32)
+        self.baseline_x = self.x
+        self.baseline_updated.emit({'baseline_x': self.baseline_x, 'baseline': self.baseline})
+
+    def _schedule_traces(self, y: np.ndarray):
+        with self._lock:
+            if self._pending is None:
+                self._pending = TraceAccumulator(len(y))
+                self._spare = TraceAccumulator(len(y))
+            self._pending.fold(y, self.EMA_ALPHA)
+            self._pending_x = self.x
+        self._start_task()
+
+    def _start_task(self):
+        with self._lock:
+            if self._task_running:
+                return  # задача заберёт накопленное, когда закончит текущий расчёт
+            self._task_running = True
+        self.threadpool.start(Task(self._compute_traces))
+
+    def _compute_traces(self):
+        """Фоновая задача: пересчёт по истории (если запрошен), затем накопители поверх последнего снимка."""
+        while True:
+            with self._lock:
+                request, self._recalc = self._recalc, None
+                generation = self._generation
+                acc = self._pending
+                if request is None:
+                    if acc is None or acc.count == 0:
+                        self._task_running = False
+                        return
+                    # Меняем накопители местами: новые свипы идут во второй, пока этот обрабатывается
+                    self._pending, self._spare = self._spare, acc
+                    prev = self.traces
+                    x = self._pending_x
+            if request is not None:
+                self._recalculate_history(generation, *request)
+                continue
+
+            snapshot = fuse_traces(prev, acc, x, self.EMA_ALPHA)
+            acc.count = 0
+
+            with self._lock:
+                if generation != self._generation:
+                    continue  # хранилище сброшено во время расчёта — результат устарел
+                self.traces = snapshot
+            self.traces_updated.emit(snapshot)
+
+    def _recalculate_history(self, generation: int, history: np.ndarray, x: np.ndarray, smoothing):
+        """Сгладить всю историю одним вызовом и пересчитать по ней кривые."""
+        if smoothing is not None:
+            history = savgol_smooth(history, *smoothing)
+        snapshot = history_traces(history, x)
+        with self._lock:
+            if generation != self._generation:
+                return  # пришёл новый запрос или сброс — результат устарел
+            self.traces = snapshot
+        self.traces_updated.emit(snapshot)
+        self.history_recalculated.emit(self)
+
+    def _smoothing_params(self):
+        """(длина, порядок, окно) — ключ кэша ядер; None, если сглаживание выключено."""
+        return (self.smooth_length, self.smooth_order, self.smooth_window) if self.smooth else None
+
     def _apply_smoothing(self, y: np.ndarray) -> np.ndarray:
-        if not self.smooth:
-            return y
-        if len(y) < self.smooth_length:
-            return y
-        return savgol_filter(y, self.smooth_length, 3)
-
-    def _update_average(self, y: np.ndarray):
-        if self.average is None:
-            self.average = y.copy()
-        else:
-            self.average = 0.9 * self.average + 0.1 * y
-        self.average_updated.emit({'x': self.x, 'y': self.average})
-
-    def _update_peak_hold_max(self, y: np.ndarray):
-        if self.peak_hold_max is None:
-            self.peak_hold_max = y.copy()
-        else:
-            self.peak_hold_max = np.maximum(self.peak_hold_max, y)
-        self.peak_hold_max_updated.emit({'x': self.x, 'y': self.peak_hold_max})
-
-    def _update_peak_hold_min(self, y: np.ndarray):
-        if self.peak_hold_min is None:
-            self.peak_hold_min = y.copy()
-        else:
-            self.peak_hold_min = np.minimum(self.peak_hold_min, y)
-        self.peak_hold_min_updated.emit({'x': self.x, 'y': self.peak_hold_min})
-
-    def set_smooth(self, enable: bool, length: int = 11, window: str = "hanning"):
-        if self.smooth != enable or self.smooth_length != length or self.smooth_window != window:
+        params = self._smoothing_params()
+        return y if params is None else savgol_smooth(y, *params)
+
+    def set_smooth(self, enable: bool, length: int = 11, window: str = "hanning", order: int = 3):
+        if (self.smooth != enable or self.smooth_length != length or self.smooth_window != window
+                or self.smooth_order != order):
             self.smooth = enable
             self.smooth_length = length
             self.smooth_window = window
+            self.smooth_order = order
             self.recalculate_data()
 
     def set_subtract_baseline(self, enable: bool, baseline_file: str = None):
         self.subtract_baseline = enable
+        self.baseline = None
+        self.baseline_x = None
+        self._baseline_source = None
         if baseline_file and os.path.exists(baseline_file):
-            # Читаем CSV: freq,db
-            data = np.loadtxt(baseline_file, delimiter=',', skiprows=1)
-            self.baseline_x = data[:, 0]
-            self.baseline = data[:, 1]
-            if len(self.baseline) != len(self.x):
-                logger.warning(f"Размер базовой линии ({len(self.baseline)}) не совпадает с текущим спектром ({len(self.x)})")
-                self.baseline = None
-        else:
-            self.baseline = None
-            self.baseline_x = None
+            # Читаем CSV: freq,db; частоты сортируются для интерполяции
+            data = np.loadtxt(baseline_file, delimiter=',', skiprows=1, ndmin=2)
+            order = np.argsort(data[:, 0])
+            self._baseline_source = (data[order, 0], data[order, 1])
+            self.live_baseline_settings = None
+            self.live_baseline = None
+            if self.x is not None:
+                self._fit_baseline()
+        elif self.live_baseline is not None and self.live_baseline.ready:
+            self.baseline, self.baseline_x = self.live_baseline.value, self.x
+        if self.baseline is None:
+            self.baseline_updated.emit({'baseline_x': None, 'baseline': None})
         self.recalculate_data()
 
+    def set_live_baseline(self, enable: bool, percentile: float = 20.0, window: int = 500):
+        """Живая базовая линия: потоковый процентиль по каждому бину за последние window свипов."""
+        self.live_baseline_settings = {'percentile': percentile, 'window': window} if enable else None
+        self.live_baseline = None
+        self.baseline = None
+        self.baseline_x = None
+        if enable:
+            self._baseline_source = None
+        self.baseline_updated.emit({'baseline_x': None, 'baseline': None})
+
     def recalculate_data(self):
-        """Пересчитать все кривые с учётом новых настроек."""
+        """
+        Пересчитать все кривые с учётом новых настроек.
+        Последний свип сглаживается сразу; история (копия) сглаживается целиком
+        и сворачивается в кривые в фоновой задаче.
+        """
         if self.history is None:
             return
         history = self.history.get_buffer()
         if len(history) == 0:
             return
-        last = history[-1]
-        if self.smooth:
-            last = self._apply_smoothing(last)
-        self.y = last
-        self.average = np.mean(history, axis=0)
-        self.peak_hold_max = np.max(history, axis=0)
-        self.peak_hold_min = np.min(history, axis=0)
+        self.y = self._apply_smoothing(history[-1])
+
+        with self._lock:
+            # Всё накопленное уже учтено в истории; расчёт, идущий сейчас, устарел
+            self._generation += 1
+            if self._pending is not None:
+                self._pending.count = 0
+            self._recalc = (history.copy(), self.x, self._smoothing_params())
+        self._start_task()
+
         self.data_updated.emit({'x': self.x, 'y': self.y})
-        self.average_updated.emit({'x': self.x, 'y': self.average})
-        self.peak_hold_max_updated.emit({'x': self.x, 'y': self.peak_hold_max})
-        self.peak_hold_min_updated.emit({'x': self.x, 'y': self.peak_hold_min})
-        self.history_recalculated.emit(self)
+
 
 class Task(QRunnable):
     """Задача для QThreadPool."""
@@ -0,0 +1,39 @@
+"""
+Сборщик полного свипа из сегментов бэкенда для GUI.
+Сама сборка — core.sweep_grid.SweepGrid; здесь только выдача кадров сигналом Qt.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from core.sweep_grid import SweepGrid
+
+
+class SweepAssembler(QObject):
+    """Собирает сегменты в один кадр с постоянным числом бинов."""
+    data_updated = pyqtSignal(dict)  # {'x': freqs, 'y': powers, 'timestamp': str}
+
+    def __init__(self, start_freq: float, end_freq: float, fill_value: float = -100.0):
+        super().__init__()
+        self.grid = SweepGrid(start_freq, end_freq, fill_value)
+
+    @property
+    def sweeps(self) -> int:
+        return self.grid.sweeps
+
+    @property
+    def segments(self) -> int:
+        return self.grid.segments
+
+    def reset(self):
+        self.grid.reset()
+
+    def update(self, segment: dict):
+        """Записать сегмент в сетку; на переходе к новому свипу эмитировать кадр."""
+        frame = self.grid.update(segment)
+        if frame is not None:
+            self.data_updated.emit(frame)
+
+    def flush(self):
+        """Бэкенд завершился: эмитировать последний, не закрытый переходом свип."""
+        frame = self.grid.flush()
+        if frame is not None:
+            self.data_updated.emit(frame)
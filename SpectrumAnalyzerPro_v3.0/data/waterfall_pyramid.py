@@ -0,0 +1,221 @@
+"""
+Многоуровневая пирамида водопада над записью спектра.
+Уровень (t, f) прорежен в 2^t раз по времени и в 2^f раз по частоте; для
+каждого уровня хранятся max-hold и среднее. Оси прореживаются независимо:
+запись в сотню бинов за сутки всё равно получает уровни по времени, а узкая
+полоса на всю длину записи читается с уровня, сжатого только по времени.
+Просмотр выбирает по каждой оси уровень, у которого видимая область примерно
+совпадает с числом пикселей экрана, поэтому отрисовка суток записи стоит
+столько же, сколько отрисовка нескольких десятков свипов. Все уровни вместе
+занимают около трёх объёмов исходной записи на режим.
+Уровни кешируются рядом с записью в файлах .npy (memory-mapped). Уровень
+пишется во временный файл и переименовывается, когда заполнен; рядом лежит
+описание источника (строки, бины, размер и время изменения сегментов), и кеш
+с другим описанием строится заново.
+"""
+
+import json
+import math
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from typing import Callable, Optional, Tuple
+import logging
+from core.spectrum_recorder import SpectrumRecording
+
+logger = logging.getLogger(__name__)
+
+MODES = ('max', 'mean')
+TIME, FREQ = 0, 1  # оси прореживания
+
+
+def _decimate_block(block: np.ndarray, mode: str, axis: int) -> np.ndarray:
+    """Сжать блок вдвое по оси axis (TIME — строки, FREQ — бины) по max или среднему."""
+    if axis == TIME:
+        n = block.shape[0] // 2
+        view = block[:2 * n].reshape(n, 2, block.shape[1])
+        reduce_axis = 1
+    else:
+        m = block.shape[1] // 2
+        view = block[:, :2 * m].reshape(block.shape[0], m, 2)
+        reduce_axis = 2
+    if mode == 'max':
+        return view.max(axis=reduce_axis)
+    return view.mean(axis=reduce_axis, dtype=np.float32)
+
+
+def _halvings(size: int, minimum: int) -> int:
+    """Сколько раз можно уполовинить size, не опустившись ниже minimum."""
+    count = 0
+    while size >> (count + 1) >= minimum:
+        count += 1
+    return count
+
+
+class WaterfallPyramid:
+    def __init__(self, recording: SpectrumRecording, min_rows: int = 64, min_bins: int = 64,
+                 block_rows: int = 2048):
+        self.recording = recording
+        self.min_rows = min_rows
+        self.min_bins = min_bins
+        self.block_rows = block_rows
+        # Пирамида строится по начальным сегментам с одной сеткой частот
+        first = recording.segments[0]
+        rows = 0
+        self.segments = []
+        for segment in recording.segments:
+            if segment.bins != first.bins or segment.freqs[0] != first.freqs[0] or segment.freqs[-1] != first.freqs[-1]:
+                logger.warning(f"{segment.path}: другая сетка частот — сегмент не входит в пирамиду")
+                break
+            rows += segment.rows
+            self.segments.append(segment)
+        self.rows = rows
+        self.bins = first.bins
+        self.base_freqs = np.array(first.freqs)
+        self.base_times = recording.timestamps()[:rows]
+        self.time_levels = _halvings(rows, min_rows)
+        self.freq_levels = _halvings(self.bins, min_bins)
+        self.levels = {}  # (t, f) -> {'max': ndarray, 'mean': ndarray}, кроме исходного (0, 0)
+
+    @property
+    def depth(self) -> int:
+        """Число уровней, включая исходный (0, 0)."""
+        return (self.time_levels + 1) * (self.freq_levels + 1)
+
+    def _cache_path(self, level: Tuple[int, int], mode: str) -> str:
+        t, f = level
+        return f"{self.recording.base_path}_pyramid_T{t}_F{f}_{mode}.npy"
+
+    def _sidecar_path(self) -> str:
+        return f"{self.recording.base_path}_pyramid.json"
+
+    def _signature(self) -> dict:
+        """Описание источника, по которому построен кеш."""
+        segments = []
+        for segment in self.segments:
+            stat = os.stat(segment.path)
+            segments.append([os.path.basename(segment.path), segment.rows, stat.st_size, stat.st_mtime_ns])
+        return {'rows': self.rows, 'bins': self.bins, 'min_rows': self.min_rows,
+                'min_bins': self.min_bins, 'segments': segments}
+
+    def _cache_valid(self, signature: dict) -> bool:
+        try:
+            with open(self._sidecar_path(), encoding='utf-8') as f:
+                return json.load(f) == signature
+        except (OSError, ValueError):
+            return False
+
+    def _source(self, level: Tuple[int, int], mode: str, start: int, stop: int) -> np.ndarray:
+        if level == (0, 0):
+            return self.recording.rows(start, stop)
+        return self.levels[level][mode][start:stop]
+
+    def build(self, progress: Optional[Callable[[float], None]] = None):
+        """Построить (или открыть из кеша) все уровни. progress(доля) вызывается по ходу."""
+        self.levels = {}
+        total = max(self.depth - 1, 1)
+        done = 0
+        signature = self._signature()
+        cache_valid = self._cache_valid(signature)
+        if not cache_valid and os.path.exists(self._sidecar_path()):
+            # Источник изменился: описание снимается до перестройки, чтобы прерванная
+            # перестройка не оставила старое описание рядом с новыми уровнями
+            os.remove(self._sidecar_path())
+        for t in range(self.time_levels + 1):
+            for f in range(self.freq_levels + 1):
+                if t == 0 and f == 0:
+                    continue
+                level = (t, f)
+                shape = self.shape(level)
+                arrays = {}
+                for mode in MODES:
+                    path = self._cache_path(level, mode)
+                    if cache_valid and os.path.exists(path):
+                        arr = np.load(path, mmap_mode='r')
+                        if arr.shape == shape:
+                            arrays[mode] = arr
+                if len(arrays) != len(MODES):
+                    # Из соседа, сжатого на шаг меньше: по времени, а в строке t = 0 — по частоте
+                    if t > 0:
+                        arrays = self._build_level(level, (t - 1, f), TIME)
+                    else:
+                        arrays = self._build_level(level, (0, f - 1), FREQ)
+                self.levels[level] = arrays
+                done += 1
+                if progress is not None:
+                    progress(done / total)
+        if not cache_valid:
+            tmp = self._sidecar_path() + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(signature, f)
+            os.replace(tmp, self._sidecar_path())
+        logger.info(f"Пирамида водопада: {self.time_levels + 1}×{self.freq_levels + 1} уровней "
+                    f"(время × частота), исходно {self.rows}×{self.bins}")
+
+    def _build_level(self, level: Tuple[int, int], parent: Tuple[int, int], axis: int) -> dict:
+        rows, bins = self.shape(level)
+        arrays = {}
+        for mode in MODES:
+            # Во временный файл: open_memmap сразу создаёт файл полного размера,
+            # и прерванная сборка не должна выглядеть готовым уровнем
+            arrays[mode] = open_memmap(self._cache_path(level, mode) + ".tmp", mode='w+',
+                                       dtype=np.float32, shape=(rows, bins))
+        # По времени блок исходных строк вдвое длиннее блока результата
+        ratio = 2 if axis == TIME else 1
+        step = self.block_rows * ratio
+        for src_start in range(0, rows * ratio, step):
+            src_stop = min(src_start + step, rows * ratio)
+            dst = slice(src_start // ratio, src_stop // ratio)
+            if parent == (0, 0):
+                # Исходные строки читаются один раз на оба режима
+                block = self._source(parent, 'max', src_start, src_stop)
+                for mode in MODES:
+                    arrays[mode][dst] = _decimate_block(block, mode, axis)[:, :bins]
+            else:
+                for mode in MODES:
+                    block = self._source(parent, mode, src_start, src_stop)
+                    arrays[mode][dst] = _decimate_block(block, mode, axis)[:, :bins]
+        for arr in arrays.values():
+            arr.flush()
+        del arr
+        arrays.clear()  # отображения закрываются до переименования (Windows)
+        for mode in MODES:
+            path = self._cache_path(level, mode)
+            os.replace(path + ".tmp", path)
+            arrays[mode] = np.load(path, mmap_mode='r')
+        return arrays
+
+    def level_for(self, rows_visible: float, bins_visible: float, height_px: int, width_px: int) -> Tuple[int, int]:
+        """Самый детальный уровень по каждой оси, на котором видимая область не больше экрана."""
+        def shift(visible, pixels, limit):
+            ratio = max(visible / max(pixels, 1), 1.0)
+            return min(int(math.ceil(math.log2(ratio))), limit)
+        return (shift(rows_visible, height_px, self.time_levels),
+                shift(bins_visible, width_px, self.freq_levels))
+
+    def freqs(self, level: Tuple[int, int]) -> np.ndarray:
+        f = level[1]
+        factor = 1 << f
+        bins = self.bins >> f
+        return self.base_freqs[:bins * factor].reshape(bins, factor).mean(axis=1)
+
+    def shape(self, level: Tuple[int, int]):
+        t, f = level
+        return self.rows >> t, self.bins >> f
+
+    def region(self, level: Tuple[int, int], mode: str, row0: int, row1: int, bin0: int, bin1: int):
+        """
+        Область уровня level = (t, f), заданная в координатах исходной записи (строки/бины (0, 0)).
+        :return: (массив, (row0, row1, bin0, bin1)) — фактические границы в исходных координатах
+        """
+        t, f = level
+        rows, bins = self.shape(level)
+        r0, r1 = max(row0 >> t, 0), min(-(-row1 >> t), rows)
+        b0, b1 = max(bin0 >> f, 0), min(-(-bin1 >> f), bins)
+        if r0 >= r1 or b0 >= b1:
+            return None, None
+        if level == (0, 0):
+            data = self.recording.rows(r0, r1)[:, b0:b1]
+        else:
+            data = self.levels[level][mode][r0:r1, b0:b1]
+        return data, (r0 << t, r1 << t, b0 << f, b1 << f)
@@ -1,29 +1,35 @@
 """
 Инициализация модуля графического интерфейса.
 Позволяет импортировать классы GUI из gui/ через 'from gui import *'
+
+Виджеты и диалоги загружаются при первом обращении к имени (PEP 562):
+`import gui.main_window` не должен тянуть за собой все диалоги.
 """
 
-# Импорт основных виджетов
-from .main_window import MainWindow
-from .spectrum_plot import SpectrumPlotWidget
-from .waterfall_plot import WaterfallPlotWidget
-from .peaks_table import PeaksTableWidget
-from .settings_dialog import SettingsDialog
-from .colors_dialog import ColorsDialog
-from .smoothing_dialog import SmoothingDialog
-from .persistence_dialog import PersistenceDialog
-from .baseline_dialog import BaselineDialog
-from .iq_record_dialog import IQRecordDialog
+import importlib
+
+_EXPORTS = {
+    'MainWindow': '.main_window',
+    'SpectrumPlotWidget': '.spectrum_plot',
+    'WaterfallPlotWidget': '.waterfall_plot',
+    'PeaksTableWidget': '.peaks_table',
+    'SettingsDialog': '.settings_dialog',
+    'ColorsDialog': '.colors_dialog',
+    'SmoothingDialog': '.smoothing_dialog',
+    'PersistenceDialog': '.persistence_dialog',
+    'BaselineDialog': '.baseline_dialog',
+    'IQRecordDialog': '.iq_record_dialog',
+    'RenderScheduler': '.render_scheduler',
+    'HistoryWaterfallWidget': '.history_waterfall',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'MainWindow',
-    'SpectrumPlotWidget',
-    'WaterfallPlotWidget',
-    'PeaksTableWidget',
-    'SettingsDialog',
-    'ColorsDialog',
-    'SmoothingDialog',
-    'PersistenceDialog',
-    'BaselineDialog',
-    'IQRecordDialog'
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
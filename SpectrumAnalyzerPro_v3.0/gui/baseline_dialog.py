@@ -1,19 +1,29 @@
 """
-Диалог загрузки базовой линии.
-Аналог qspectrumanalyzer.QSpectrumAnalyzerBaseline.
+Диалог базовой линии.
+Аналог qspectrumanalyzer.QSpectrumAnalyzerBaseline: файл CSV (интерполируется на
+текущую сетку) или живая базовая линия — процентиль последних свипов по каждому бину.
 """
 
 import os
-from PyQt5.QtWidgets import QDialog, QLineEdit, QToolButton, QFileDialog, QFormLayout, QDialogButtonBox
+from PyQt5.QtWidgets import (QDialog, QLineEdit, QToolButton, QFileDialog, QFormLayout, QDialogButtonBox,
+                             QHBoxLayout, QComboBox, QDoubleSpinBox, QSpinBox, QCheckBox)
+
+BASELINE_MODES = ["off", "file", "live"]
+
 
 class BaselineDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Базовая линия — SpectrumAnalyzer Pro v3.0")
-        self.resize(500, 100)
+        self.resize(500, 180)
 
         layout = QFormLayout()
 
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Выключена", "Из файла", "Живая (процентиль)"])
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        layout.addRow("&Режим:", self.mode_combo)
+
         self.file_edit = QLineEdit()
         self.file_button = QToolButton()
         self.file_button.setText("...")
@@ -23,6 +33,19 @@ class BaselineDialog(QDialog):
         file_layout.addWidget(self.file_button)
         layout.addRow("&Файл базовой линии:", file_layout)
 
+        self.percentile_spin = QDoubleSpinBox()
+        self.percentile_spin.setRange(1, 99)
+        self.percentile_spin.setSuffix(" %")
+        layout.addRow("&Процентиль:", self.percentile_spin)
+
+        self.window_spin = QSpinBox()
+        self.window_spin.setRange(10, 100000)
+        self.window_spin.setSuffix(" свипов")
+        layout.addRow("&Окно:", self.window_spin)
+
+        self.subtract_check = QCheckBox("Вычитать из спектра")
+        layout.addRow(self.subtract_check)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -35,7 +58,21 @@ class BaselineDialog(QDialog):
 
     def load_settings(self):
         settings = self.parent().settings
+        mode = settings.value("baseline_mode", "off")
+        self.mode_combo.setCurrentIndex(BASELINE_MODES.index(mode) if mode in BASELINE_MODES else 0)
         self.file_edit.setText(settings.value("baseline_file", ""))
+        self.percentile_spin.setValue(settings.value("baseline_percentile", 20.0, float))
+        self.window_spin.setValue(settings.value("baseline_window", 500, int))
+        self.subtract_check.setChecked(settings.value("baseline_subtract", True, bool))
+        self.on_mode_changed(self.mode_combo.currentIndex())
+
+    def on_mode_changed(self, index):
+        mode = BASELINE_MODES[index]
+        self.file_edit.setEnabled(mode == "file")
+        self.file_button.setEnabled(mode == "file")
+        self.percentile_spin.setEnabled(mode == "live")
+        self.window_spin.setEnabled(mode == "live")
+        self.subtract_check.setEnabled(mode != "off")
 
     def select_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Выберите файл базовой линии", "", "CSV Files (*.csv);;All Files (*)")
@@ -44,5 +81,9 @@ class BaselineDialog(QDialog):
 
     def accept(self):
         settings = self.parent().settings
+        settings.setValue("baseline_mode", BASELINE_MODES[self.mode_combo.currentIndex()])
         settings.setValue("baseline_file", self.file_edit.text())
+        settings.setValue("baseline_percentile", self.percentile_spin.value())
+        settings.setValue("baseline_window", self.window_spin.value())
+        settings.setValue("baseline_subtract", self.subtract_check.isChecked())
         super().accept()
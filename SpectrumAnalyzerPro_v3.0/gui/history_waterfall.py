@@ -0,0 +1,80 @@
+"""
+Просмотр водопада по долговременной записи.
+Для видимой области берётся уровень пирамиды, соответствующий размеру виджета в
+пикселях по каждой оси, поэтому масштабирование по часам записи не требует передачи миллионов ячеек.
+"""
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel
+from PyQt5.QtCore import QTimer
+from data.waterfall_pyramid import WaterfallPyramid, MODES
+
+
+class HistoryWaterfallWidget(QWidget):
+    """Водопад записи с автоматическим выбором уровня детализации."""
+    def __init__(self, pyramid: WaterfallPyramid, parent=None):
+        super().__init__(parent)
+        self.pyramid = pyramid
+        self.layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Режим:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(MODES)
+        self.mode_combo.currentTextChanged.connect(self.refresh)
+        controls.addWidget(self.mode_combo)
+        self.level_label = QLabel()
+        controls.addWidget(self.level_label)
+        controls.addStretch()
+        self.layout.addLayout(controls)
+
+        self.plot_widget = pg.PlotWidget(title="Waterfall записи")
+        self.plot_widget.setLabel('left', 'Время (свипы от начала записи)')
+        self.plot_widget.setLabel('bottom', 'Частота (МГц)')
+        self.image = pg.ImageItem(axisOrder='row-major')
+        self.image.setLookupTable(pg.colormap.get('viridis').getLookupTable())
+        self.plot_widget.addItem(self.image)
+        self.layout.addWidget(self.plot_widget)
+        self.setLayout(self.layout)
+
+        # Перерисовка после паузы в масштабировании, а не на каждое событие мыши
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(50)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.plot_widget.getViewBox().sigRangeChanged.connect(lambda *_: self.refresh_timer.start())
+
+        freqs = pyramid.base_freqs
+        self.bin_width = (freqs[-1] - freqs[0]) / max(len(freqs) - 1, 1)
+        self.plot_widget.setRange(xRange=(freqs[0], freqs[-1]), yRange=(0, pyramid.rows), padding=0)
+        self.refresh()
+
+    def refresh(self):
+        pyramid = self.pyramid
+        vb = self.plot_widget.getViewBox()
+        (x0, x1), (y0, y1) = vb.viewRange()
+        freqs = pyramid.base_freqs
+        bin0 = int(np.floor((x0 - freqs[0]) / self.bin_width))
+        bin1 = int(np.ceil((x1 - freqs[0]) / self.bin_width)) + 1
+        row0, row1 = int(np.floor(y0)), int(np.ceil(y1))
+        bin0, bin1 = max(bin0, 0), min(bin1, pyramid.bins)
+        row0, row1 = max(row0, 0), min(row1, pyramid.rows)
+        if bin0 >= bin1 or row0 >= row1:
+            return
+
+        rect = vb.sceneBoundingRect()
+        level = pyramid.level_for(row1 - row0, bin1 - bin0, int(rect.height()), int(rect.width()))
+        mode = self.mode_combo.currentText()
+        data, bounds = pyramid.region(level, mode, row0, row1, bin0, bin1)
+        if data is None:
+            return
+        r0, r1, b0, b1 = bounds
+        self.image.setImage(np.asarray(data), autoLevels=False,
+                            levels=self.image.levels if self.image.levels is not None else (-100, -20))
+        self.image.setRect(pg.QtCore.QRectF(
+            freqs[0] + b0 * self.bin_width, r0, (b1 - b0) * self.bin_width, r1 - r0))
+        t, f = level
+        self.level_label.setText(
+            f"Уровень ×{1 << t} по времени, ×{1 << f} по частоте, {data.shape[0]}×{data.shape[1]} ячеек"
+        )
@@ -6,29 +6,24 @@ import threading
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from backend.soapy_power import SoapyPowerThread, SoapyPowerInfo
 from data.data_storage import DataStorage
+from data.sweep_assembler import SweepAssembler
 from gui.spectrum_plot import SpectrumPlotWidget
 from gui.waterfall_plot import WaterfallPlotWidget
 from gui.peaks_table import PeaksTableWidget
-from gui.settings_dialog import SettingsDialog
-from gui.colors_dialog import ColorsDialog
-from gui.smoothing_dialog import SmoothingDialog
-from gui.persistence_dialog import PersistenceDialog
-from gui.baseline_dialog import BaselineDialog
-from gui.iq_record_dialog import IQRecordDialog
+from gui.render_scheduler import RenderScheduler
+from core.tracker import EmitterTracker
 from utils.signal_classifier import SignalClassifier
+from utils.peak_analysis import PeakAnalysisWorker
 from utils.export import export_spectrum, export_csv
 from config import DEVICE_BACKENDS, SOAPY_DEVICES
 from utils.logger import get_logger
-from scipy.signal import find_peaks
-from backend.rtl_power import RtlPowerInfo, RtlPowerThread
-from backend.hackrf_sweep import HackRFSweepInfo, HackRFSweepThread
-from backend.airspy_rx import AirspyRxInfo, AirspyRxThread
 
 logger = get_logger(__name__)
 
 class MainWindow(QMainWindow):
+    peaks_requested = pyqtSignal(dict)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("📡 SpectrumAnalyzer Pro v3.0 — Универсальный SDR-анализатор")
@@ -36,12 +31,28 @@ class MainWindow(QMainWindow):
         self.settings = QSettings("SpectrumLabs", "SpectrumAnalyzerPro")
         self.is_scanning = False
         self.worker_thread = None
+        self.sweep_assembler = None
+        self.spectrum_recorder = None
+        self.alert_monitor = None
         self.data_storage = DataStorage(max_history_size=100)
         self.classifier = SignalClassifier()
+        self.emitter_tracker = EmitterTracker()  # пики между свипами связываются в треки источников
+        self.render_scheduler = RenderScheduler(self.settings.value("render_fps", 30, int), self)
+
+        # Анализ пиков — в отдельном потоке, чтобы не блокировать GUI
+        self._peaks_busy = False
+        self._pending_peaks = None
+        self.peaks_thread = QThread(self)
+        self.peaks_worker = PeakAnalysisWorker(self.classifier)
+        self.peaks_worker.moveToThread(self.peaks_thread)
+        self.peaks_thread.start()
 
         self.init_ui()
         self.load_settings()
         self.connect_signals()
+        if self.settings.value("baseline_mode", "off") != "off":
+            self.apply_baseline_settings()
+        self.apply_smoothing_settings()
 
     def init_ui(self):
         self.create_menu()
@@ -59,6 +70,9 @@ class MainWindow(QMainWindow):
         export_action = QAction("Экспорт графика (PNG)", self)
         export_action.triggered.connect(lambda: export_spectrum(self.spectrum_plot, self))
         file_menu.addAction(export_action)
+        self.record_spectrum_action = QAction("Долговременная запись спектра...", self, checkable=True)
+        self.record_spectrum_action.triggered.connect(self.toggle_spectrum_recording)
+        file_menu.addAction(self.record_spectrum_action)
         file_menu.addSeparator()
         exit_action = QAction("Выход", self)
         exit_action.triggered.connect(self.close)
@@ -68,12 +82,38 @@ class MainWindow(QMainWindow):
         record_iq_action = QAction("Записать IQ сигнал...", self)
         record_iq_action.triggered.connect(self.record_iq_signal)
         analysis_menu.addAction(record_iq_action)
+        history_action = QAction("Просмотр записи (водопад)...", self)
+        history_action.triggered.connect(self.open_recording_waterfall)
+        analysis_menu.addAction(history_action)
+        analysis_menu.addSeparator()
+        self.alerts_action = QAction("Оповещения по правилам...", self, checkable=True)
+        self.alerts_action.triggered.connect(self.toggle_alerts)
+        analysis_menu.addAction(self.alerts_action)
+        self.occupancy_action = QAction("Статистика занятости каналов...", self, checkable=True)
+        self.occupancy_action.triggered.connect(self.toggle_occupancy)
+        analysis_menu.addAction(self.occupancy_action)
+        export_occupancy_action = QAction("Экспорт статистики занятости...", self)
+        export_occupancy_action.triggered.connect(self.export_occupancy)
+        analysis_menu.addAction(export_occupancy_action)
+        export_tracks_action = QAction("Экспорт треков источников...", self)
+        export_tracks_action.triggered.connect(self.export_tracks)
+        analysis_menu.addAction(export_tracks_action)
+        baseline_action = QAction("Базовая линия...", self)
+        baseline_action.triggered.connect(self.open_baseline)
+        analysis_menu.addAction(baseline_action)
 
         view_menu = menubar.addMenu("Вид")
         self.toggle_waterfall_action = QAction("Режим Waterfall", self, checkable=True)
         self.toggle_waterfall_action.setChecked(True)
         self.toggle_waterfall_action.triggered.connect(self.toggle_waterfall)
         view_menu.addAction(self.toggle_waterfall_action)
+        self.smooth_action = QAction("Сглаживание спектра", self, checkable=True)
+        self.smooth_action.setChecked(self.settings.value("smooth", False, bool))
+        self.smooth_action.triggered.connect(self.toggle_smoothing)
+        view_menu.addAction(self.smooth_action)
+        smoothing_settings_action = QAction("Настройки сглаживания...", self)
+        smoothing_settings_action.triggered.connect(self.open_smoothing)
+        view_menu.addAction(smoothing_settings_action)
 
         help_menu = menubar.addMenu("Справка")
         doc_action = QAction("Документация", self)
@@ -103,6 +143,10 @@ class MainWindow(QMainWindow):
         self.progress_bar.setRange(0, 0)
         self.progress_bar.setVisible(False)
         self.statusBar.addPermanentWidget(self.progress_bar)
+        self.backend_stats_label = QLabel()
+        self.statusBar.addPermanentWidget(self.backend_stats_label)
+        self.render_stats_label = QLabel()
+        self.statusBar.addPermanentWidget(self.render_stats_label)
         self.statusBar.showMessage("Готов к сканированию")
 
     def create_docks(self):
@@ -195,6 +239,24 @@ class MainWindow(QMainWindow):
         cal_group.setLayout(cal_layout)
         self.params_layout.addWidget(cal_group)
 
+        # Воспроизведение записи
+        playback_group = QGroupBox("Воспроизведение")
+        playback_layout = QHBoxLayout()
+        playback_layout.addWidget(QLabel("Скорость:"))
+        self.playback_speed_spin = QDoubleSpinBox()
+        self.playback_speed_spin.setRange(0, 1000)
+        self.playback_speed_spin.setValue(1.0)
+        self.playback_speed_spin.setSuffix("×")
+        self.playback_speed_spin.setToolTip("1 — реальное время, 0 — максимально быстро")
+        self.playback_speed_spin.valueChanged.connect(self.on_playback_speed_changed)
+        playback_layout.addWidget(self.playback_speed_spin)
+        self.playback_slider = QSlider(Qt.Horizontal)
+        self.playback_slider.setRange(0, 1000)
+        self.playback_slider.sliderReleased.connect(self.on_playback_seek)
+        playback_layout.addWidget(self.playback_slider)
+        playback_group.setLayout(playback_layout)
+        self.params_layout.addWidget(playback_group)
+
         self.params_widget.setLayout(self.params_layout)
         self.params_dock.setWidget(self.params_widget)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.params_dock)
@@ -205,7 +267,7 @@ class MainWindow(QMainWindow):
         # Спектр
         self.spectrum_tab = QWidget()
         self.spectrum_plot = SpectrumPlotWidget()
-        self.spectrum_plot.connect_to_data(self.data_storage)
+        self.spectrum_plot.connect_to_data(self.data_storage, self.render_scheduler)
         layout = QVBoxLayout()
         layout.addWidget(self.spectrum_plot)
         self.spectrum_tab.setLayout(layout)
@@ -213,8 +275,8 @@ class MainWindow(QMainWindow):
 
         # Водопад
         self.waterfall_tab = QWidget()
-        self.waterfall_plot = WaterfallPlotWidget()
-        self.waterfall_plot.connect_to_data(self.data_storage)
+        self.waterfall_plot = WaterfallPlotWidget(depth=self.settings.value("waterfall_history_size", 2000, int))
+        self.waterfall_plot.connect_to_data(self.data_storage, self.render_scheduler)
         layout = QVBoxLayout()
         layout.addWidget(self.waterfall_plot)
         self.waterfall_tab.setLayout(layout)
@@ -232,130 +294,308 @@ class MainWindow(QMainWindow):
 
     def connect_signals(self):
         self.spectrum_plot.mouse_moved.connect(self.on_mouse_moved)
-        self.data_storage.data_updated.connect(self.update_peaks)
+        self.render_scheduler.connect(self.data_storage.data_updated, self.update_peaks)
+        self.peaks_requested.connect(self.peaks_worker.analyze)
+        self.peaks_worker.peaks_ready.connect(self.on_peaks_ready)
         self.data_storage.history_updated.connect(self.update_waterfall)
+        self.render_scheduler.stats_updated.connect(self.on_render_stats)
 
     def on_mouse_moved(self, freq_mhz, power_db):
         self.statusBar.showMessage(f"Частота: {freq_mhz:.3f} МГц, Мощность: {power_db:.1f} дБ")
 
+    def on_render_stats(self, stats):
+        self.render_stats_label.setText(
+            f"Кадры: получено {stats['received']}, отрисовано {stats['drawn']}, "
+            f"пропущено {stats['dropped']} ({stats['fps']:.0f} FPS)"
+        )
+
+    def on_backend_stats(self, stats):
+        self.backend_stats_label.setText(
+            f"Буфер: {stats['bytes_buffered']} Б, потеряно записей: {stats['frames_dropped']}"
+        )
+
     def update_peaks(self, data):
-        # Поиск пиков
-        peaks, props = find_peaks(data['y'], height=-60, prominence=5, distance=10)
-        peak_list = []
-        for i, peak in enumerate(peaks):
-            if peak >= len(data['y']) or peak < 0:
-                continue
-            peak_val = data['y'][peak]
-            half_height = peak_val - (peak_val + 60) / 2
-            left = peak
-            while left > 0 and data['y'][left] > half_height:
-                left -= 1
-            right = peak
-            while right < len(data['y'])-1 and data['y'][right] > half_height:
-                right += 1
-            width_mhz = (data['x'][right] - data['x'][left]) if right > left else 0
-            if width_mhz < 0.01:
-                continue
-            modulation = self.classifier.detect_modulation_around_peak(data['y'], peak)
-            signal_type = self.classifier.classify_signal(modulation, width_mhz)
-            peak_list.append({
-                "Частота (МГц)": data['x'][peak],
-                "Амплитуда (дБ)": peak_val,
-                "Левая гр.": data['x'][left],
-                "Правая гр.": data['x'][right],
-                "Ширина (МГц)": width_mhz,
-                "Модуляция": modulation,
-                "Тип": signal_type
-            })
-        self.peaks_table.update_table(peak_list)
+        """Отправить кадр на анализ пиков; пока воркер занят, хранится только последний кадр."""
+        if self._peaks_busy:
+            self._pending_peaks = data
+            return
+        self._peaks_busy = True
+        self.peaks_requested.emit(data)
+
+    def on_peaks_ready(self, peaks):
+        self.emitter_tracker.update(peaks)  # заполняет номер трека и время в эфире
+        self.peaks_table.update_table(peaks)
+        self._peaks_busy = False
+        if self._pending_peaks is not None:
+            data, self._pending_peaks = self._pending_peaks, None
+            self.update_peaks(data)
 
     def update_waterfall(self, data_storage):
         pass  # Водопад сам обновляется через сигнал
 
-def start_scan(self):
-    if self.is_scanning:
-        return
-    self.is_scanning = True
-    self.start_action.setEnabled(False)
-    self.stop_action.setEnabled(True)
-    self.progress_bar.setVisible(True)
-    self.statusBar.showMessage("Сканирование...")
-
-    start = self.start_freq_entry.value()
-    end = self.end_freq_entry.value()
-    step = self.step_entry.value()
-    gain = self.gain_entry.value()
-    interval = self.interval_entry.value()
-    device = self.device_combo.currentText()
-    soapy_device = self.soapy_device_combo.currentText()
-
-    # Импорты (добавьте в начало main_window.py)
-    from backend.rtl_power import RtlPowerInfo, RtlPowerThread
-    from backend.hackrf_sweep import HackRFSweepInfo, HackRFSweepThread
-    from backend.airspy_rx import AirspyRxInfo, AirspyRxThread
-
-    if device == "soapy_power":
-        self.worker_thread = SoapyPowerThread(
-            start_freq=start,
-            end_freq=end,
-            step=step,
-            gain=gain,
-            interval=interval,
-            device=soapy_device,
-            sample_rate=2560000,
-            ppm=0,
-            lnb_lo=self.calibration_entry.value()
-        )
-    elif device == "rtl_power":
-        self.worker_thread = RtlPowerThread(
-            start_freq=start,
-            end_freq=end,
-            step=step,
-            gain=gain,
-            interval=interval,
-            device="",
-            sample_rate=2e6,
-            ppm=0,
-            lnb_lo=self.calibration_entry.value()
-        )
-    elif device == "hackrf_sweep":
-        lna_gain = 16  # По умолчанию из config.py
-        self.worker_thread = HackRFSweepThread(
-            start_freq=start,
-            end_freq=end,
-            step=step,
-            gain=gain,
-            interval=interval,
-            device="",
-            sample_rate=20e6,
-            ppm=0,
-            lnb_lo=self.calibration_entry.value(),
-            lna_gain=lna_gain
-        )
-    elif device == "airspy_rx":
-        self.worker_thread = AirspyRxThread(
-            start_freq=start,
-            end_freq=end,
-            step=step,
-            gain=gain,
-            interval=interval,
-            device="",
-            sample_rate=2.5e6,
-            ppm=0,
-            lnb_lo=self.calibration_entry.value()
-        )
-    else:
-        QMessageBox.critical(self, "Ошибка", f"Неизвестный бэкенд: {device}")
-        self.on_scan_finished()
-        return
+    def start_scan(self):
+        if self.is_scanning:
+            return
+        self.is_scanning = True
+        self.start_action.setEnabled(False)
+        self.stop_action.setEnabled(True)
+        self.progress_bar.setVisible(True)
+        self.statusBar.showMessage("Сканирование...")
+
+        start = self.start_freq_entry.value()
+        end = self.end_freq_entry.value()
+        step = self.step_entry.value()
+        gain = self.gain_entry.value()
+        interval = self.interval_entry.value()
+        device = self.device_combo.currentText()
+        soapy_device = self.soapy_device_combo.currentText()
+
+        # Модуль бэкенда импортируется только при выборе устройства — быстрый старт GUI
+        if device == "soapy_power":
+            from backend.soapy_power import SoapyPowerThread
+            self.worker_thread = SoapyPowerThread(
+                start_freq=start,
+                end_freq=end,
+                step=step,
+                gain=gain,
+                interval=interval,
+                device=soapy_device,
+                sample_rate=2560000,
+                ppm=0,
+                lnb_lo=self.calibration_entry.value()
+            )
+        elif device == "rtl_power":
+            from backend.rtl_power import RtlPowerThread
+            self.worker_thread = RtlPowerThread(
+                start_freq=start,
+                end_freq=end,
+                step=step,
+                gain=gain,
+                interval=interval,
+                device="",
+                sample_rate=2e6,
+                ppm=0,
+                lnb_lo=self.calibration_entry.value()
+            )
+        elif device == "hackrf_sweep":
+            from backend.hackrf_sweep import HackRFSweepThread
+            lna_gain = 16  # По умолчанию из config.py
+            self.worker_thread = HackRFSweepThread(
+                start_freq=start,
+                end_freq=end,
+                step=step,
+                gain=gain,
+                interval=interval,
+                device="",
+                sample_rate=20e6,
+                ppm=0,
+                lnb_lo=self.calibration_entry.value(),
+                lna_gain=lna_gain
+            )
+        elif device == "airspy_rx":
+            from backend.airspy_rx import AirspyRxThread
+            self.worker_thread = AirspyRxThread(
+                start_freq=start,
+                end_freq=end,
+                step=step,
+                gain=gain,
+                interval=interval,
+                device="",
+                sample_rate=2.5e6,
+                ppm=0,
+                lnb_lo=self.calibration_entry.value()
+            )
+        elif device == "multi":
+            from backend.scan_coordinator import ScanCoordinator, parse_device_list
+            try:
+                devices = parse_device_list(self.settings.value("scan_devices", ""))
+                self.worker_thread = ScanCoordinator(
+                    devices,
+                    start_freq=start,
+                    end_freq=end,
+                    step=step,
+                    gain=gain,
+                    interval=interval,
+                    lnb_lo=self.calibration_entry.value()
+                )
+            except ValueError as e:
+                QMessageBox.critical(self, "Ошибка", f"Мультискан: {e}\nЗадайте устройства в настройках.")
+                self.on_scan_finished()
+                return
+        elif device == "playback":
+            from backend.playback import PlaybackThread
+            path, _ = QFileDialog.getOpenFileName(self, "Открыть запись спектра", "", "Spectrum recording (*.sarec)")
+            if not path:
+                self.on_scan_finished()
+                return
+            self.worker_thread = PlaybackThread(
+                start_freq=start,
+                end_freq=end,
+                step=step,
+                gain=gain,
+                interval=interval,
+                device=path,
+                lnb_lo=self.calibration_entry.value(),
+                speed=self.playback_speed_spin.value()
+            )
+        else:
+            QMessageBox.critical(self, "Ошибка", f"Неизвестный бэкенд: {device}")
+            self.on_scan_finished()
+            return
+
+        self.data_storage.reset()
+        self.emitter_tracker.reset()
+        if self.alert_monitor is not None:
+            self.alert_monitor.reset()
+        if device in ("playback", "multi"):
+            # В записи и у координатора мультискана уже полные свипы
+            self.sweep_assembler = None
+            self.worker_thread.data_updated.connect(self.on_frame)
+        else:
+            # Сегменты бэкенда собираются в полный свип до попадания в хранилище
+            lnb_lo = self.calibration_entry.value()
+            self.sweep_assembler = SweepAssembler(start + lnb_lo, end + lnb_lo)
+            self.sweep_assembler.data_updated.connect(self.on_frame)
+            self.worker_thread.data_updated.connect(self.sweep_assembler.update)
+            # До on_scan_finished: последний проход (rtl_power -1 — единственный) не теряется
+            self.worker_thread.scan_finished.connect(self.sweep_assembler.flush)
+
+        # Подключаем сигналы
+        self.worker_thread.log_message.connect(self.log_message)
+        self.worker_thread.stats_updated.connect(self.on_backend_stats)
+        self.render_scheduler.reset_stats()
+        self.worker_thread.scan_finished.connect(self.on_scan_finished)
+
+        self.worker_thread.start()
+
+    def on_frame(self, sweep):
+        """Полный свип: в хранилище и, если включена, в долговременную запись."""
+        if self.spectrum_recorder is not None:
+            self.spectrum_recorder.record(sweep)
+        self.data_storage.update(sweep)
+
+    def toggle_spectrum_recording(self, checked):
+        if not checked:
+            if self.spectrum_recorder is not None:
+                self.log_message(f"[INFO] Запись спектра остановлена: {self.spectrum_recorder.rows_written} свипов")
+                self.spectrum_recorder.close()
+                self.spectrum_recorder = None
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Базовое имя файлов записи", "", "Spectrum recording (*.sarec)")
+        if not path:
+            self.record_spectrum_action.setChecked(False)
+            return
+        if path.endswith(".sarec"):
+            path = path[:-len(".sarec")]
+        from core.spectrum_recorder import SpectrumRecorder
+        self.spectrum_recorder = SpectrumRecorder(path)
+        self.log_message(f"[INFO] Запись спектра: {path}_NNNN.sarec")
+
+    def toggle_alerts(self, checked):
+        """Включить проверку правил оповещений (JSON) для каждого свипа."""
+        if not checked:
+            if self.alert_monitor is not None:
+                self.data_storage.history_updated.disconnect(self.alert_monitor.on_sweep)
+                self.alert_monitor.close()
+                self.log_message(f"[INFO] Оповещения выключены, событий: {self.alert_monitor.events}")
+                self.alert_monitor = None
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Файл правил оповещений",
+                                              self.settings.value("alert_rules", ""), "JSON (*.json)")
+        if not path:
+            self.alerts_action.setChecked(False)
+            return
+        from utils.alert_monitor import AlertMonitor
+        store_path = self.settings.value("alert_store", "") or os.path.splitext(path)[0] + "_events.sqlite"
+        try:
+            self.alert_monitor = AlertMonitor.from_file(path, store_path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить правила: {e}")
+            self.alerts_action.setChecked(False)
+            return
+        self.settings.setValue("alert_rules", path)
+        self.alert_monitor.alert.connect(self.on_alert)
+        self.data_storage.history_updated.connect(self.alert_monitor.on_sweep)
+        self.log_message(f"[INFO] Правил оповещений: {len(self.alert_monitor.engine.rules)}, события: {store_path}")
+
+    def toggle_occupancy(self, checked):
+        """Накопление занятости по бинам; порог спрашивается при включении."""
+        if not checked:
+            self.data_storage.set_occupancy(False)
+            self.log_message("[INFO] Статистика занятости выключена")
+            return
+        threshold, ok = QInputDialog.getDouble(self, "Статистика занятости", "Порог занятости, дБ:",
+                                               self.settings.value("occupancy_threshold", -70.0, float),
+                                               -150, 50, 1)
+        if not ok:
+            self.occupancy_action.setChecked(False)
+            return
+        self.settings.setValue("occupancy_threshold", threshold)
+        self.data_storage.set_occupancy(True, threshold_db=threshold)
+        self.log_message(f"[INFO] Статистика занятости: порог {threshold:.1f} дБ")
+
+    def export_occupancy(self):
+        stats = self.data_storage.occupancy
+        if stats is None or stats.sweeps == 0:
+            QMessageBox.information(self, "Статистика занятости", "Нет накопленной статистики.")
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Экспорт статистики занятости", "",
+            "Сводка CSV (*.csv);;Сводка Parquet (*.parquet);;Тепловая карта PNG (*.png);;Тепловая карта CSV (*.csv)")
+        if not path:
+            return
+        try:
+            if selected.startswith("Тепловая карта PNG"):
+                stats.heatmap_to_png(path)
+            elif selected.startswith("Тепловая карта CSV"):
+                stats.heatmap_to_csv(path)
+            elif selected.startswith("Сводка Parquet"):
+                stats.to_parquet(path)
+            else:
+                stats.to_csv(path)
+        except (OSError, ValueError, RuntimeError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Экспорт не удался: {e}")
+            return
+        self.log_message(f"[INFO] Статистика занятости ({stats.sweeps} свипов) сохранена: {path}")
+
+    def export_tracks(self):
+        tracker = self.emitter_tracker
+        if len(tracker) == 0:
+            QMessageBox.information(self, "Треки источников", "Нет обнаруженных источников.")
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Экспорт треков источников", "", "Сводка CSV (*.csv);;Сводка Parquet (*.parquet)")
+        if not path:
+            return
+        try:
+            if selected.startswith("Сводка Parquet"):
+                tracker.to_parquet(path)
+            else:
+                tracker.to_csv(path)
+        except (OSError, RuntimeError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Экспорт не удался: {e}")
+            return
+        self.log_message(f"[INFO] Треки источников ({len(tracker)}, активных {len(tracker.active)}) сохранены: {path}")
+
+    def on_alert(self, event):
+        from core.alerts import format_event
+        level = "ALERT" if event['state'] == 'raised' else "INFO"
+        self.log_message(f"[{level}] {format_event(event)}")
+
+    def on_playback_speed_changed(self, speed):
+        from backend.playback import PlaybackThread
+        if isinstance(self.worker_thread, PlaybackThread):
+            self.worker_thread.set_speed(speed)
+
+    def on_playback_seek(self):
+        from backend.playback import PlaybackThread
+        worker = self.worker_thread
+        recording = worker.recording if isinstance(worker, PlaybackThread) else None
+        if recording is None or not worker.isRunning():
+            return  # воспроизведение закончилось — запись закрыта
+        fraction = self.playback_slider.value() / self.playback_slider.maximum()
+        worker.seek(recording.start_time + fraction * (recording.end_time - recording.start_time))
 
-    # Подключаем сигналы
-    self.worker_thread.data_updated.connect(self.data_storage.update)
-    self.worker_thread.log_message.connect(self.log_message)
-    self.worker_thread.scan_finished.connect(self.on_scan_finished)
-
-    self.worker_thread.start()
-    
     def stop_scan(self):
         if self.worker_thread:
             self.worker_thread.running = False
@@ -379,13 +619,87 @@ def start_scan(self):
         self.tabs.setCurrentIndex(1 if checked else 0)
 
     def open_settings(self):
+        from gui.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
-        dialog.exec_()
+        if dialog.exec_():
+            self.render_scheduler.set_fps(self.settings.value("render_fps", 30, int))
+            self.waterfall_plot.set_depth(self.settings.value("waterfall_history_size", 2000, int))
+
+    def toggle_smoothing(self, checked):
+        self.settings.setValue("smooth", checked)
+        self.apply_smoothing_settings()
+
+    def open_smoothing(self):
+        from gui.smoothing_dialog import SmoothingDialog
+        dialog = SmoothingDialog(self)
+        if dialog.exec_():
+            self.apply_smoothing_settings()
+
+    def apply_smoothing_settings(self):
+        """Сглаживание из настроек: функция окна выбирает ядро, смена пересчитывает историю."""
+        self.data_storage.set_smooth(
+            self.settings.value("smooth", False, bool),
+            self.settings.value("smooth_length", 11, int),
+            self.settings.value("smooth_window", "hanning"))
+
+    def open_baseline(self):
+        from gui.baseline_dialog import BaselineDialog
+        dialog = BaselineDialog(self)
+        if dialog.exec_():
+            self.apply_baseline_settings()
+
+    def apply_baseline_settings(self):
+        """Режим базовой линии из настроек: off / file / live."""
+        mode = self.settings.value("baseline_mode", "off")
+        subtract = mode != "off" and self.settings.value("baseline_subtract", True, bool)
+        if mode == "live":
+            percentile = self.settings.value("baseline_percentile", 20.0, float)
+            window = self.settings.value("baseline_window", 500, int)
+            self.data_storage.set_live_baseline(True, percentile, window)
+            self.data_storage.set_subtract_baseline(subtract)
+            self.log_message(f"[INFO] Живая базовая линия: P{percentile:g} за {window} свипов")
+            return
+        self.data_storage.set_live_baseline(False)
+        path = self.settings.value("baseline_file", "") if mode == "file" else None
+        try:
+            self.data_storage.set_subtract_baseline(subtract, path)
+        except ValueError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось прочитать базовую линию: {e}")
+            return
+        if path:
+            self.log_message(f"[INFO] Базовая линия из файла: {path}")
 
     def record_iq_signal(self):
+        from gui.iq_record_dialog import IQRecordDialog
         dialog = IQRecordDialog(self)
         dialog.exec_()
 
+    def open_recording_waterfall(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Открыть запись спектра", "", "Spectrum recording (*.sarec)")
+        if not path:
+            return
+        from core.spectrum_recorder import SpectrumRecording
+        from data.waterfall_pyramid import WaterfallPyramid
+        from gui.history_waterfall import HistoryWaterfallWidget
+        try:
+            pyramid = WaterfallPyramid(SpectrumRecording(path))
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось открыть запись: {e}")
+            return
+        progress = QProgressDialog("Построение уровней водопада...", None, 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def on_progress(fraction):
+            progress.setValue(int(fraction * 100))
+            QApplication.processEvents()
+
+        pyramid.build(on_progress)
+        progress.close()
+        widget = HistoryWaterfallWidget(pyramid)
+        self.tabs.setCurrentIndex(self.tabs.addTab(widget, os.path.basename(pyramid.recording.base_path)))
+        self.log_message(f"[INFO] Запись открыта: {pyramid.rows} свипов, {pyramid.depth} уровней детализации")
+
     def show_documentation(self):
         QMessageBox.information(self, "📚 Документация", """
 SpectrumAnalyzer Pro v3.0 — Универсальный SDR-анализатор
@@ -418,6 +732,12 @@ python main.py
 
     def closeEvent(self, event):
         self.stop_scan()
+        if self.spectrum_recorder is not None:
+            self.spectrum_recorder.close()
+        if self.alert_monitor is not None:
+            self.alert_monitor.close()
+        self.peaks_thread.quit()
+        self.peaks_thread.wait(2000)
         self.settings.setValue("window_geometry", self.saveGeometry())
         self.settings.setValue("window_state", self.saveState())
         event.accept()
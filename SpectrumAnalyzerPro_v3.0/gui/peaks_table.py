@@ -1,18 +1,313 @@
 """
 Таблица обнаруженных сигналов.
 Отображает частоты, амплитуды, типы модуляции.
+
+Модель хранит пики структурированным массивом (core.peaks.PEAK_DTYPE) и
+применяет новый свип как разницу с предыдущим: удаляются и вставляются только
+исчезнувшие и новые пики, для остальных — dataChanged по изменившимся ячейкам.
+Фильтр и сортировка — в прокси-модели, таблица не пересоздаётся. Прокси считает
+отображение строк маской и argsort по полю массива один раз за свип (у
+QSortFilterProxyModel каждое сравнение при сортировке — вызов Python) и передаёт
+виду ту же разницу строками, а не сменой раскладки.
 """
 
-import sys
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel, QHBoxLayout, QDoubleSpinBox, QPushButton
-from PyQt5.QtCore import Qt
 import numpy as np
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTableView, QHeaderView, QLabel, QHBoxLayout,
+                             QDoubleSpinBox, QPushButton)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, pyqtSignal
+from core.peaks import PEAK_DTYPE, PEAK_COLUMNS, match_peaks, peaks_from_list
+
+SORT_ROLE = Qt.UserRole  # исходное значение ячейки — для сортировки по числу, а не по тексту
+
+
+def _runs(indices: np.ndarray) -> list:
+    """Непрерывные отрезки возрастающих индексов: [(первый, последний), ...]."""
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) != 1)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class PeaksTableModel(QAbstractTableModel):
+    """
+    Пики одного свипа; строки — по возрастанию частоты.
+    Пока свип применяется, строки — индексы в общем пуле (старый свип + новый):
+    на каждом отрезке удалений и вставок копируется массив индексов, а не записи.
+    """
+    peaks_updated = pyqtSignal()  # свип применён целиком
+    FIELDS = PEAK_DTYPE.names
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._peaks = np.empty(0, dtype=PEAK_DTYPE)
+        self._pool = None   # старый и новый свип подряд — на время set_peaks
+        self._index = None  # строки модели в _pool
+
+    @property
+    def peaks(self) -> np.ndarray:
+        if self._index is not None:
+            return self._pool[self._index]
+        return self._peaks
+
+    def values(self, name: str) -> np.ndarray:
+        """Колонка name по текущим строкам (и посреди set_peaks — без сборки записей)."""
+        if self._index is not None:
+            return self._pool[name][self._index]
+        return self._peaks[name]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._index) if self._index is not None else len(self._peaks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(PEAK_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role not in (Qt.DisplayRole, SORT_ROLE):
+            return None
+        field = self.FIELDS[index.column()]
+        if self._index is not None:
+            value = self._pool[field][self._index[index.row()]]
+        else:
+            value = self._peaks[field][index.row()]
+        if isinstance(value, np.floating):
+            return f"{value:.3f}" if role == Qt.DisplayRole else float(value)
+        if isinstance(value, np.integer):
+            return str(value) if role == Qt.DisplayRole else int(value)
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PEAK_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_peaks(self, peaks: np.ndarray):
+        """Применить новый свип: удаления, вставки, затем dataChanged по изменившимся строкам."""
+        old = self._peaks
+        old_index, new_index = match_peaks(old, peaks)
+        self._pool = np.concatenate((old, peaks))
+        self._index = np.arange(len(old))
+
+        removed = np.ones(len(old), dtype=bool)
+        removed[old_index] = False
+        # С конца — номера ещё не удалённых отрезков не сдвигаются
+        for first, last in reversed(_runs(np.flatnonzero(removed))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._index = np.concatenate((self._index[:first], self._index[last + 1:]))
+            self.endRemoveRows()
+
+        inserted = np.ones(len(peaks), dtype=bool)
+        inserted[new_index] = False
+        # По возрастанию — все строки перед отрезком уже на своих местах
+        for first, last in _runs(np.flatnonzero(inserted)):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._index = np.concatenate((self._index[:first], len(old) + np.arange(first, last + 1),
+                                          self._index[first:]))
+            self.endInsertRows()
+
+        # Строки совпали с новым свипом; значения — ещё старые у сопоставленных пиков
+        previous = self._pool[self._index]
+        self._peaks, self._pool, self._index = peaks, None, None
+        changed = np.column_stack([previous[name] != peaks[name] for name in self.FIELDS])
+        for first, last in _runs(np.flatnonzero(changed.any(axis=1))):
+            columns = np.flatnonzero(changed[first:last + 1].any(axis=0))
+            self.dataChanged.emit(self.index(first, int(columns[0])), self.index(last, int(columns[-1])),
+                                  [Qt.DisplayRole, SORT_ROLE])
+        self.peaks_updated.emit()
+
+
+class PeaksFilterProxy(QAbstractProxyModel):
+    """
+    Фильтр по минимальной амплитуде и ширине и сортировка по колонке над PeaksTableModel.
+    Удаления и вставки строк модели переводятся через отображение _rows в удаления и
+    вставки строк прокси, dataChanged — в dataChanged показанных строк. Смена раскладки
+    испускается, только когда меняется порядок оставшихся строк; состав фильтра меняется
+    удалениями и вставками. Выделение живёт на строках модели и поэтому идёт за пиком,
+    сопоставленным match_peaks, даже если его частота сдвинулась.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_amplitude = -50.0
+        self.min_width = 0.01
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self._rows = np.empty(0, dtype=np.intp)   # строки модели в порядке прокси
+        self._dirty = False                       # значения менялись — фильтр и порядок проверяются в конце свипа
+
+    def setSourceModel(self, model: PeaksTableModel):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.dataChanged.connect(self._on_data_changed)
+        model.peaks_updated.connect(self._on_peaks_updated)
+        self._rows = self._mapping()
+        self.endResetModel()
+
+    def set_filter(self, min_amplitude: float, min_width: float):
+        self.min_amplitude = min_amplitude
+        self.min_width = min_width
+        self.refresh()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.refresh()
+
+    def _mapping(self) -> np.ndarray:
+        """Строки модели, прошедшие фильтр, в порядке сортировки."""
+        model = self.sourceModel()
+        rows = np.flatnonzero((model.values('amplitude') >= self.min_amplitude) & (model.values('width') >= self.min_width))
+        if 0 <= self.sort_column < len(PeaksTableModel.FIELDS):
+            keys = model.values(PeaksTableModel.FIELDS[self.sort_column])[rows]
+            order = np.argsort(keys, kind='stable')
+            rows = rows[order[::-1] if self.sort_order == Qt.DescendingOrder else order]
+        return rows
+
+    def refresh(self):
+        """Привести строки прокси к текущему фильтру и сортировке."""
+        if self.sourceModel() is not None:
+            self._apply(self._mapping())
+
+    def _apply(self, target: np.ndarray):
+        """Перейти к отображению target: удаления, при смене порядка — раскладка, затем вставки."""
+        size = max(int(self._rows.max(initial=-1)), int(target.max(initial=-1))) + 1
+        member = np.zeros(size, dtype=bool)
+        member[target] = True
+        # С конца — номера ещё не удалённых отрезков не сдвигаются
+        for first, last in reversed(_runs(np.flatnonzero(~member[self._rows]))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._rows = np.concatenate((self._rows[:first], self._rows[last + 1:]))
+            self.endRemoveRows()
+
+        present = np.zeros(size, dtype=bool)
+        present[self._rows] = True
+        kept = target[present[target]]
+        if not np.array_equal(kept, self._rows):
+            self.layoutAboutToBeChanged.emit()
+            position = np.empty(size, dtype=np.intp)
+            position[kept] = np.arange(len(kept))
+            persistent = self.persistentIndexList()
+            moved = [self.createIndex(int(position[self._rows[index.row()]]), index.column()) for index in persistent]
+            self.changePersistentIndexList(persistent, moved)
+            self._rows = kept
+            self.layoutChanged.emit()
+
+        # По возрастанию — все строки перед отрезком уже на своих местах
+        for first, last in _runs(np.flatnonzero(~present[target])):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._rows = np.concatenate((self._rows[:first], target[first:last + 1], self._rows[first:]))
+            self.endInsertRows()
+
+    # --- сигналы модели ---
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        # Строки модели ещё на месте: из прокси уходят их отображения, порядок прочих не меняется
+        shown = np.flatnonzero((self._rows >= first) & (self._rows <= last))
+        for start, stop in reversed(_runs(shown)):
+            self.beginRemoveRows(QModelIndex(), start, stop)
+            self._rows = np.concatenate((self._rows[:start], self._rows[stop + 1:]))
+            self.endRemoveRows()
+
+    def _on_rows_removed(self, parent, first, last):
+        self._rows[self._rows > last] -= last - first + 1
+
+    def _on_rows_inserted(self, parent, first, last):
+        self._rows[self._rows >= first] += last - first + 1
+        model = self.sourceModel()
+        new = np.arange(first, last + 1)
+        new = new[(model.values('amplitude')[new] >= self.min_amplitude) & (model.values('width')[new] >= self.min_width)]
+        if len(new) == 0:
+            return
+        # Место новых строк — бинарным поиском по ключам показанных (их значения ещё прежние)
+        if 0 <= self.sort_column < len(PeaksTableModel.FIELDS):
+            keys = model.values(PeaksTableModel.FIELDS[self.sort_column])
+            order = np.argsort(keys[new], kind='stable')
+            shown = keys[self._rows]
+            if self.sort_order == Qt.DescendingOrder:
+                new = new[order[::-1]]
+                position = len(shown) - np.searchsorted(shown[::-1], keys[new], side='left')
+            else:
+                new = new[order]
+                position = np.searchsorted(shown, keys[new], side='right')
+        else:
+            position = np.searchsorted(self._rows, new)
+        position = position + np.arange(len(new))  # номера строк прокси после всех вставок
+        # По возрастанию — все строки перед отрезком уже на своих местах
+        offset = 0
+        for start, stop in _runs(position):
+            count = stop - start + 1
+            self.beginInsertRows(QModelIndex(), start, stop)
+            self._rows = np.concatenate((self._rows[:start], new[offset:offset + count], self._rows[start:]))
+            self.endInsertRows()
+            offset += count
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        shown = np.flatnonzero((self._rows >= top_left.row()) & (self._rows <= bottom_right.row()))
+        if len(shown):
+            self.dataChanged.emit(self.index(int(shown[0]), top_left.column()),
+                                  self.index(int(shown[-1]), bottom_right.column()), list(roles))
+        self._dirty = True
+
+    def _on_peaks_updated(self):
+        # Новые значения могут сдвинуть строки через порог фильтра или по ключу сортировки
+        if self._dirty:
+            self._dirty = False
+            self.refresh()
+
+    # --- интерфейс модели ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(PEAK_COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) > 0
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._rows) and 0 <= column < len(PEAK_COLUMNS)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def sibling(self, row, column, index):
+        return self.index(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return QModelIndex()
+        return self.sourceModel().index(int(self._rows[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        rows = np.flatnonzero(self._rows == source_index.row())
+        return self.createIndex(int(rows[0]), source_index.column()) if len(rows) else QModelIndex()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return section + 1 if role == Qt.DisplayRole else None
+
 
 class PeaksTableWidget(QWidget):
     def __init__(self, classifier, parent=None):
         super().__init__(parent)
         self.classifier = classifier
-        self.peaks_df = None
 
         layout = QVBoxLayout()
 
@@ -34,21 +329,18 @@ class PeaksTableWidget(QWidget):
 
         layout.addLayout(filter_layout)
 
-        # Таблица
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(7)
-        self.table_widget.setHorizontalHeaderLabels([
-            "Частота (МГц)", "Амплитуда (дБ)", "Левая гр.", "Правая гр.", "Ширина (МГц)", "Модуляция", "Тип"
-        ])
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, 1)  # Растягиваем по содержимому
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, 1)
-        self.table_widget.horizontalHeader().setSectionResizeMode(2, 1)
-        self.table_widget.horizontalHeader().setSectionResizeMode(3, 1)
-        self.table_widget.horizontalHeader().setSectionResizeMode(4, 1)
-        self.table_widget.horizontalHeader().setSectionResizeMode(5, 1)
-        self.table_widget.horizontalHeader().setSectionResizeMode(6, 1)
-        self.table_widget.cellDoubleClicked.connect(self.on_peak_double_click)
-        layout.addWidget(self.table_widget)
+        # Таблица: модель -> прокси (фильтр, сортировка) -> вид
+        self.model = PeaksTableModel(self)
+        self.proxy = PeaksFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(0, Qt.AscendingOrder)
+        self.table_view.verticalHeader().hide()
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_view.doubleClicked.connect(self.on_peak_double_click)
+        layout.addWidget(self.table_view)
 
         # Кнопка "Пересчитать"
         self.recalc_button = QPushButton("🔄 Пересчитать")
@@ -56,40 +348,21 @@ class PeaksTableWidget(QWidget):
         layout.addWidget(self.recalc_button)
 
         self.setLayout(layout)
-
-    def update_table(self, peak_list: list):
-        """Обновить таблицу на основе списка пиков."""
-        self.peaks_df = peak_list
         self.update_display()
 
+    def update_table(self, peaks):
+        """Обновить таблицу: массив PEAK_DTYPE (или список словарей, как от analyze_peaks)."""
+        if not isinstance(peaks, np.ndarray):
+            peaks = peaks_from_list(peaks)
+        self.model.set_peaks(peaks)
+
     def update_display(self):
-        """Применить фильтры и обновить таблицу."""
-        if not self.peaks_df:
-            self.table_widget.setRowCount(0)
-            return
+        """Применить фильтры из спинбоксов."""
+        self.proxy.set_filter(self.min_amp_spin.value(), self.min_width_spin.value())
 
-        filtered = [
-            p for p in self.peaks_df
-            if p["Амплитуда (дБ)"] >= self.min_amp_spin.value() and
-               p["Ширина (МГц)"] >= self.min_width_spin.value()
-        ]
-
-        self.table_widget.setRowCount(len(filtered))
-        for row, peak in enumerate(filtered):
-            for col, key in enumerate([
-                "Частота (МГц)", "Амплитуда (дБ)", "Левая гр.", "Правая гр.",
-                "Ширина (МГц)", "Модуляция", "Тип"
-            ]):
-                value = peak[key]
-                text = f"{value:.3f}" if isinstance(value, float) else str(value)
-                item = QTableWidgetItem(text)
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table_widget.setItem(row, col, item)
-
-    def on_peak_double_click(self, row, col):
+    def on_peak_double_click(self, index):
         """Обработка двойного клика по пике."""
-        freq_item = self.table_widget.item(row, 0)
-        if freq_item:
-            freq = freq_item.text()
-            # Можно добавить логику переключения на эту частоту
-            print(f"Двойной клик на пике: {freq} МГц")
+        row = self.proxy.mapToSource(index).row()
+        freq = self.model.values('freq')[row]
+        # Можно добавить логику переключения на эту частоту
+        print(f"Двойной клик на пике: {freq:.3f} МГц")
@@ -0,0 +1,104 @@
+"""
+Планировщик отрисовки: объединяет кадры между перерисовками.
+Сигналы хранилища приходят на каждый свип, а виджеты перерисовываются
+с фиксированной целевой частотой — только по последнему кадру, устаревшие отбрасываются.
+"""
+
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class _Channel:
+    """Один источник кадров и его обработчик отрисовки."""
+    __slots__ = ('slot', 'pending', 'has_pending', 'received', 'drawn', 'dropped')
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.pending = None
+        self.has_pending = False
+        self.received = 0
+        self.drawn = 0
+        self.dropped = 0
+
+
+class RenderScheduler(QObject):
+    """Вызывает обработчики не чаще target FPS, всегда с самым свежим кадром."""
+    stats_updated = pyqtSignal(dict)  # {'received', 'drawn', 'dropped', 'fps'}
+
+    STATS_INTERVAL = 1.0
+
+    def __init__(self, fps: int = 30, parent=None):
+        super().__init__(parent)
+        self.channels = []
+        self.primary = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_tick)
+        self.set_fps(fps)
+        self._last_stats_time = time.monotonic()
+        self._last_stats_drawn = 0
+
+    def set_fps(self, fps: int):
+        self.fps = max(1, int(fps))
+        self.timer.setInterval(int(1000 / self.fps))
+
+    def connect(self, signal, slot, primary: bool = False):
+        """
+        Подключить сигнал через планировщик.
+        :param primary: по этому каналу считаются счётчики кадров для строки состояния
+        """
+        channel = _Channel(slot)
+        self.channels.append(channel)
+        if primary or self.primary is None:
+            self.primary = channel
+        signal.connect(lambda payload, ch=channel: self._submit(ch, payload))
+        return channel
+
+    def _submit(self, channel: _Channel, payload):
+        channel.received += 1
+        if channel.has_pending:
+            channel.dropped += 1  # предыдущий кадр так и не был отрисован
+        channel.pending = payload
+        channel.has_pending = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _on_tick(self):
+        idle = True
+        for channel in self.channels:
+            if not channel.has_pending:
+                continue
+            idle = False
+            payload = channel.pending
+            channel.pending = None
+            channel.has_pending = False
+            channel.slot(payload)
+            channel.drawn += 1
+        if idle:
+            self.timer.stop()  # данных нет — не крутим таймер впустую
+        self._report_stats(force=idle)
+
+    def stats(self) -> dict:
+        ch = self.primary
+        if ch is None:
+            return {'received': 0, 'drawn': 0, 'dropped': 0, 'fps': 0.0}
+        now = time.monotonic()
+        elapsed = max(now - self._last_stats_time, 1e-6)
+        return {
+            'received': ch.received,
+            'drawn': ch.drawn,
+            'dropped': ch.dropped,
+            'fps': (ch.drawn - self._last_stats_drawn) / elapsed,
+        }
+
+    def _report_stats(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_stats_time >= self.STATS_INTERVAL:
+            self.stats_updated.emit(self.stats())
+            self._last_stats_time = now
+            self._last_stats_drawn = self.primary.drawn if self.primary else 0
+
+    def reset_stats(self):
+        for channel in self.channels:
+            channel.received = channel.drawn = channel.dropped = 0
+        self._last_stats_drawn = 0
+        self._last_stats_time = time.monotonic()
@@ -70,12 +70,24 @@ class SettingsDialog(QDialog):
         params_layout.addWidget(self.params_help_button)
         layout.addRow("&Additional parameters:", params_layout)
 
+        # Устройства для мультискана
+        self.scan_devices_edit = QLineEdit()
+        self.scan_devices_edit.setPlaceholderText("rtl_power:0, rtl_power:1, hackrf_sweep:SERIAL*4")
+        self.scan_devices_edit.setToolTip("Бэкенд:устройство[*вес] через запятую; диапазон делится пропорционально весам.")
+        layout.addRow("&Multi-device scan:", self.scan_devices_edit)
+
         # Waterfall history size
         self.waterfall_history_spin = QSpinBox()
-        self.waterfall_history_spin.setRange(10, 1000)
-        self.waterfall_history_spin.setValue(100)
+        self.waterfall_history_spin.setRange(10, 20000)
+        self.waterfall_history_spin.setValue(2000)
         layout.addRow("&Waterfall history size:", self.waterfall_history_spin)
 
+        # Target FPS
+        self.render_fps_spin = QSpinBox()
+        self.render_fps_spin.setRange(1, 120)
+        self.render_fps_spin.setValue(30)
+        layout.addRow("&Target FPS:", self.render_fps_spin)
+
         # Button box
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
@@ -100,7 +112,9 @@ class SettingsDialog(QDialog):
         self.bandwidth_spin.setValue(settings.value("bandwidth", 0.0, float))
         self.lnb_spin.setValue(settings.value("lnb_lo", 0.0, float))
         self.params_edit.setText(settings.value("params", ""))
-        self.waterfall_history_spin.setValue(settings.value("waterfall_history_size", 100, int))
+        self.scan_devices_edit.setText(settings.value("scan_devices", ""))
+        self.waterfall_history_spin.setValue(settings.value("waterfall_history_size", 2000, int))
+        self.render_fps_spin.setValue(settings.value("render_fps", 30, int))
 
     def save_settings(self):
         settings = self.parent().settings
@@ -111,7 +125,9 @@ class SettingsDialog(QDialog):
         settings.setValue("bandwidth", self.bandwidth_spin.value())
         settings.setValue("lnb_lo", self.lnb_spin.value())
         settings.setValue("params", self.params_edit.text())
+        settings.setValue("scan_devices", self.scan_devices_edit.text())
         settings.setValue("waterfall_history_size", self.waterfall_history_spin.value())
+        settings.setValue("render_fps", self.render_fps_spin.value())
 
     def on_backend_changed(self, backend_name):
         info_class = DEVICE_BACKENDS[backend_name][0]
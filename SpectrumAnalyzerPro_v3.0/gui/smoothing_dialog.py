@@ -1,10 +1,12 @@
 """
 Диалог настройки сглаживания.
-Аналог qspectrumanalyzer.QSpectrumAnalyzerSmoothing.
+Аналог qspectrumanalyzer.QSpectrumAnalyzerSmoothing: функция окна задаёт веса точек
+в фильтре Савицкого–Голея (core.smoothing), rectangular — классический фильтр.
 """
 
 from PyQt5.QtWidgets import QDialog, QComboBox, QSpinBox, QFormLayout, QDialogButtonBox
 from PyQt5.QtCore import Qt
+from core.smoothing import SMOOTH_WINDOWS
 
 class SmoothingDialog(QDialog):
     def __init__(self, parent=None):
@@ -15,11 +17,12 @@ class SmoothingDialog(QDialog):
         layout = QFormLayout()
 
         self.window_func_combo = QComboBox()
-        self.window_func_combo.addItems(["rectangular", "hanning", "hamming", "bartlett", "blackman"])
+        self.window_func_combo.addItems(SMOOTH_WINDOWS)
         layout.addRow("&Функция окна:", self.window_func_combo)
 
         self.length_spin = QSpinBox()
         self.length_spin.setRange(3, 101)
+        self.length_spin.setSingleStep(2)  # длина окна нечётная
         self.length_spin.setValue(11)
         layout.addRow("&Длина окна:", self.length_spin)
 
@@ -1,12 +1,22 @@
+"""
+График спектра: текущий свип, среднее, пик-холд макс/мин и базовая линия.
+Каждая кривая рисуется через огибающую мин/макс по пикселям видимого диапазона
+(core.lod), поэтому стоимость перерисовки зависит от ширины виджета, а не от
+числа бинов.
+"""
+
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from PyQt5.QtCore import pyqtSignal
+from core.lod import MinMaxLOD
 from data.data_storage import DataStorage
 
 class SpectrumPlotWidget(QWidget):
     """График мощности с несколькими кривыми."""
     mouse_moved = pyqtSignal(float, float)  # freq_MHz, power_dB
 
+    MIN_LOD_PIXELS = 256  # пока виджет не показан, ширина ещё не известна
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
@@ -23,6 +33,13 @@ class SpectrumPlotWidget(QWidget):
         self.curve_peak_max = self.plot_widget.plot(pen=pg.mkPen('red', width=1), name='Пик-холд макс')
         self.curve_peak_min = self.plot_widget.plot(pen=pg.mkPen('green', width=1), name='Пик-холд мин')
         self.curve_baseline = self.plot_widget.plot(pen=pg.mkPen('magenta', width=1), name='Базовая линия')
+        self._lod = {curve: MinMaxLOD() for curve in (self.curve_main, self.curve_avg, self.curve_peak_max,
+                                                      self.curve_peak_min, self.curve_baseline)}
+
+        # Огибающие пересчитываются при смене видимого диапазона или размера
+        vb = self.plot_widget.getViewBox()
+        vb.sigXRangeChanged.connect(self.on_view_changed)
+        vb.sigResized.connect(self.on_view_changed)
 
         # Кросс-хэр
         self.vLine = pg.InfiniteLine(angle=90, movable=False, pen='gray')
@@ -36,29 +53,62 @@ class SpectrumPlotWidget(QWidget):
         self.layout.addWidget(self.plot_widget)
         self.setLayout(self.layout)
 
-    def connect_to_data(self, data_storage: DataStorage):
-        data_storage.data_updated.connect(self.update_main)
-        data_storage.average_updated.connect(self.update_average)
-        data_storage.peak_hold_max_updated.connect(self.update_peak_max)
-        data_storage.peak_hold_min_updated.connect(self.update_peak_min)
+    def connect_to_data(self, data_storage: DataStorage, scheduler=None):
+        """Подписаться на хранилище; со scheduler кривые перерисовываются с целевым FPS."""
+        if scheduler is None:
+            data_storage.data_updated.connect(self.update_main)
+            data_storage.traces_updated.connect(self.update_traces)
+        else:
+            scheduler.connect(data_storage.data_updated, self.update_main, primary=True)
+            scheduler.connect(data_storage.traces_updated, self.update_traces)
         data_storage.baseline_updated.connect(self.update_baseline)
 
+    def view_params(self):
+        """(x0, x1, пиксели) для огибающих; при автомасштабе по X — весь диапазон данных."""
+        vb = self.plot_widget.getViewBox()
+        (x0, x1), _ = vb.viewRange()
+        if vb.state['autoRange'][0]:
+            # Огибающая по текущему виду сузила бы границы данных, и автомасштаб сжимал бы вид дальше
+            x0, x1 = float('-inf'), float('inf')
+        pixels = int(vb.width() * self.devicePixelRatioF())
+        return x0, x1, max(pixels, self.MIN_LOD_PIXELS)
+
+    def set_curve_data(self, curve, x, y):
+        lod = self._lod[curve]
+        lod.set_data(x, y)
+        lod.set_view(*self.view_params())
+        curve.setData(*lod.render())
+
+    def on_view_changed(self, *args):
+        view = self.view_params()
+        for curve, lod in self._lod.items():
+            if lod.y is not None and lod.set_view(*view):
+                curve.setData(*lod.render())
+
     def update_main(self, data):
-        self.curve_main.setData(data['x'], data['y'])
+        self.set_curve_data(self.curve_main, data['x'], data['y'])
+
+    def update_traces(self, traces):
+        """Все производные кривые из одного снимка DataStorage."""
+        x = traces['x']
+        self.set_curve_data(self.curve_avg, x, traces['average'])
+        self.set_curve_data(self.curve_peak_max, x, traces['peak_hold_max'])
+        self.set_curve_data(self.curve_peak_min, x, traces['peak_hold_min'])
 
     def update_average(self, data):
-        self.curve_avg.setData(data['x'], data['y'])
+        self.set_curve_data(self.curve_avg, data['x'], data['y'])
 
     def update_peak_max(self, data):
-        self.curve_peak_max.setData(data['x'], data['y'])
+        self.set_curve_data(self.curve_peak_max, data['x'], data['y'])
 
     def update_peak_min(self, data):
-        self.curve_peak_min.setData(data['x'], data['y'])
+        self.set_curve_data(self.curve_peak_min, data['x'], data['y'])
 
     def update_baseline(self, data):
         if data['baseline'] is not None:
-            self.curve_baseline.setData(data['baseline_x'], data['baseline'])
+            self.set_curve_data(self.curve_baseline, data['baseline_x'], data['baseline'])
         else:
+            self._lod[self.curve_baseline].clear()
             self.curve_baseline.clear()
 
     def mouse_moved_event(self, evt):
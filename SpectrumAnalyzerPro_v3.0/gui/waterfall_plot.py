@@ -1,27 +1,48 @@
+import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
 from data.data_storage import DataStorage
 
+
 class WaterfallPlotWidget(QWidget):
-    """Водопад со шкалой уровней (HistogramLUT)."""
-    def __init__(self, parent=None):
+    """
+    Водопад со шкалой уровней (HistogramLUT).
+
+    Изображение разбито на горизонтальные плитки по tile_rows рядов. Новые ряды
+    дописываются только в текущую плитку, заполненные плитки больше не
+    перерисовываются, а прокрутка делается сдвигом диапазона оси Y. Поэтому
+    стоимость кадра не зависит от глубины водопада.
+    """
+    def __init__(self, parent=None, depth: int = 2000, tile_rows: int = 32):
         super().__init__(parent)
+        self.depth = depth
+        self.tile_rows = tile_rows
         self.layout = QVBoxLayout(self)
         self.plot_widget = pg.PlotWidget(title="Waterfall (спектрограмма)")
-        self.plot_widget.setLabel('left', 'Время (последние N сканов)')
+        self.plot_widget.setLabel('left', 'Время (номер скана)')
         self.plot_widget.setLabel('bottom', 'Частота (МГц)')
         self.plot_widget.setYRange(-50, 0)
         self.plot_widget.setXLink(None)  # Будет связано с основным графиком
 
-        # Изображение водопада
-        self.waterfall_img = pg.ImageItem()
-        self.waterfall_img.setLookupTable(pg.colormap.get('viridis').getLookupTable())
-        self.plot_widget.addItem(self.waterfall_img)
+        self.lut = pg.colormap.get('viridis').getLookupTable()
+        self.levels = (-100.0, -20.0)
+        self.tiles = []          # ImageItem'ы от старых к новым
+        self.tile_buffers = {}   # ImageItem -> массив (tile_rows, bins)
+        self.filled = 0          # заполнено рядов в текущей плитке
+        self.rows_drawn = 0      # всего рядов в водопаде (ось Y)
+        self.history_counter = 0
+        self.x = None
+
+        # Изображение водопада — текущая (дописываемая) плитка
+        self.waterfall_img = self._new_tile()
 
         # HistogramLUT
         self.hist_layout = pg.GraphicsLayoutWidget()
         self.histogram = pg.HistogramLUTItem()
         self.histogram.setImageItem(self.waterfall_img)
+        self.histogram.setLevels(*self.levels)
+        self.histogram.sigLevelsChanged.connect(self.on_levels_changed)
+        self.histogram.sigLookupTableChanged.connect(self.on_lut_changed)
         self.hist_layout.addItem(self.histogram)
 
         # Размещение
@@ -29,24 +50,106 @@ class WaterfallPlotWidget(QWidget):
         self.layout.addWidget(self.hist_layout)
         self.setLayout(self.layout)
 
-    def connect_to_data(self, data_storage: DataStorage):
-        data_storage.history_updated.connect(self.update_waterfall)
+    def connect_to_data(self, data_storage: DataStorage, scheduler=None):
+        """Со scheduler все ряды, пришедшие между перерисовками, отображаются за один вызов."""
+        if scheduler is None:
+            data_storage.history_updated.connect(self.update_waterfall)
+        else:
+            scheduler.connect(data_storage.history_updated, self.update_waterfall)
+
+    def set_depth(self, depth: int):
+        self.depth = depth
+        self._trim_tiles()
+
+    def _new_tile(self) -> pg.ImageItem:
+        img = pg.ImageItem(axisOrder='row-major')
+        img.setLookupTable(self.lut)
+        img.setLevels(self.levels)
+        self.plot_widget.addItem(img)
+        self.tiles.append(img)
+        return img
+
+    def _trim_tiles(self):
+        """Убрать плитки, полностью ушедшие за глубину водопада."""
+        max_tiles = -(-self.depth // self.tile_rows) + 1
+        while len(self.tiles) > max_tiles:
+            img = self.tiles.pop(0)
+            self.plot_widget.removeItem(img)
+            self.tile_buffers.pop(img, None)
+
+    def clear(self):
+        for img in self.tiles:
+            self.plot_widget.removeItem(img)
+        self.tiles = []
+        self.tile_buffers = {}
+        self.filled = 0
+        self.rows_drawn = 0
+        self.x = None
+        self.waterfall_img = self._new_tile()
+        if hasattr(self, 'histogram'):
+            self.histogram.setImageItem(self.waterfall_img)
+
+    def on_levels_changed(self):
+        self.levels = self.histogram.getLevels()
+        for img in self.tiles:
+            if img is not self.waterfall_img:
+                img.setLevels(self.levels)
+
+    def on_lut_changed(self):
+        self.lut = self.waterfall_img.lut
+        for img in self.tiles:
+            if img is not self.waterfall_img:
+                img.setLookupTable(self.lut)
+
+    def _tile_buffer(self, img: pg.ImageItem, bins: int) -> np.ndarray:
+        buf = self.tile_buffers.get(img)
+        if buf is None or buf.shape[1] != bins:
+            buf = np.empty((self.tile_rows, bins), dtype=np.float32)
+            self.tile_buffers[img] = buf
+        return buf
+
+    def _place(self, img: pg.ImageItem, rows: int):
+        top = self.rows_drawn
+        img.setRect(pg.QtCore.QRectF(self.x[0], top - rows, self.x[-1] - self.x[0], rows))
 
     def update_waterfall(self, data_storage: DataStorage):
-        if data_storage.history is None:
+        history = data_storage.history
+        if history is None or data_storage.x is None:
             return
-        buffer = data_storage.history.get_buffer()
-        if len(buffer) == 0:
+        new_rows = history.counter - self.history_counter
+        if new_rows < 0 or self.x is None or len(self.x) != len(data_storage.x) \
+                or self.x[0] != data_storage.x[0] or self.x[-1] != data_storage.x[-1]:
+            # Новый буфер истории или другая сетка частот — начинаем заново
+            self.clear()
+            self.x = data_storage.x
+            new_rows = min(history.counter, history.history_size)
+        self.history_counter = history.counter
+        if new_rows == 0:
             return
-        # Отображаем последние 50 сканов
-        n = min(50, len(buffer))
-        img = buffer[-n:].T  # Транспонируем для правильного отображения
-        self.waterfall_img.setImage(img, autoLevels=False, autoRange=False)
-        self.waterfall_img.setRect(
-            pg.QtCore.QRectF(
-                data_storage.x[0],
-                -n,
-                data_storage.x[-1] - data_storage.x[0],
-                n
-            )
-        )
+        rows = history.get_last(new_rows)
+        bins = rows.shape[1]
+
+        img = self.waterfall_img
+        buf = self._tile_buffer(img, bins)
+        start = 0
+        while start < len(rows):
+            take = min(self.tile_rows - self.filled, len(rows) - start)
+            buf[self.filled:self.filled + take] = rows[start:start + take]
+            self.filled += take
+            self.rows_drawn += take
+            start += take
+            if self.filled == self.tile_rows:
+                # Плитка заполнена — фиксируем её и переходим к новой
+                img.setImage(buf, autoLevels=False)
+                self._place(img, self.tile_rows)
+                img = self._new_tile()
+                self.waterfall_img = img
+                self.histogram.setImageItem(img)
+                buf = self._tile_buffer(img, bins)
+                self.filled = 0
+                self._trim_tiles()
+
+        if self.filled:
+            img.setImage(buf[:self.filled], autoLevels=False)
+            self._place(img, self.filled)
+        self.plot_widget.setYRange(self.rows_drawn - self.depth, self.rows_drawn, padding=0)
@@ -0,0 +1,55 @@
+"""
+Оповещения по правилам для GUI.
+Сам расчёт — core.alerts; здесь QObject, который получает свипы из DataStorage,
+пишет события в хранилище (JSONL/SQLite) и отдаёт их сигналом в журнал.
+"""
+
+from typing import List, Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+from core.alerts import AlertEngine, load_rules, open_event_store
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AlertMonitor(QObject):
+    """Проверяет каждый новый свип DataStorage набором правил."""
+    alert = pyqtSignal(dict)
+
+    def __init__(self, rules: List[dict], store_path: Optional[str] = None):
+        super().__init__()
+        self.engine = AlertEngine(rules)
+        self.store = open_event_store(store_path) if store_path else None
+        self.events = 0
+
+    @classmethod
+    def from_file(cls, rules_path: str, store_path: Optional[str] = None) -> 'AlertMonitor':
+        return cls(load_rules(rules_path), store_path)
+
+    def on_sweep(self, data_storage):
+        """
+        Слот для DataStorage.history_updated — вызывается один раз на свип.
+        Правила проверяются по сырому свипу (raw_y), как в демоне: пороги — абсолютные
+        уровни, независимо от сглаживания и вычитания базовой линии на экране.
+        """
+        if data_storage.x is None or data_storage.raw_y is None:
+            return
+        events = self.engine.process(data_storage.x, data_storage.raw_y)
+        if not events:
+            return
+        self.events += len(events)
+        if self.store is not None:
+            try:
+                self.store.write(events)
+            except Exception as e:
+                logger.error(f"Не удалось записать события: {e}")
+        for event in events:
+            self.alert.emit(event)
+
+    def reset(self):
+        self.engine.reset()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
@@ -1,10 +1,10 @@
 import os
 import numpy as np
 from PyQt5.QtWidgets import QFileDialog
-import pyqtgraph.exporters
 
 def export_spectrum(plot_widget, parent):
     """Экспортирует график в PNG или PDF."""
+    import pyqtgraph.exporters
     exporter = pyqtgraph.exporters.ImageExporter(plot_widget.plot_widget.plotItem)
     exporter.parameters()['width'] = 1920
     filename, _ = QFileDialog.getSaveFileName(parent, "Экспорт графика", "", "PNG (*.png);;PDF (*.pdf)")
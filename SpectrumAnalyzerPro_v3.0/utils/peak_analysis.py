@@ -0,0 +1,20 @@
+"""
+Анализ пиков спектра вне GUI-потока.
+Сам расчёт — core.peaks; здесь воркер для отдельного QThread.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from core.peaks import analyze_peaks_array
+
+
+class PeakAnalysisWorker(QObject):
+    """Выполняет analyze_peaks_array в своём QThread и возвращает результат сигналом."""
+    peaks_ready = pyqtSignal(object)  # структурированный массив core.peaks.PEAK_DTYPE
+
+    def __init__(self, classifier):
+        super().__init__()
+        self.classifier = classifier
+
+    @pyqtSlot(dict)
+    def analyze(self, data: dict):
+        self.peaks_ready.emit(analyze_peaks_array(data['x'], data['y'], self.classifier))
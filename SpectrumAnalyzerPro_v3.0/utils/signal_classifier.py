@@ -1,5 +1,8 @@
 import numpy as np
-from scipy.signal import find_peaks
+from numpy.lib.stride_tricks import sliding_window_view
+
+MODULATIONS = np.array(["Digital", "FM", "AM", "FSK/PSK", "Unknown"], dtype=object)
+
 
 class SignalClassifier:
     def __init__(self):
@@ -35,6 +38,78 @@ class SignalClassifier:
         else:
             return "Unknown"
 
+    def _modulation_from_features(self, variance, zcr, entropy):
+        """Те же правила, что в detect_modulation_around_peak, но над массивами признаков."""
+        conditions = [
+            (variance > 15) & (zcr > 0.3),
+            (variance > 8) & (entropy > 2.0),
+            (variance < 5) & (entropy < 1.5),
+            zcr > 0.4,
+        ]
+        return np.select(conditions, MODULATIONS[:4], default="Unknown")
+
+    def detect_modulation_batch(self, db_values, peak_indices, window=50):
+        """
+        Модуляция для всех пиков сразу.
+        Окна целиком внутри спектра собираются в матрицу (n_peaks, window) через
+        sliding_window_view без копирования, признаки считаются по оси 1.
+        Усечённые окна у краёв спектра (единицы штук) идут через скалярный путь.
+        :return: массив меток (dtype=object) той же длины, что peak_indices
+        """
+        db_values = np.asarray(db_values)
+        peak_indices = np.asarray(peak_indices, dtype=np.intp)
+        labels = np.empty(len(peak_indices), dtype=object)
+        if len(peak_indices) == 0:
+            return labels
+
+        half = window // 2
+        starts = peak_indices - half
+        full = (starts >= 0) & (peak_indices + half <= len(db_values)) & (2 * half >= 10)
+        for i in np.flatnonzero(~full):
+            labels[i] = self.detect_modulation_around_peak(db_values, int(peak_indices[i]), window)
+        if not full.any():
+            return labels
+
+        segments = sliding_window_view(db_values, 2 * half)[starts[full]]
+        N = segments.shape[1]
+        variance = np.var(segments, axis=1)
+        signs = np.signbit(segments)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (2 * N)
+        if N > 16:
+            centered = segments - segments.mean(axis=1, keepdims=True)
+            spec = np.abs(np.fft.fft(centered, axis=1)[:, :N // 2])
+            spec /= spec.sum(axis=1, keepdims=True) + 1e-10
+            entropy = -np.sum(spec * np.log2(spec + 1e-10), axis=1)
+        else:
+            entropy = np.zeros(len(segments))
+        labels[full] = self._modulation_from_features(variance, zcr, entropy)
+        return labels
+
+    def classify_signals(self, modulations, bandwidths_mhz):
+        """Векторная версия classify_signal: массив модуляций и ширин → массив типов."""
+        mod = np.asarray(modulations, dtype=object)
+        bw = np.asarray(bandwidths_mhz, dtype=float)
+        am, fm, digital, fsk = mod == "AM", mod == "FM", mod == "Digital", mod == "FSK/PSK"
+        other = ~(am | fm | digital | fsk)
+        rules = [
+            (am & (bw < 0.01), "AM Narrowband (Aviation, Ham)"),
+            (am & (bw < 0.1), "AM Broadcast (MW/SW)"),
+            (am, "AM Wideband"),
+            (fm & (bw > 0.05) & (bw < 0.25), "FM Broadcast"),
+            (fm & (bw < 0.03), "NBFM (Radio Amateur)"),
+            (fm, "Wide FM"),
+            (digital & (bw < 0.02), "LoRa / Sigfox"),
+            (digital & (bw < 0.2), "DMR / D-STAR / NXDN"),
+            (digital & (bw < 1.0), "DAB / ATSC / DVB-T"),
+            (digital, "Wideband Digital"),
+            (fsk & (bw < 0.05), "AX.25 / RTTY / FSK"),
+            (fsk, "PSK31 / QPSK"),
+            (other & (bw < 0.01), "CW / Beacon"),
+        ]
+        conditions = [cond for cond, _ in rules]
+        choices = np.array([label for _, label in rules], dtype=object)
+        return np.select(conditions, choices, default="Unknown Signal")
+
     def classify_signal(self, modulation, bandwidth_mhz):
         if modulation == "AM":
             if bandwidth_mhz < 0.01: